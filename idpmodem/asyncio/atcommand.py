@@ -1,23 +1,43 @@
 """AT Command protocol factory for pyserial-asyncio.
 
-**WARNING**: This module is untested as a work in progress refactor of the
-legacy atcommand_async module.
+Provides an `asyncio.Protocol` so that a single event loop may drive many
+modems without threads. Each command awaits a future resolved by
+`data_received` when the final result code (or CRC) is framed.
 
 """
 
 import asyncio
 import logging
+import os
 from time import time
+from typing import Callable
 
-import serial_asyncio
 from idpmodem.aterror import AtCrcError, AtTimeout
-from idpmodem.crcxmodem import get_crc, validate_crc
+from idpmodem.atframer import AtFrame, AtFramer, AtFrameType
+from idpmodem.crcxmodem import apply_crc
+from idpmodem.helpers import printable_crlf
+
+CRC_ERROR_WAIT = float(os.getenv('CRC_ERROR_WAIT', 0.1))
+VERBOSE_DEBUG = str(os.getenv('VERBOSE_DEBUG', False)).lower() == 'true'
 
 _log = logging.getLogger(__name__)
 
 
 class AtProtocol(asyncio.Protocol):
-    
+    """Asyncio protocol factory for the IDP Modem.
+
+    Accepts only one AT command at a time (others await an `asyncio.Lock`).
+    Handles command echo terminated with <cr>, verbose response framed with
+    <cr><lf>, unsolicited data terminated with <lf>, and CRC error checking.
+
+    Attributes:
+        crc (bool): Indicates if CRC error checking is enabled.
+        pending_command (str): The AT command being processed.
+        framer (AtFramer): Splits received bytes into lines.
+        event_callback (Callable): optional callback function for
+            unexpected data
+
+    """
     TERMINATOR = '\r'
     ENCODING = 'utf-8'
     UNICODE_HANDLING = 'replace'
@@ -25,81 +45,56 @@ class AtProtocol(asyncio.Protocol):
 
     def __init__(self,
                  crc: bool = False,
-                 event_callback: callable = None,
+                 event_callback: Callable = None,
                  at_timeout: int = 5,
                  ):
         super().__init__()
         self.transport: asyncio.Transport = None
+        self.framer = AtFramer()
         self.crc = crc
         self.alive = True
         self.at_timeout = at_timeout
         self.pending_command = None
         self.command_time = None
         self.response_time = None
-        self.response: 'list[str]' = []
-        self.response_complete = False
-        self.filter = None
-        self._debug = False
         self.event_callback = event_callback
+        self._lock = asyncio.Lock()
+        self._response: asyncio.Future = None
+        self._response_frames: 'list[bytes]' = []
+        self._crc_wait_until = 0
 
     def connection_made(self, transport) -> None:
         self.transport = transport
         _log.debug('Serial AT protocol connection opened')
-    
+
     def connection_lost(self, exc) -> None:
-        _log.warning('Serial AT procotol connection lost')
-        self.transport.loop.stop()
+        if exc is None:
+            _log.debug('Serial AT protocol connection closed')
+        else:
+            _log.warning(f'Serial AT procotol connection lost: {exc}')
+        self.alive = False
         self.transport = None
-        if isinstance(exc, Exception):
-            raise exc
+        self._complete(exc if isinstance(exc, Exception) else
+                       ConnectionError('AT protocol connection lost'))
 
     def data_received(self, data: bytes) -> None:
-        self.buffer.extend(data)
-        if self.pending_command is not None:
-            if data == b'\r':
-                #: Echo case
-                if self.buffer == self.pending_command.encode() + b'\r':
-                    echo = self.buffer
-                    #: reset buffer for response
-                    self.buffer = bytearray(b'')
-                    self.handle_packet(echo)
-            elif data == b'\n':
-                if (self.buffer != bytearray(b'\r\n')
-                    and self.buffer != bytearray(b'\n')):
-                    #: Framed/multiline response, error code or CRC
-                    packet = self.buffer
-                    self.buffer = bytearray(b'')
-                    self.handle_packet(packet)
-                elif self.buffer == bytearray(b'\n'):
-                    #: (Unexpected) drop any empty lines
-                    self.buffer = bytearray(b'')
-        else:   # no pending command
-            if data == b'\n':
-                unsolicited = self.buffer
-                self.buffer = bytearray(b'')
-                self.handle_packet(unsolicited)
+        """Frames received data to complete commands or handle events."""
+        for frame in self.framer.feed(data):
+            if (frame.frame_type == AtFrameType.UNSOLICITED or
+                not self._handle_response(frame)):
+                self.handle_packet(frame.data)
 
     def handle_packet(self, packet: bytearray):
-        """Decodes packet(s) - inherited from LineReader."""
-        self.handle_line(packet.decode(self.ENCODING, self.UNICODE_HANDLING))
-
-    def handle_line(self, line: str):
-        """Enqueues lines for parsing by command handler.
-
-        Args:
-            line: The unicode string received from the serial port.
-        """
-        if self.pending_command is not None:
-            self.handle_response(line)
-        else:
-            if line != '\n':
-                self.handle_event(line)
+        """Decodes an unsolicited packet for the event handler."""
+        line = packet.decode(self.ENCODING, self.UNICODE_HANDLING)
+        if line != '\n':
+            self.handle_event(line)
 
     def write_line(self, line: str):
         """Appends a terminator, encodes and writes text to the transport."""
         send: str = line + self.TERMINATOR
         self.transport.write(send.encode(self.ENCODING, self.UNICODE_HANDLING))
-    
+
     def handle_event(self, unsolicited: str):
         """Calls a user-defined function with the unicode string.
 
@@ -110,36 +105,64 @@ class AtProtocol(asyncio.Protocol):
         if unsolicited is not None:
             if self.event_callback is not None:
                 self.event_callback(unsolicited)
-            else: 
-                unsolicited = unsolicited.replace('\r', '<cr>')
-                unsolicited = unsolicited.replace('\n', '<lf>')
-                _log.warning(f'Unhandled event: {unsolicited}')
+            else:
+                _log.warning(f'Unhandled event: {printable_crlf(unsolicited)}')
+
+    def _handle_response(self, frame: AtFrame) -> bool:
+        """Adds a frame to the pending response and completes it when done.
 
-    def handle_response(self, line: str):
-        content = line.strip()
+        Returns:
+            False if no command was waiting for the frame.
+
+        """
+        if self._response is None:
+            if frame.frame_type == AtFrameType.CRC:
+                if not self.crc:
+                    _log.debug('Now using CRC detected after response')
+                    self.crc = True
+                return True
+            return False
+        if frame.frame_type == AtFrameType.ECHO:
+            return True
         if self.response_time is None:
             self.response_time = time()
-        if content == self.pending_command:
-            pass   # ignore echo
-        elif content == 'OK':
-            self.response.append(line)
-            if '%CRC=0' in self.pending_command:
-                self.crc = False
-            if (not self.crc and '%CRC=1' not in self.pending_command):
-                # No need to wait for CRC
-                self.response_complete = True
-        elif content.startswith('*'):
+        if frame.frame_type == AtFrameType.CRC:
             if not self.crc:
-                if not '%CRC=1' in self.pending_command:
+                if '%CRC=1' not in self.pending_command:
                     _log.warning('Inferring CRC enabled')
                 self.crc = True
-            crc = content.replace('*', '')
-            if not validate_crc(''.join(self.response), crc):
-                raise AtCrcError(f'INVALID_CRC_RESPONSE')
-            self.response_complete = True
-        else:   #: including 'ERROR'
-            self.response.append(line)
-            # keep parsing in case CRC follows    
+            if not frame.crc_valid:
+                self._complete(AtCrcError(f'INVALID_CRC_RESPONSE'))
+            else:
+                self._complete()
+            return True
+        if VERBOSE_DEBUG:
+            line = frame.data.decode(self.ENCODING, self.UNICODE_HANDLING)
+            _log.debug(f'Read: {printable_crlf(line)}')
+        self._response_frames.append(frame.data)
+        if frame.frame_type == AtFrameType.RESULT:
+            if frame.content == b'OK':
+                if self.crc and '%CRC=0' in self.pending_command:
+                    self.crc = False
+                elif not self.crc and '%CRC=1' in self.pending_command:
+                    self.crc = True
+                if not self.crc:
+                    self._complete()
+            elif not self.crc:   #: ERROR may still be followed by CRC
+                self._crc_wait_until = time() + CRC_ERROR_WAIT
+                self._complete()
+        return True
+
+    def _complete(self, exc: Exception = None):
+        """Resolves the pending command future with the response or error."""
+        future = self._response
+        self._response = None
+        if future is None or future.done():
+            return
+        if exc is not None:
+            future.set_exception(exc)
+        else:
+            future.set_result(self._response_frames)
 
     def _clean_response(self,
                         lines: 'list[str]',
@@ -147,12 +170,12 @@ class AtProtocol(asyncio.Protocol):
                         debug: bool = False,
                         ) -> 'list[str]':
         """Removes empty lines from response and returns a list.
-        
+
         Args:
             lines: A list of reponse lines.
             filter: Optional list of strings/substrings to filter from response.
             debug: If True, logs the command latency
-        
+
         Returns:
             List with filtered and stripped lines
 
@@ -162,7 +185,7 @@ class AtProtocol(asyncio.Protocol):
         """
         if filter and not isinstance(filter, list):
             raise ValueError('filter must be a list of strings')
-        if debug:
+        if debug or VERBOSE_DEBUG:
             latency = round(self.response_time - self.command_time, 3)
             _log.debug(f'Command {self.pending_command}'
                           f' latency: {latency} seconds')
@@ -176,51 +199,65 @@ class AtProtocol(asyncio.Protocol):
         return [x for x in lines if x != '']
 
     async def command(self,
-                command: str,
-                filter: 'list[str]' = [],
-                timeout: int = 5,
-                debug: bool = False,
-                ) -> 'list[str]':
+                      command: str,
+                      filter: 'list[str]' = [],
+                      timeout: int = 5,
+                      debug: bool = False,
+                      raw: bool = False,
+                      ) -> 'list[str]|list[bytes]':
         """Send an AT command and wait for the response.
 
         Returns the response as a list.  If an error response code was
         received then 'ERROR' will be the only string in the list.
 
-        .. todo: generalize for OK-only response, and provide error detail
-
         Args:
             command: The AT command
+            filter: Optional list of strings/substrings to filter from response.
             timeout: Time to wait for response in seconds (default 5)
-        
+            debug: If True, logs the command latency
+            raw: If True returns the received response frames as bytes
+                without decoding, stripping or filtering.
+
         Returns:
             A list of strings. The list will be ['ERROR'] in case of a problem.
 
         Raises:
             AtCrcError if CRC does not match.
             AtTimeout if the request timed out.
+            ConnectionError if the transport is not connected.
 
         """
-        if self.pending_command is not None:
-            raise 
-        timeout = 1 if timeout < 1 else timeout
-        command = get_crc(command) if self.crc else command
-        self.pending_command = command
-        self.response_complete = False
-        self.response_time = None
-        self.command_time = time()
-        self.write_line(command)
-        try:
-            await self._timeout_check(timeout=timeout)
-            return self._clean_response(self.response, filter, debug)
-        except asyncio.TimeoutError:
-            raise AtTimeout(f'TIMEOUT ({command})')
-        finally:
-            self._cleanup()
-
-    async def _timeout_check(self):
-        while not self.response_complete:
-            await asyncio.sleep(1)
-
-    def _cleanup(self):
-        self.pending_command = None
-        self.response = []
+        async with self._lock:
+            if self.transport is None:
+                raise ConnectionError('AT protocol not connected')
+            crc_wait = self._crc_wait_until - time()
+            if crc_wait > 0:
+                await asyncio.sleep(crc_wait)
+            timeout = 1 if timeout < 1 else timeout
+            command = apply_crc(command) if self.crc else command
+            stale = self.framer.clear()
+            if stale:
+                stale = stale.decode(self.ENCODING, self.UNICODE_HANDLING)
+                _log.warning(f'Cleared old buffer: {printable_crlf(stale)}')
+            self.pending_command = command
+            self.framer.expect(command)
+            future = asyncio.get_running_loop().create_future()
+            self._response_frames = []
+            self._response = future
+            self.response_time = None
+            self.command_time = time()
+            self.write_line(command)
+            try:
+                frames = await asyncio.wait_for(future, timeout)
+                if raw:
+                    return frames
+                lines = [frame.decode(self.ENCODING, self.UNICODE_HANDLING)
+                         for frame in frames]
+                return self._clean_response(lines, filter, debug)
+            except asyncio.TimeoutError:
+                raise AtTimeout(f'TIMEOUT ({int(timeout)}s)')
+            finally:
+                self._response = None
+                self.pending_command = None
+                if self._crc_wait_until < time():
+                    self.framer.expect(None)
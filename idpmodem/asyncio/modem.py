@@ -1,30 +1,53 @@
-"""IDP Modem abstraction for pyserial-asyncio.
+"""An asyncio IDP modem client with awaitable operations.
 
-**WARNING**: This module is untested as a work in progress refactor of the
-legacy atcommand_async module.
+Every operation that communicates with the modem is a coroutine, so a single
+event loop may drive many modems without threads.
+Values that the threaded client exposes as properties are provided by
+coroutines named `<property>_get` and `<property>_set`.
+
+Example::
+
+    modem = IdpModem('/dev/ttyUSB0')
+    await modem.connect()
+    await modem.config_init()
+    mobile_id = await modem.mobile_id_get()
 
 """
 
 import asyncio
 import logging
-import queue
-from base64 import b64decode, b64encode
+import os
+from base64 import b64encode
+from binascii import b2a_base64
 from datetime import datetime, timezone
-from time import time
+from functools import partial
+from math import ceil
+from time import monotonic, time
 
 import serial_asyncio
-from idpmodem.aterror import AtException, AtGnssTimeout
-from idpmodem.constants import (AT_ERROR_CODES, EVENT_TRACES, GEOBEAMS,
-                                POWER_MODES, WAKEUP_PERIODS, BeamSearchState,
-                                DataFormat, EventNotification, MessagePriority,
-                                MessageState, SatlliteControlState, TransmitterStatus)
+from idpmodem.atbatch import AtBatch
+from idpmodem.aterror import AtCrcError, AtException, AtGnssTimeout, AtTimeout
+from idpmodem.constants import (EVENT_TRACES, AtErrorCode, BeamSearchState,
+                                DataFormat, EventNotification, GnssMode,
+                                MessagePriority, MessageState, PowerMode,
+                                SatlliteControlState, SignalLevelRegional,
+                                SignalQuality, TransmitterStatus,
+                                WakeupPeriod)
+from idpmodem.helpers import printable_crlf
 from idpmodem.location import Location, location_from_nmea
+from idpmodem.metrics import (SAT_STATUS_TRACES, SAT_STATUS_TTL,
+                              SAT_STATUS_TTLS, MetricsCache, geo_beam_name,
+                              geo_beam_satellite, satellite_status,
+                              trace_groups)
+from idpmodem.mtmessage import (mgfg_command, mgfg_parse,
+                               mgfg_response_frame, mt_drain_order)
 from idpmodem.s_registers import SRegisters
 from idpmodem.asyncio.atcommand import AtProtocol
 
-GNSS_STALE_SECS = 1
-GNSS_WAIT_SECS = 35
-SAT_STATUS_HOLDOFF = 5
+GNSS_STALE_SECS = int(os.getenv('GNSS_STALE_SECS', 1))
+GNSS_WAIT_SECS = int(os.getenv('GNSS_WAIT_SECS', 35))
+MODEM_REBOOT_HOLDOFF = os.getenv('MODEM_REBOOT_HOLDOFF')
+VERBOSE_DEBUG = str(os.getenv('VERBOSE_DEBUG', False)).lower() == 'true'
 
 _log = logging.getLogger(__name__)
 
@@ -34,6 +57,15 @@ class ModemBusy(Exception):
 
 
 class AtConfiguration:
+    """Configuration settings of the modem.
+
+    Attributes:
+        crc (bool): Using cyclic redundancy check for all transactions.
+        echo (bool): Echoing back commands
+        quiet (bool): Limiting responses
+        verbose (bool): Using text-based responses
+
+    """
     def __init__(self) -> None:
         self.crc: bool = False
         self.echo: bool = True
@@ -42,185 +74,340 @@ class AtConfiguration:
 
 
 class IdpModem:
-    """A protocol factory abstracting AT commands for an IDP modem."""
-    
+    """Abstracts AT commands to awaitable functions for an IDP modem.
+
+    Attributes:
+        baudrate (int): The baudrate of the serial connection.
+        crc (bool): Indicates if CRC error checking is enabled.
+        error_detail (bool|str): If True the error code (`S80`) is queried
+            after any `ERROR` and appended to the response. If `'lazy'` it is
+            queried only when read using `at_error_detail`.
+
+    """
+
     SERIAL_KWARGS = ['baudrate', 'timeout', 'write_timeout']
     BAUD_RATES = [1200, 2400, 4800, 9600, 19200]
     PROTOCOL_KWARGS = ['event_callback', 'at_timeout']
     OTHER_KWARGS = ['error_detail', 'debug', 'stale_secs', 'wait_secs']
-    
+
     def __init__(self, serial_port: str, **kwargs):
         self.serial_kwargs = {
-            'port': serial_port,
+            'url': serial_port,
             'baudrate': int(kwargs.pop('baudrate', 9600)),
         }
         self.protocol_kwargs = {}
-        self.error_detail = bool(kwargs.pop('error_detail', True))
+        error_detail = kwargs.pop('error_detail', True)
+        self.error_detail = ('lazy' if str(error_detail).lower() == 'lazy'
+                             else bool(error_detail))
         self.debug = bool(kwargs.pop('debug', False))
         for kwarg in kwargs:
             if kwarg in self.SERIAL_KWARGS:
                 self.serial_kwargs[kwarg] = kwargs[kwarg]
             elif kwarg in self.PROTOCOL_KWARGS:
                 self.protocol_kwargs[kwarg] = kwargs[kwarg]
-        self.loop = asyncio.get_event_loop()
-        self.coro = serial_asyncio.create_serial_connection(
-            self.loop,
-            protocol_factory=AtProtocol,
-            **self.serial_kwargs
-        )
-        self.serial_port = None
-        self.transport = None
-        self.protocol = None
-        self.commands = queue.Queue(1)
+        self.transport: serial_asyncio.SerialTransport = None
+        self.protocol: AtProtocol = None
+        try:
+            self._reboot_holdoff = int(MODEM_REBOOT_HOLDOFF)
+        except:
+            self._reboot_holdoff = None
+        self._holdoff_until = 0.0
+        self._lock: asyncio.Lock = None   # created in the running loop
         self._at_config = AtConfiguration()
         self._mobile_id: str = None
         self._versions: dict = None
+        self._manufacturer: str = None
+        self._model: str = None
         self._power_mode: int = None
         self._wakeup_period: int = None
-        self._ctrl_state: int = None
-        self._snr: float = None
-        self._geo_beam_id: int = None
-        self._beamsearch_state: int = None
         self._loc_query: dict = {
             'stale_secs': int(kwargs.pop('stale_secs', GNSS_STALE_SECS)),
             'wait_secs': int(kwargs.pop('wait_secs', GNSS_WAIT_SECS)),
         }
-        self._holdoffs: dict = {}   # used to ignore frequent repeat commands
         self._statistics: dict = {}
         self.s_registers = SRegisters()
-        # self.tx_queue = queue.Queue()
-        # self.tx_complete_callback: callable = None
-        # self.rx_queue = queue.Queue()
-        # self.rx_received_callback: callable = None
-    
-    def connect(self):
-        self.transport, self.protocol = self.loop.run_until_complete(self.coro)
-        self.loop.run_forever()
+        self.satellite_metrics = MetricsCache(SAT_STATUS_TTLS,
+                                              self._satellite_status_fetch)
+
+    async def connect(self):
+        """Connects to a modem using a serial transport and protocol."""
+        loop = asyncio.get_running_loop()
+        self._lock = asyncio.Lock()
+        protocol_factory = partial(AtProtocol, **self.protocol_kwargs)
+        self.transport, self.protocol = (
+            await serial_asyncio.create_serial_connection(loop,
+                                                          protocol_factory,
+                                                          **self.serial_kwargs))
+        assert isinstance(self.protocol, AtProtocol)
+        self.transport.serial.reset_input_buffer()
+        self.transport.serial.reset_output_buffer()
+        if self._reboot_holdoff is not None:
+            self.protocol.event_callback = self._unsolicited
         _log.debug(f'Transport: {self.transport}')
-        # self.serial_port = Serial(**self.serial_kwargs)
 
-    def disconnect(self):
-        self.loop.close()
+    async def disconnect(self):
+        """Disconnects from the modem."""
+        if self.transport:
+            self.transport.close()
         self.transport = None
         self.protocol = None
-    
-    @property
-    def connected(self) -> bool:
-        return self.transport is not None and self.protocol is not None
+
+    async def connected_get(self) -> bool:
+        """Indicates if the modem is connected.
+
+        Attempts to send a basic `AT` command and check for any response.
+
+        """
+        if self.transport is None or self.protocol is None:
+            return False
+        try:
+            res = await self.atcommand('AT')
+            if res is not None:
+                return True
+        except AtCrcError:
+            return True
+        except AtTimeout:
+            pass
+        return False
 
     @property
     def baudrate(self) -> 'int|None':
-        return self.transport.baudrate if self.transport else None
-    
-    @baudrate.setter
-    def baudrate(self, value: int):
-        if not self.connected:
+        """The baud rate of the serial connecton."""
+        return self.transport.serial.baudrate if self.transport else None
+
+    async def baudrate_set(self, value: int):
+        """Changes the baud rate of the modem and serial connection."""
+        if not await self.connected_get():
             raise ConnectionError('Modem is not connected')
         if value not in self.BAUD_RATES:
             raise ValueError(f'Baud rate must be one of {self.BAUD_RATES}')
-        response = self.atcommand(f'AT+IPR={value}')
+        response = await self.atcommand(f'AT+IPR={value}')
         if response and response[0] != 'ERROR':
-            self.serial_port.baudrate = value
+            self.transport.serial.baudrate = value
 
     @property
     def crc(self) -> 'bool|None':
+        """Indicates if CRC error checking is enabled on the modem."""
         return self.protocol.crc if self.protocol is not None else None
 
-    def atcommand(self,
-                  command: str,
-                  filter: 'list[str]' = [],
-                  timeout: int = 5,
-                  await_previous: bool = True,
-                  ) -> 'list[str]':
+    def _unsolicited(self, data: str) -> None:
+        if self._lock is not None and self._lock.locked():
+            _log.warning('Unsolicited data received during AT command'
+                         f' processing: {printable_crlf(data)}')
+        if self._reboot_holdoff:
+            BOOT_INDICATORS = ['boot loader', 'Copyright (c)', '*** Reset',
+                'starting appl firmware', '.....']
+            if any(indicator in data for indicator in BOOT_INDICATORS):
+                _log.warning('Reboot indicator found - holding off commands'
+                            f' {self._reboot_holdoff}s')
+                self._holdoff_until = monotonic() + self._reboot_holdoff
+
+    async def atcommand(self,
+                        command: str,
+                        filter: 'list[str]' = [],
+                        timeout: int = 5,
+                        await_previous: bool = True,
+                        await_timeout: float = None,
+                        raw: bool = False,
+                        ) -> 'list[str]|list[bytes]':
         """Sends an AT command to the modem and returns the response.
-        
+
+        Commands from multiple tasks are sent in the order submitted.
+
         Args:
             command: The AT command
             filter: (optional) list of sub/strings to remove from response.
             timeout: Number of seconds to wait for a reply
-                (not including messages queued by other threads)
-            await_previous: If True, this will block if a prior command was
-                submitted by another thread
-        
+                (not including messages queued by other tasks)
+            await_previous: If True, this will wait if a prior command was
+                submitted by another task
+            await_timeout: (optional) Maximum seconds to wait for prior
+                commands (default waits indefinitely)
+            raw: If True returns the response frames as bytes without
+                decoding or filtering, and without error detail.
+
         Returns:
             list of filtered and stripped response(s) to the command(s)
-        
+
         Raises:
-            ModemBusy if await_previous is False and a prior command is queued.
+            ModemBusy if a prior command is queued and await_previous is False
+                or await_timeout expires.
             AtException if an error occurred that is unrecognized.
 
         """
-        if not self.connected:
-            raise ConnectionError('No connection to IDP modem')
-        while self.commands.full():
-            if not await_previous:
+        if not self.transport or not self.protocol:
+            raise ConnectionError('No serial or protocol instance.')
+        await self._acquire(await_previous, await_timeout)
+        try:
+            res: list = await self.protocol.command(command,
+                                                    filter=filter,
+                                                    timeout=timeout,
+                                                    debug=self.debug,
+                                                    raw=raw)
+            if VERBOSE_DEBUG:
+                _log.debug(f'Response: {res}')
+            if (self.error_detail is True and not raw and res and
+                res[0] == 'ERROR'):
+                _log.debug(f'Querying error code response to {command}')
+                detail = await self._error_code_query()
+                res.append(detail)
+                _log.warning(f'AT error: {detail} for command {command}')
+            return res
+        except AtException as err:
+            _log.error(f'{err} on command {command}')
+            raise err
+        finally:
+            self._lock.release()
+
+    async def _acquire(self,
+                       await_previous: bool = True,
+                       await_timeout: float = None) -> None:
+        """Acquires the command lock then waits for any reboot holdoff.
+
+        The caller must release `_lock` when its command completes.
+
+        Raises:
+            ModemBusy if a prior command is queued and await_previous is False
+                or await_timeout expires.
+
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        if not await_previous and self._lock.locked():
+            raise ModemBusy
+        # wait_for can drop an acquired lock if it times out (Python < 3.10)
+        acquire = asyncio.ensure_future(self._lock.acquire())
+        try:
+            await asyncio.wait([acquire], timeout=await_timeout)
+            if not acquire.done():
+                acquire.cancel()
                 raise ModemBusy
-            pass
-        self.commands.put(command)
-        # TODO: allow for async(?)
-        res: list = self.protocol.command(command, filter, timeout, self.debug)
-        if self.error_detail and res and res[0] == 'ERROR':
-            _log.error(f'Error received for command {command}')
-            err_res = self.protocol.command('ATS80?')
-            if not err_res or err_res[0] == 'ERROR':
-                raise AtException('Unhandled error getting last error code')
-            last_err_code = err_res[0]
-            detail = 'UNDEFINED'
-            if int(last_err_code) in AT_ERROR_CODES:
-                detail = AT_ERROR_CODES[int(last_err_code)]
-            res.append(f'{detail} ({last_err_code})')
-        self.commands.get()
-        self.commands.task_done()
-        return res
-    
-    def _handle_at_exception(self, response: 'list[str]') -> None:
-        err = response[1] if self.error_detail else response[0]
+            holdoff = self._holdoff_until - monotonic()
+            if holdoff > 0:
+                await asyncio.sleep(holdoff)
+        except asyncio.CancelledError:
+            if not acquire.done():
+                acquire.cancel()
+            elif not acquire.cancelled():
+                self._lock.release()
+            raise
+
+    async def _error_code_query(self) -> str:
+        """Queries the last error code (`S80`) and returns its description."""
+        err_res = await self.protocol.command('ATS80?')
+        if not err_res or err_res[0] == 'ERROR':
+            raise AtException('Unhandled error getting last error code'
+                              f' ({err_res})')
+        last_err_code = err_res[0]
+        detail = 'UNDEFINED'
+        if AtErrorCode.is_valid(int(last_err_code)):
+            detail = AtErrorCode(int(last_err_code)).name
+        return f'{detail} ({last_err_code})'
+
+    async def at_error_detail(self, response: 'list[str]') -> str:
+        """Gets the error detail of an `ERROR` response.
+
+        If the detail was not already queried (`error_detail='lazy'`) the
+        last error code is queried now and appended to the response.
+        The modem only holds the most recent error code, so this should be
+        awaited before sending another command that may fail.
+
+        Args:
+            response: The response list returned by `atcommand`.
+
+        Returns:
+            The error name and code e.g. `NO_MESSAGES (109)`
+
+        Raises:
+            ValueError if the response is not an error.
+
+        """
+        if not response or response[0] != 'ERROR':
+            raise ValueError('Response is not an error')
+        if len(response) > 1:
+            return response[1]
+        await self._acquire()
+        try:
+            detail = await self._error_code_query()
+        finally:
+            self._lock.release()
+        response.append(detail)
+        return detail
+
+    def batch(self) -> AtBatch:
+        """Returns a builder to combine S-register operations.
+
+        Example::
+
+            batch = modem.batch()
+            mode = batch.query('S39')
+            results = await batch.execute_async()
+
+        """
+        return AtBatch(self.atcommand)
+
+    async def _handle_at_error(self, response: 'list[str]') -> None:
+        err = response[0]
+        if self.error_detail:
+            err = await self.at_error_detail(response)
+        _log.error(f'AT Error: {err}')
         raise AtException(err)
 
-    def config_init(self, crc: bool = False) -> bool:
+    async def config_init(self, crc: bool = False) -> bool:
         """Initializes modem communications with Echo, Verbose. CRC optional."""
-        def attempt(command: str) -> bool:
-            response = self.atcommand(command)
-            return response[0] == 'OK'
-        # try at most twice
+        _log.debug(f'Initializing modem Echo|Verbose{"|CRC" if crc else ""}'
+                   f' (CRC={self.protocol.crc})')
         command = f'ATZ;E1;V1;Q0;%CRC={1 if crc else 0}'
-        success = attempt(command)
-        if not success:
-            success = attempt(command)
-        if success:
-            self.protocol.crc = crc
-            self._at_config.crc = crc
-        return success
-
-    def config_restore_nvm(self) -> bool:
+        res_attempt_1 = await self.atcommand(command)
+        if res_attempt_1[0] != 'OK':
+            if len(res_attempt_1) > 1:
+                at_error = res_attempt_1[1]
+                if ('INVALID_CRC' not in at_error and
+                    'UNKNOWN_COMMAND' not in at_error):
+                    _log.warning(f'Unexpected AT error {at_error}')
+            _log.debug(f'CRC mismatch, re-attempting (CRC={self.protocol.crc})')
+            res_attempt_2 = await self.atcommand(command)
+            if res_attempt_2[0] != 'OK':
+                _log.error('Unable to initialize modem after second attempt')
+                if len(res_attempt_2) > 1:
+                    _log.error(f'AT error: {res_attempt_2[1]}')
+                return False
+        self._at_config.crc = crc
+        _log.debug('Initialization success')
+        return True
+
+    async def config_restore_nvm(self) -> bool:
         """Sends ATZ to restore config from non-volatile memory."""
-        response = self.atcommand('ATZ')
+        _log.debug('Restoring modem stored configuration')
+        response = await self.atcommand('ATZ')
         if response[0] == 'ERROR':
             return False
         return True
 
-    def config_restore_factory(self) -> bool:
+    async def config_restore_factory(self) -> bool:
         """Sends AT&F to restore factory default and returns True on success."""
-        response = self.atcommand('AT&F')
+        _log.debug('Restoring modem factory defaults')
+        response = await self.atcommand('AT&F')
         if response[0] == 'ERROR':
             return False
         return True
-    
-    def config_report(self) -> 'tuple[dict, dict]':
+
+    async def config_report(self) -> 'tuple[dict, dict]':
         """Sends the AT&V command to retrieve S-register settings.
-        
+
         Returns:
             A tuple with two dictionaries (empty if failed) with:
             at_config with booleans crc, echo, quiet and verbose
             reg_config with S-register tags and integer values
-        
+
         Raises:
             AtException if an error was returned.
 
         """
-        response = self.atcommand('AT&V')
+        _log.debug('Retrieving modem verbose configuration')
+        response = await self.atcommand('AT&V')
         if response[0] == 'ERROR':
-            self._handle_at_exception(response)
+            await self._handle_at_error(response)
         at_config = response[1]
         s_regs = response[2]
         echo, quiet, verbose, crc = at_config.split(' ')
@@ -234,16 +421,16 @@ class IdpModem:
             reg_config[name] = int(value)
         return (at_config, reg_config)
 
-    def config_volatile_report(self) -> 'dict|None':
-        """Returns key S-register settings.
-        
+    async def config_volatile_report(self) -> 'dict|None':
+        """Gets key S-register settings.
+
         GNSS Mode (S39), GNSS fix timeout (S41), GNSS Continuous (S55),
-        GNSS Jamming Status (S56), GNSS Jamming Indicator (S57), 
+        GNSS Jamming Status (S56), GNSS Jamming Indicator (S57),
         Low power Wakeup Period (S51)
 
         Returns:
             Dictionary of S-register values, or None if failed
-            
+
         """
         register_list = [
             'S39',   #: GNSS Mode
@@ -253,27 +440,24 @@ class IdpModem:
             'S56',   #: GNSS Jamming Status
             'S57',   #: GNSS Jamming Indicator
         ]
-        command = 'AT'
+        _log.debug(f'Querying volatile S-register set: {register_list}')
+        batch = self.batch()
         for reg in register_list:
-            command += f'{reg if command == "AT" else " " + reg}?'
-        response = self.atcommand(command)
-        if response[0] == 'ERROR':
+            batch.query(reg)
+        results = await batch.execute_async()
+        if batch.errors:
             return None
-        #: else
-        response.remove('OK')
-        volatile_regs = {}
-        for r in range(len(response)):
-            volatile_regs[register_list[r]] = int(response[r])
-        return volatile_regs
+        return dict(zip(register_list, results))
 
-    def config_nvm_save(self) -> bool:
+    async def config_nvm_save(self) -> bool:
         """Sends the AT&W command and returns True if successful."""
-        response = self.atcommand('AT&W')
+        _log.debug('Saving modem configuration to non-volatile memory')
+        response = await self.atcommand('AT&W')
         return response[0] == 'OK'
 
-    def crc_enable(self, enable: bool = True) -> bool:
+    async def crc_enable(self, enable: bool = True) -> bool:
         """Sends the AT%CRC command and returns success flag.
-        
+
         Args:
             enable: turn on CRC if True else turn off
 
@@ -281,121 +465,141 @@ class IdpModem:
             True if the operation succeeded else False
 
         """
+        _log.debug(f'{"en" if enable else "dis"}abling modem CRC')
         command = f'AT%CRC={1 if enable else 0}'
-        response = self.atcommand(command)
+        response = await self.atcommand(command)
         if response[0] == 'ERROR':
             return False
         self.protocol.crc = enable
         self._at_config.crc = enable
         return True
 
-    @property
-    def mobile_id(self) -> 'str|None':
-        """Returns the unique Mobile ID (Inmarsat serial number)."""
+    async def mobile_id_get(self) -> 'str|None':
+        """Gets the unique Mobile ID (Inmarsat serial number)."""
         if self._mobile_id is None:
-            response = self.atcommand('AT+GSN', filter=['+GSN:'])
+            response = await self.atcommand('AT+GSN', filter=['+GSN:'])
             if response[0] != 'ERROR':
                 self._mobile_id = response[0]
         return self._mobile_id
 
-    @property
-    def versions(self) -> 'dict|None':
-        """Returns the hardware, firmware and AT versions."""
+    async def versions_get(self) -> 'dict|None':
+        """Gets the hardware, firmware and AT versions."""
         if not self._versions:
-            response = self.atcommand('AT+GMR', filter=['+GMR:'])
+            response = await self.atcommand('AT+GMR', filter=['+GMR:'])
             if response[0] != 'ERROR':
-                fw_ver, hw_ver, at_ver = response[0].split(',')
-                self._versions = {
-                    'hardware': hw_ver,
-                    'firmware': fw_ver,
-                    'at': at_ver,
-                }
+                self._versions = {}
+                versions = response[0].split(',')
+                if len(versions) == 3:
+                    self._versions['firmware'] = versions[0]
+                    self._versions['hardware'] = versions[1]
+                    self._versions['at'] = versions[2]
+                else:
+                    for i, v in enumerate(versions):
+                        self._versions[i] = v
         return self._versions
 
-    @property
-    def power_mode(self) -> 'str|None':
+    async def manufacturer_get(self) -> str:
+        """Gets the modem manufacturer reported by `ATI0`."""
+        if not self._manufacturer:
+            response = await self.atcommand('ATI0')
+            if response[0] == 'ERROR':
+                await self._handle_at_error(response)
+            self._manufacturer = response[0]
+        return self._manufacturer
+
+    async def model_get(self) -> str:
+        """Gets the modem model reported by `ATI4`."""
+        if not self._model:
+            response = await self.atcommand('ATI4')
+            if response[0] == 'ERROR':
+                await self._handle_at_error(response)
+            self._model = response[0]
+        return self._model
+
+    async def power_mode_get(self) -> 'PowerMode|None':
+        """Gets the modem power mode setting (enumerated) in `S50`."""
         if self._power_mode is None:
-            response = self.atcommand('ATS50?')
+            response = await self.atcommand('ATS50?')
             if response[0] != 'ERROR':
-                self._power_mode = int(response[0])
-        if self._power_mode in POWER_MODES:
-            return POWER_MODES[self._power_mode]
-    
-    @power_mode.setter
-    def power_mode(self, value: 'str|int'):
+                self._power_mode = PowerMode(int(response[0]))
+        return self._power_mode
+
+    async def power_mode_set(self, value: 'str|int|PowerMode'):
+        """Sets the modem power mode in `S50`."""
         if isinstance(value, str):
-            if value not in POWER_MODES.values():
-                raise ValueError(f'Invalid power mode {value}')
-            for k, v in POWER_MODES.items():
-                if v == value:
-                    value = k
-                    break
-        if value not in POWER_MODES:
-            raise ValueError(f'Invalid power mode {value}')
-        response = self.atcommand(f'ATS50={value}')
+            if value not in PowerMode.__members__:
+                raise ValueError(f'Invalid PowerMode {value}')
+            value = PowerMode[value].value
+        if not PowerMode.is_valid(value):
+            raise ValueError(f'Invalid PowerMode {value}')
+        response = await self.atcommand(f'ATS50={value}')
         if response[0] == 'OK':
-            self._power_mode = value
-    
-    @property
-    def wakeup_period(self) -> 'str|None':
+            self._power_mode = PowerMode(value)
+
+    async def wakeup_period_get(self) -> 'WakeupPeriod|None':
+        """Gets the modem wakeup period setting (enumerated) in `S51`."""
         if self._wakeup_period is None:
-            response = self.atcommand('ATS51?')
+            response = await self.atcommand('ATS51?')
             if response[0] != 'ERROR':
-                self._wakeup_period = int(response[0])
-        if self._wakeup_period in WAKEUP_PERIODS:
-            return WAKEUP_PERIODS[self._wakeup_period]
+                self._wakeup_period = WakeupPeriod(int(response[0]))
+        return self._wakeup_period
 
-    @wakeup_period.setter
-    def wakeup_period(self, value: 'str|int'):
+    async def wakeup_period_set(self, value: 'str|int|WakeupPeriod'):
+        """Sets the modem wakeup period in `S51`."""
         if isinstance(value, str):
-            if value not in WAKEUP_PERIODS.values():
-                raise ValueError(f'Invalid wakeup period {value}')
-            for k, v in WAKEUP_PERIODS.items():
-                if v == value:
-                    value = k
-                    break
-        if value not in WAKEUP_PERIODS:
-            raise ValueError(f'Invalid wakeup period {value}')
-        response = self.atcommand(f'ATS51={value}')
+            if value not in WakeupPeriod.__members__:
+                raise ValueError(f'Invalid WakeupPeriod {value}')
+            value = WakeupPeriod[value].value
+        if not WakeupPeriod.is_valid(value):
+            raise ValueError(f'Invalid WakeupPeriod {value}')
+        response = await self.atcommand(f'ATS51={value}')
         if response[0] == 'OK':
-            self._wakeup_period = value
-    
-    @property
-    def gnss_refresh_interval(self) -> int:
-        response = self.atcommand(f'ATS55?')
+            self._wakeup_period = WakeupPeriod(value)
+
+    async def temperature_get(self) -> int:
+        """Gets the temperature in degrees Celsius (`S85`)."""
+        response = await self.atcommand('ATS85?')
+        if response[0] != 'ERROR':
+            return int(float(response[0]) / 10)
+
+    async def gnss_refresh_interval_get(self) -> int:
+        """Gets the GNSS refresh interval in seconds (`S55`)."""
+        response = await self.atcommand(f'ATS55?')
         if response[0] != 'ERROR':
             return int(response[0])
 
-    @gnss_refresh_interval.setter
-    def gnss_refresh_interval(self, value: int):
-        self.gnss_continuous_set(value)
+    async def gnss_refresh_interval_set(self, value: int):
+        """Sets the GNSS refresh interval in seconds."""
+        await self.gnss_continuous_set(value)
 
-    def gnss_continuous_set(self,
-                            interval: int = 0,
-                            doppler: bool = True,
-                            ) -> bool:
+    async def gnss_continuous_set(self,
+                                  interval: int = 0,
+                                  doppler: bool = True,
+                                  ) -> bool:
         """Sets the GNSS continous mode (0 = on-demand).
-        
+
         Args:
             interval: Seconds between GNSS refresh.
             doppler: Often required for moving assets.
-        
+
         Returns:
             True if successful setting.
         """
         if interval < 0 or interval > 30:
             raise ValueError('GNSS continuous interval must be in range 0..30')
-        response = self.atcommand(f'AT%TRK={interval}{",1" if doppler else ""}')
+        _log.debug(f'Configuring GNSS continuous mode {interval} seconds')
+        response = await self.atcommand(
+            f'AT%TRK={interval}{",1" if doppler else ""}')
         if response[0] == 'ERROR':
             return False
         return True
 
-    def gnss_nmea_get(self,
-                      stale_secs: int = GNSS_STALE_SECS,
-                      wait_secs: int = GNSS_WAIT_SECS,
-                      nmea: 'list[str]' = ['RMC', 'GSA', 'GGA', 'GSV'],
-                      ) -> list:
-        """Returns a list of NMEA-formatted sentences from GNSS.
+    async def gnss_nmea_get(self,
+                            stale_secs: int = GNSS_STALE_SECS,
+                            wait_secs: int = GNSS_WAIT_SECS,
+                            nmea: 'list[str]' = ['RMC', 'GSA', 'GGA', 'GSV'],
+                            ) -> list:
+        """Gets a list of NMEA-formatted sentences from GNSS.
 
         Args:
             stale_secs: Maximum age of fix in seconds (1..600)
@@ -425,15 +629,17 @@ class IdpModem:
             sentences += f'"{sentence}"'
         timeout = wait_secs + BUFFER_SECONDS
         request_time = time()
-        response = self.atcommand(f'AT%GPS={stale_secs}'
+        _log.debug(f'Querying GNSS NMEA sentences {sentences}')
+        response = await self.atcommand(f'AT%GPS={stale_secs}'
                                         f',{wait_secs},{sentences}',
                                         timeout=timeout,
                                         filter=['%GPS:'])
         if response[0] == 'ERROR':
             if self.error_detail:
-                if 'TIMEOUT' in response[1]:
-                    raise AtGnssTimeout(response[1])
-            self._handle_at_exception(response)
+                detail = await self.at_error_detail(response)
+                if 'TIMEOUT' in detail:
+                    raise AtGnssTimeout(detail)
+            await self._handle_at_error(response)
         response.remove('OK')
         time_to_fix = round(time() - request_time, 3)
         if 'gnss_ttf' not in self._statistics:
@@ -444,23 +650,42 @@ class IdpModem:
             self._statistics['gnss_ttf'] = avg_ttf
         return response
 
-    @property
-    def location(self) -> 'Location|None':
+    async def location_get(self) -> 'Location|None':
+        """Gets the modem location derived from NMEA data."""
         try:
-            nmea_sentences = self.gnss_nmea_get(self._loc_query['stale_secs'],
-                                                self._loc_query['wait_secs'])
+            nmea_sentences = await self.gnss_nmea_get(
+                self._loc_query['stale_secs'], self._loc_query['wait_secs'])
             return location_from_nmea(nmea_sentences)
         except:
             return None
 
-    def message_mo_send(self,
-                        data: 'bytes|bytearray|str',
-                        data_format: int = DataFormat.BASE64,
-                        name: str = None,
-                        priority: int = MessagePriority.LOW,
-                        sin: int = None,
-                        min: int = None,
-                        ) -> str:
+    async def gnss_jamming_get(self) -> bool:
+        """Gets the GNSS jamming detection status (`S56`)."""
+        response = await self.atcommand('ATS56?')
+        if response[0] != 'ERROR':
+            return ((int(response[0]) & 0b100) >> 2 == 1)
+
+    async def gnss_mode_get(self) -> GnssMode:
+        """Gets the GNSS operating mode setting (`S39`)."""
+        response = await self.atcommand('ATS39?')
+        if response[0] != 'ERROR':
+            return GnssMode(int(response[0]))
+
+    async def gnss_mode_set(self, mode: GnssMode):
+        """Sets the GNSS operating mode (`S39`)."""
+        response = await self.atcommand(f'ATS39={mode.value}')
+        if response[0] == 'ERROR':
+            await self._handle_at_error(response)
+
+    async def message_mo_send(self,
+                              data: 'bytes|bytearray|str',
+                              data_format: int = DataFormat.BASE64,
+                              name: str = None,
+                              priority: int = MessagePriority.LOW,
+                              sin: int = None,
+                              min: int = None,
+                              timeout: int = None,
+                              ) -> str:
         """Submits a mobile-originated message to send.
 
         When submitting raw bytes, the first byte will be used as SIN. The
@@ -468,7 +693,7 @@ class IdpModem:
         When submitting a string, the `sin` field is expected to be set and
         the data field will be appended to the `sin` byte and optionally the
         `min` byte if specified.
-        
+
         Args:
             data: The data raw bytes or UTF-8 Text, Hexadecimal or Base64 string
             data_format: 1=text, 2=hexadecimal, 3=base64 (default)
@@ -478,10 +703,12 @@ class IdpModem:
             sin: Optional first byte of payload used for codec, required if data
                 is string type.
             min: Optional second byte of payload used for codec
+            timeout: Optional timeout. If not provided will be calculated from
+                the baudrate for the maximum message size, *3
 
         Returns:
             Name of the message if successful, or the error string.
-        
+
         Raises:
             AtException if an error was returned by the modem.
 
@@ -493,27 +720,29 @@ class IdpModem:
             data_format = DataFormat.BASE64
         elif not isinstance(data, str):
             raise ValueError('Invalid data must be bytes, bytearray or string')
-        elif not isinstance(sin, int) or sin not in range(16, 256):
+        if not isinstance(sin, int) or sin not in range(16, 256):
             raise ValueError('Invalid SIN must be 16..255')
         if isinstance(min, int) and min not in range(0, 256):
             raise ValueError('Invalid MIN must be 0..255')
         min = f'.{min}' if min is not None else ''
         data = f'"{data}"' if data_format == DataFormat.TEXT else data
+        _log.debug(f'Submitting MO message with name {name}')
         command = f'AT%MGRT="{name}",{priority},{sin}{min},{data_format},{data}'
-        response = self.atcommand(command)
+        max_timeout = timeout or ceil(6400 / (self.baudrate / 8)) * 3
+        response = await self.atcommand(command, timeout=max_timeout)
         if response[0] == 'ERROR':
-            self._handle_at_exception(response)
+            await self._handle_at_error(response)
         return name
 
-    def message_mo_state(self, name: str = None) -> 'list[dict]':
-        """Returns the message state(s) requested.
-        
+    async def message_mo_state(self, name: str = None) -> 'list[dict]':
+        """Gets the message state(s) requested.
+
         If no name filter is passed in, all available messages states
-        are returned.  Returns False is the request failed.
+        are returned.
 
         Args:
-            name: The unique message name in the modem queue. If none is
-                provided, all available message states in transmit queue will be
+            name: The unique message name in the modem queue. If name is
+                None, all available message states in transmit queue will be
                 returned.
 
         Returns:
@@ -527,7 +756,8 @@ class IdpModem:
         """
         states = []
         name = f'="{name}"' if name is not None else ''
-        response = self.atcommand(f'AT%MGRS{name}', filter=['%MGRS:'])
+        _log.debug(f'Querying MO message states {name if name else ""}')
+        response = await self.atcommand(f'AT%MGRS{name}', filter=['%MGRS:'])
         # %MGRS: "<name>",<msg_no>,<priority>,<sin>,<state>,<size>,<sent_bytes>
         if response[0] != 'ERROR':
             response.remove('OK')
@@ -542,35 +772,37 @@ class IdpModem:
                         'sent': int(detail[6]),
                     })
         return states
-    
-    def message_mo_cancel(self, name: str) -> bool:
+
+    async def message_mo_cancel(self, name: str) -> bool:
         """Cancels a mobile-originated message in the Tx ready state."""
-        response = self.atcommand(f'AT%MGRC="{name}"')
+        _log.debug(f'Attempting to cancel message {name}')
+        response = await self.atcommand(f'AT%MGRC="{name}"')
         if response[0] == 'ERROR':
             return False
         return True
 
-    def message_mo_clear(self) -> int:
+    async def message_mo_clear(self) -> int:
         """Clears the modem transmit queue and returns the count cancelled.
-        
+
         Returns:
             Count of messages deleted, or -1 in case of error
 
         """
-        list_response = self.atcommand('AT%MGRL', filter=['%MGRL:'])
+        list_response = await self.atcommand('AT%MGRL', filter=['%MGRL:'])
         if list_response[0] == 'ERROR':
             return -1
         message_count = len(list_response)
         for msg in list_response:
-            del_response = self.atcommand(f'AT%MGRD={msg}C')
+            _log.debug(f'Attempting to delete MO message {msg}')
+            del_response = await self.atcommand(f'AT%MGRD={msg}C')
             if del_response[0] == 'ERROR':
                 _log.error(f'Error clearing messages from transmit queue')
                 return -1
         return message_count
 
-    def message_mt_waiting(self) -> 'list[dict]':
-        """Returns a list of received mobile-terminated message information.
-        
+    async def message_mt_waiting(self) -> 'list[dict]':
+        """Gets a list of received mobile-terminated message information.
+
         Returns:
             List of message metadata in the receive queue including:
             - `name` (str)
@@ -583,7 +815,8 @@ class IdpModem:
 
         """
         waiting = []
-        response = self.atcommand('AT%MGFN', filter=['%MGFN:'])
+        _log.debug('Querying for waiting MT messages')
+        response = await self.atcommand('AT%MGFN', filter=['%MGFN:'])
         #: %MGFN: "name",number,priority,sin,state,length,bytes_received
         if response[0] != 'ERROR':
             response.remove('OK')
@@ -601,20 +834,23 @@ class IdpModem:
                         })
         return waiting
 
-    def message_mt_get(self,
-                       name: str,
-                       data_format: int = DataFormat.BASE64,
-                       meta: bool = False,
-                       ) -> 'bytes|dict':
-        """Returns the payload of a specified mobile-terminated message.
-        
-        Payload is presented as a string with encoding based on data_format. 
+    async def message_mt_get(self,
+                             name: str,
+                             data_format: int = DataFormat.BASE64,
+                             meta: bool = False,
+                             timeout: int = None,
+                             ) -> 'bytes|dict':
+        """Gets the payload of a specified mobile-terminated message.
+
+        Payload is presented as a string with encoding based on data_format.
 
         Args:
             name: The unique name in the modem queue e.g. FM01.01
             data_format: text=1, hex=2, base64=3 (default)
             meta: If False returns raw bytes, else returns formatted data
                 with metadata.
+            timeout: Optional timeout. If not specified, will be calculated
+                based on the baudrate for the maximum message size, *3
 
         Returns:
             The raw data bytes if meta is False, or a dictionary with:
@@ -632,10 +868,26 @@ class IdpModem:
         """
         if not meta and data_format != DataFormat.BASE64:
             data_format = DataFormat.BASE64
-        response = self.atcommand(f'AT%MGFG="{name}",{data_format}')
+        if data_format == DataFormat.BASE64:
+            try:
+                detail, payload = await self.message_mt_get_buffer(name,
+                                                                   timeout)
+            except ValueError as err:
+                _log.exception(err)
+                return None
+            if not meta:
+                return bytes(payload)
+            detail['data_format'] = data_format
+            detail['data'] = b2a_base64(payload, newline=False).decode('ascii')
+            return detail
+        max_timeout = timeout or ceil(10000 / (self.baudrate / 8)) * 3
+        _log.debug(f'Retrieving waiting MT message {name}')
+        response = await self.atcommand(f'AT%MGFG="{name}",{data_format}',
+                                        filter=['%MGFG:'],
+                                        timeout=max_timeout)
         if response[0] == 'ERROR':
             _log.error(f'Error retrieving message {name}')
-            self._handle_at_exception(response)
+            await self._handle_at_error(response)
         #: name, number, priority, sin, state, length, data_format, data
         try:
             detail = response[0].split(',')
@@ -644,12 +896,6 @@ class IdpModem:
             data_str_no_sin = detail[7]
             if data_format == DataFormat.HEX:
                 data = hex(msg_sin) + data_str_no_sin.lower()
-            elif data_format == DataFormat.BASE64:
-                # add SIN byte to base64 blob
-                databytes = bytes([msg_sin]) + b64decode(data_str_no_sin)
-                if not meta:
-                    return databytes
-                data = b64encode(databytes).decode('ascii')
             elif data_format == DataFormat.TEXT:
                 data = f'\\{msg_sin:02x}' + data_str_no_sin
             return {
@@ -667,9 +913,143 @@ class IdpModem:
         except Exception as err:
             _log.exception(err)
 
-    def message_mt_delete(self, name: str) -> bool:
+    async def message_mt_get_buffer(self,
+                                   name: str,
+                                   timeout: int = None,
+                                   ) -> 'tuple[dict, memoryview]':
+        """Gets a mobile-terminated message payload without extra copies.
+
+        The base64 `%MGFG` response frame is parsed in place and decoded
+        into a buffer with the SIN byte at offset 0.
+
+        Args:
+            name: The unique name in the modem queue e.g. FM01.01
+            timeout: Optional timeout. If not specified, will be calculated
+                based on the baudrate for the maximum message size, *3
+
+        Returns:
+            A tuple with the message metadata (as `message_mt_get` with
+                `meta=True`, without `data_format` or `data`) and a
+                memoryview of the payload including the SIN byte.
+
+        Raises:
+            AtException if the modem returned an error.
+
+        """
+        max_timeout = timeout or ceil(10000 / (self.baudrate / 8)) * 3
+        _log.debug(f'Retrieving waiting MT message {name}')
+        frames = await self.atcommand(mgfg_command(name),
+                                      timeout=max_timeout,
+                                      raw=True)
+        frame = mgfg_response_frame(frames)
+        if frame is None:
+            _log.error(f'Error retrieving message {name}')
+            response = [line for line in (f.decode('ascii', 'replace').strip()
+                                          for f in frames) if line]
+            await self._handle_at_error(response or ['ERROR'])
+        return mgfg_parse(frame)
+
+    async def message_mt_drain(self,
+                               max_bytes: int = None,
+                               priority_order: bool = True,
+                               timeout: int = None,
+                               delete_on_close: bool = True,
+                               ) -> 'AsyncIterator[tuple[dict, memoryview]]':
+        """Retrieves and deletes the complete mobile-terminated messages.
+
+        The receive queue is queried once, then each message is retrieved in
+        priority order (see `message_mt_waiting`) skipping any still
+        `RX_PENDING`. A yielded message is deleted on the same command line
+        as retrieval of the next message, or when the generator finishes.
+
+        Delivery is at-most-once: by default the last yielded message is
+        also deleted when the generator is closed early, whether by `break`
+        or by garbage collection after an exception in the loop body. Use
+        `delete_on_close=False` to leave it in the receive queue instead,
+        to be retrieved again.
+
+        Example::
+
+            async for meta, payload in modem.message_mt_drain():
+                decode(payload)
+
+        Args:
+            max_bytes: Optional limit of the total size retrieved. At least
+                one message is retrieved if any are complete.
+            priority_order: If False retrieves in modem queue order.
+            timeout: Optional timeout per message (see `message_mt_get`).
+            delete_on_close: If False the last yielded message is not deleted
+                when the generator is closed before it finishes.
+
+        Yields:
+            Tuples of metadata and payload as `message_mt_get_buffer`.
+
+        """
+        waiting = await self.message_mt_waiting()
+        pending = [m['name'] for m in waiting
+                   if m['state'] == MessageState.RX_PENDING]
+        if pending:
+            _log.debug(f'Skipping MT messages still receiving: {pending}')
+        consumed = None
+        try:
+            for message in mt_drain_order(waiting, max_bytes, priority_order):
+                name = message['name']
+                try:
+                    frame = None
+                    if consumed is not None:
+                        frame = await self._message_mt_get_deleting(
+                            name, consumed, timeout)
+                        if frame is None:
+                            await self.message_mt_delete(consumed)
+                        consumed = None
+                    if frame is None:
+                        result = await self.message_mt_get_buffer(name,
+                                                                  timeout)
+                    else:
+                        result = mgfg_parse(frame)
+                except (AtException, ValueError) as err:
+                    _log.warning(f'Skipping MT message {name}: {err}')
+                    if consumed is not None:
+                        delete, consumed = consumed, None
+                        await self.message_mt_delete(delete)
+                    continue
+                consumed = name
+                yield result
+        except GeneratorExit:
+            if not delete_on_close:
+                consumed = None
+            raise
+        finally:
+            if consumed is not None:
+                await self.message_mt_delete(consumed)
+
+    async def _message_mt_get_deleting(self,
+                                       name: str,
+                                       delete: str,
+                                       timeout: int = None,
+                                       ) -> 'bytes|None':
+        """Deletes a message and gets another on the same command line.
+
+        Returns:
+            The `%MGFG` response frame, or None if the line returned an
+                error, which aborts the rest of the line so the deletion may
+                not have completed.
+
+        Raises:
+            AtException if no response was received, in which case the
+                deletion may not have completed.
+
+        """
+        max_timeout = timeout or ceil(10000 / (self.baudrate / 8)) * 3
+        _log.debug(f'Deleting MT message {delete} and retrieving {name}')
+        frames = await self.atcommand(mgfg_command(name, [delete]),
+                                      timeout=max_timeout,
+                                      raw=True)
+        return mgfg_response_frame(frames)
+
+    async def message_mt_delete(self, name: str) -> bool:
         """Marks a Return message for deletion by the modem.
-        
+
         Args:
             name: The unique mobile-terminated name in the queue
 
@@ -677,70 +1057,80 @@ class IdpModem:
             True if the operation succeeded
 
         """
-        response = self.atcommand(f'AT%MGFM="{name}"')
+        _log.debug(f'Attempting to delete MT message {name}')
+        response = await self.atcommand(f'AT%MGFM="{name}"')
         if response[0] == 'ERROR':
-            err = f' ({response[1]})' if self.error_detail else ''
+            err = (f' ({await self.at_error_detail(response)})'
+                   if self.error_detail else '')
             _log.error(f'Error deleting message {name}{err}')
         return response[0] == 'OK'
 
-    @property
-    def transmitter_status(self):
-        response = self.atcommand('ATS54?')
+    async def transmitter_status_get(self) -> TransmitterStatus:
+        """Gets the transmitter status reported by `S54`"""
+        _log.debug('Querying transmitter status')
+        response = await self.atcommand('ATS54?')
         if response[0] == 'ERROR':
-            self._handle_at_exception(response)
+            await self._handle_at_error(response)
         return TransmitterStatus(int(response[0]))
 
-    def _trace_detail(self) -> dict:
-        response = self.atcommand('AT%EVMON', filter=['%EVMON:'])
+    async def _trace_detail(self) -> dict:
+        """Gets a dictionary of monitored and cached class/subclass pairs.
+
+        Returns:
+            `{ 'monitored': [(<class,subclass>)], 'cached': [<class,subclass)] }`
+        """
+        _log.debug('Querying monitored/cached trace events')
+        response = await self.atcommand('AT%EVMON', filter=['%EVMON:'])
         if response[0] == 'ERROR':
-            self._handle_at_exception(response)
-        events = response[0].split(',')
+            await self._handle_at_error(response)
+        response.remove('OK')
         detail = {
             'monitored': [],
             'cached': [],
         }
-        for event in events:
-            trace_class = int(event.split('.')[0])
-            trace_subclass = int(event.split('.')[1].replace('*', ''))
-            detail['monitored'].append((trace_class, trace_subclass))
-            if event.endswith('*'):
-                detail['cached'].append((trace_class, trace_subclass))
+        if len(response) > 0:
+            events: 'list[str]' = response[0].split(',')
+            for event in events:
+                trace_class = int(event.split('.')[0])
+                trace_subclass = int(event.split('.')[1].replace('*', ''))
+                detail['monitored'].append((trace_class, trace_subclass))
+                if event.endswith('*'):
+                    detail['cached'].append((trace_class, trace_subclass))
         return detail
 
-    @property
-    def trace_event_monitor(self) -> 'list[(int, int)]':
-        return self._trace_detail()['monitored']
-        
-    @trace_event_monitor.setter
-    def trace_event_monitor(self, events: 'list[(int, int)]'):
+    async def trace_event_monitor_get(self) -> 'list[tuple[int, int]]':
+        """Gets the list of class/subclass pairs being monitored to cache."""
+        return (await self._trace_detail())['monitored']
+
+    async def trace_event_monitor_set(self, events: 'list[tuple[int, int]]'):
+        """Set a list of trace class/subclass pairs to monitor and cache."""
         command = 'AT%EVMON='
         for event in events:
             trace_class, trace_subclass = event
             if command != 'AT%EVMON=':
                 command += ','
             command += f'{trace_class}.{trace_subclass}'
-        response = self.atcommand(command)
+        _log.debug(f'Setting trace event monitoring for {events}')
+        response = await self.atcommand(command)
         if response[0] == 'ERROR':
-            self._handle_at_exception(response)
+            await self._handle_at_error(response)
 
-    @property
-    def trace_events_cached(self) -> list:
-        return self._trace_detail()['cached']
+    async def trace_events_cached_get(self) -> 'list[tuple[int, int]]':
+        """Gets the list of trace events cached for retrieval."""
+        return (await self._trace_detail())['cached']
 
-    def trace_event_get(self,
-                        event: 'tuple[int, int]',
-                        meta: bool = False,
-                        ) -> 'str|dict':
+    async def trace_event_get(self,
+                              event: 'tuple[int, int]',
+                              meta: bool = False,
+                              ) -> 'str|dict':
         """Gets the cached event by class/subclass.
 
-        NOTE: Metadata feature is experimental.
-
         Args:
             event: tuple of (class, subclass)
             meta: Returns the raw text string if False (default)
-        
+
         Returns:
-            String if raw is True or metadata dictionary including:
+            String if meta is True, else metadata dictionary including:
             - `data_count` (int)
             - `signed_bitmask` (str)
             - `mobile_id` (str)
@@ -749,7 +1139,7 @@ class IdpModem:
             - `subclass` (str)
             - `priority` (str)
             - `data` (str)
-        
+
         Raises:
             AtException
 
@@ -764,12 +1154,14 @@ class IdpModem:
         if not (isinstance(event, tuple) and len(event) == 2):
             raise ValueError('event_get expects (class, subclass)')
         trace_class, trace_subclass = event
-        response = self.atcommand(f'AT%EVNT={trace_class},{trace_subclass}',
-                                  filter=['%EVNT:'])
+        _log.debug(f'Retrieving trace event class {trace_class}'
+                   f' subclass {trace_subclass}')
+        response = await self.atcommand(
+            f'AT%EVNT={trace_class},{trace_subclass}', filter=['%EVNT:'])
         #: res %EVNT: <dataCount>,<signedBitmask>,<MTID>,<timestamp>,
         # <class>,<subclass>,<priority>,<data0>,<data1>,..,<dataN>
         if response[0] == 'ERROR':
-            self._handle_at_exception(response)
+            await self._handle_at_error(response)
         if not meta:
             return response[0]
         eventdata = response[0].split(',')
@@ -780,7 +1172,8 @@ class IdpModem:
             'class': int(eventdata[4]),
             'subclass': int(eventdata[5]),
             'priority': int(eventdata[6]),
-            'data': eventdata[7:]
+            'raw_data': eventdata[7:],
+            'data': {},
         }
         iso_time = datetime.utcfromtimestamp(event['timestamp']).isoformat()
         event['isotime'] = iso_time[:19] + 'Z'
@@ -789,17 +1182,16 @@ class IdpModem:
             bitmask = '0' + bitmask
         for i, bit in enumerate(reversed(bitmask)):
             if bit == '1':
-                event['data'][i] = signed32(int(event['data'][i]))
+                event['raw_data'][i] = signed32(int(event['raw_data'][i]))
             else:
-                event['data'][i] = int(event['data'][i])
-        # TODO lookup class/subclass definitions
+                event['raw_data'][i] = int(event['raw_data'][i])
         for trace_def in EVENT_TRACES:
             if trace_def.trace_class != trace_class:
                 continue
             if trace_def.trace_subclass != trace_subclass:
                 continue
             try:
-                for i, value in enumerate(event['data']):
+                for i, value in enumerate(event['raw_data']):
                     tag, data_type = trace_def.data[i]
                     new_value = value
                     if 'flags' in tag and isinstance(data_type, dict):
@@ -815,7 +1207,7 @@ class IdpModem:
                                 new_value = data_type(value)
                             except:
                                 pass   # new_value stays as value
-                    event['data'][i] = { tag: new_value }
+                    event['data'][tag] = new_value
             except Exception as err:
                 _log.exception(err)
         return event
@@ -828,77 +1220,143 @@ class IdpModem:
                 events.append(notification)
         return events
 
-    @property
-    def event_notification_monitor(self) -> 'list[EventNotification]':
-        response = self.atcommand('ATS88?')
+    async def event_notification_monitor_get(self,
+                                             ) -> 'list[EventNotification]':
+        """Gets the events monitored to assert the notification pin (`S88`)."""
+        _log.debug('Querying event notification config')
+        response = await self.atcommand('ATS88?')
         if response[0] == 'ERROR':
-            self._handle_at_exception(response)
+            await self._handle_at_error(response)
         return self._list_events(int(response[0]))
-    
-    @event_notification_monitor.setter
-    def event_notification_monitor(self, event_list: 'list[EventNotification]'):
+
+    async def event_notification_monitor_set(self,
+            event_list: 'list[EventNotification]'):
+        """Sets the events monitored to assert the notification pin (`S88`)."""
         bitmask = 0
         for event in event_list:
             bitmask = bitmask | event
-        response = self.atcommand(f'ATS88={bitmask}')
+        _log.debug(f'Setting event notifications: {event_list}')
+        response = await self.atcommand(f'ATS88={bitmask}')
         if response[0] == 'ERROR':
-            self._handle_at_exception(response)
+            await self._handle_at_error(response)
 
-    @property
-    def event_notifications(self) -> 'list[EventNotification]':
-        response = self.atcommand('ATS89?')
+    async def event_notifications_get(self) -> 'list[EventNotification]':
+        """Gets the list of active events reported in `S89`."""
+        _log.debug('Querying active event notifications')
+        response = await self.atcommand('ATS89?')
         if response[0] == 'ERROR':
-            self._handle_at_exception(response)
+            await self._handle_at_error(response)
         return self._list_events(int(response[0]))
-    
-    @property
-    def control_state(self) -> 'int|None':
-        self.satellite_status_get()
-        return SatlliteControlState(self._ctrl_state)
-    
-    @property
-    def network_status(self) -> 'str|None':
-        if self._ctrl_state is None:
-            self.satellite_status_get()
-        return SatlliteControlState(self._ctrl_state).name
 
-    @property
-    def beamsearch_state(self) -> 'int|None':
-        self.satellite_status_get()
-        return BeamSearchState(self._beamsearch_state)
-    
-    @property
-    def beamsearch(self) -> 'str|None':
-        if self._beamsearch_state is None:
-            self.satellite_status_get()
-        return BeamSearchState(self._beamsearch_state).name
+    async def control_state_get(self) -> 'SatlliteControlState|None':
+        """Gets the control state enumerated value.
+
+        Trace Class 3, Subclass 1, Data 22
+        """
+        ctrl_state = await self.satellite_metrics.get_async('control_state')
+        if ctrl_state is not None:
+            return SatlliteControlState(ctrl_state)
+
+    async def network_status_get(self) -> 'str|None':
+        """Gets the network status derived from control state."""
+        control_state = await self.control_state_get()
+        if control_state is not None:
+            return control_state.name
+
+    async def registered_get(self) -> bool:
+        """Indicates the modem is registered on the network."""
+        return await self.control_state_get() == 10
+
+    async def beamsearch_state_get(self) -> 'BeamSearchState|None':
+        """Gets the beam search state (Trace Class 3, Subclass 1, Data 23)"""
+        beamsearch_state = await self.satellite_metrics.get_async(
+            'beamsearch_state')
+        if beamsearch_state is not None:
+            return BeamSearchState(beamsearch_state)
+
+    async def beamsearch_get(self) -> 'str|None':
+        """Gets the beam search state description."""
+        beamsearch_state = await self.beamsearch_state_get()
+        if beamsearch_state is not None:
+            return beamsearch_state.name
+
+    async def snr_get(self) -> 'float|None':
+        """Gets the average main beam Carrier-to-Noise (C/N0)."""
+        return await self.satellite_metrics.get_async('snr')
+
+    async def signal_quality_get(self) -> SignalQuality:
+        """Gets a qualitative interpretation of the SNR."""
+        signal_quality = SignalQuality.NONE
+        snr = await self.snr_get()
+        if snr is not None:
+            if snr > SignalLevelRegional.INVALID.value:
+                signal_quality = SignalQuality.WARNING
+            elif snr > SignalLevelRegional.BARS_5.value:
+                signal_quality = SignalQuality.STRONG
+            elif snr > SignalLevelRegional.BARS_4.value:
+                signal_quality = SignalQuality.GOOD
+            elif snr > SignalLevelRegional.BARS_3.value:
+                signal_quality = SignalQuality.MID
+            elif snr > SignalLevelRegional.BARS_2.value:
+                signal_quality = SignalQuality.LOW
+            elif snr > SignalLevelRegional.BARS_1.value:
+                signal_quality = SignalQuality.WEAK
+        return signal_quality
+
+    async def satellite_get(self) -> 'str|None':
+        """Gets the current active satellite name."""
+        geo_beam_id = await self.satellite_metrics.get_async('geo_beam_id')
+        return geo_beam_satellite(geo_beam_id)
+
+    async def beam_id_get(self) -> 'str|None':
+        """Gets the current active regional beam ID of the active satellite."""
+        geo_beam_id = await self.satellite_metrics.get_async('geo_beam_id')
+        return geo_beam_name(geo_beam_id)
+
+    async def _satellite_status_fetch(self, names: 'list[str]') -> dict:
+        """Queries the trace data of satellite status metrics.
+
+        Called by `satellite_metrics` with the names of the stale metrics,
+        which are read on a single command line.
+
+        """
+        _log.debug(f'Querying satellite status {names}')
+        batch = self.batch()
+        requests = []
+        for (trace_class, subclass), group in trace_groups(SAT_STATUS_TRACES,
+                                                           names).items():
+            indices = [SAT_STATUS_TRACES[name][2] for name in group]
+            requests.append((batch.trace(trace_class, subclass, indices),
+                             group))
+        results = await batch.execute_async()
+        values = {}
+        for index, group in requests:
+            if results[index] is not None:
+                values.update(zip(group, results[index]))
+        if 'snr' in values:
+            values['snr'] = round(values['snr'] / 100.0, 2)
+        missing = [name for name in names if name not in values]
+        if 'geo_beam_id' in missing:
+            #: S102 returns ERROR until a satellite is acquired
+            _log.debug('Geo beam ID unavailable - querying other metrics')
+            values['geo_beam_id'] = 0
+            self.satellite_metrics.expire_after('geo_beam_id', SAT_STATUS_TTL)
+            missing.remove('geo_beam_id')
+            if missing:
+                values.update(await self._satellite_status_fetch(missing))
+        elif missing:
+            error = batch.errors[0]
+            if error and error[0] == 'ERROR':
+                await self._handle_at_error(error)
+            raise AtException(f'Unexpected satellite status response {error}')
+        return values
+
+    async def satellite_status_get(self) -> dict:
+        """Gets various satellite acquisition metrics.
+
+        Stale metrics are refreshed with a single query. Use
+        `satellite_metrics.refresh_async()` to force a refresh.
 
-    @property
-    def snr(self) -> 'float|None':
-        self.satellite_status_get()
-        return self._snr
-            
-    @property
-    def satellite(self) -> 'str|None':
-        if self._geo_beam_id is None:
-            self.satellite_status_get()
-        if self._geo_beam_id is not None:
-            if self._geo_beam_id in GEOBEAMS:
-                return GEOBEAMS[self._geo_beam_id].split(' ')[0]
-            return f'UNDEFINED {self._geo_beam_id}'
-    
-    @property
-    def beam_id(self) -> 'str|None':
-        if self._geo_beam_id is None:
-            self.satellite_status_get()
-        if self._geo_beam_id is not None:
-            if self._geo_beam_id in GEOBEAMS:
-                return GEOBEAMS[self._geo_beam_id].split(' ')[1]
-            return f'GEO{self._geo_beam_id}'
-        
-    def satellite_status_get(self) -> dict:
-        """Returns the control state and C/No.
-        
         Returns:
             Dictionary including:
             - `satellite` (str)
@@ -908,54 +1366,29 @@ class IdpModem:
             - `beamsearch` (str)
             - `beamsearch_state` (int)
             - `snr` (float)
-        
+
         """
-        if ('sat_status' in self._holdoffs and
-            int(time()) - self._holdoffs['sat_status'] < SAT_STATUS_HOLDOFF):
-            _log.debug('Ignoring repeat satellite status query')
-            return
-        _log.debug('Querying satellite status')
-        self._holdoffs['sat_status'] = int(time())
-        # Trace events:
-        #   Class 3 Subclass 1 C/N, Satellite Control State, Beam Search State
-        #   Class 3 Subclass 5 Geo Beam ID
-        command = ('ATS90=3 S91=1 S92=1 S116? S122? S123?'
-                   ' S90=3 S91=5 S92=1 S102?')
-        response = self.atcommand(command)
-        if response[0] == 'ERROR':
-            self._handle_at_exception(response)
-        self._snr = round(int(response[0]) / 100.0, 2)
-        self._ctrl_state = int(response[1])
-        self._beamsearch_state = int(response[2])
-        self._geo_beam_id = int(response[3])
-        return {
-            'satellite': self.satellite,
-            'beam_id': self.beam_id,
-            'network_status': self.network_status,
-            'control_state': self._ctrl_state,
-            'beamsearch': self.beamsearch,
-            'beamsearch_state': self._beamsearch_state,
-            'snr': self._snr,
-        }
+        metrics = await self.satellite_metrics.get_many_async()
+        return satellite_status(metrics)
 
-    def shutdown(self) -> bool:
+    async def shutdown(self) -> bool:
         """Tell the modem to prepare for power-down."""
-        _log.warning('Attempting to shut down')
-        response = self.atcommand('AT%OFF')
+        _log.warning('Attempting to shut down modem')
+        response = await self.atcommand('AT%OFF')
         if response[0] == 'ERROR':
-            self._handle_at_exception(response)
+            await self._handle_at_error(response)
         return True
 
-    def utc_time(self) -> str:
-        """Returns current UTC time of the modem in ISO8601 format."""
+    async def utc_time_get(self) -> str:
+        """Gets current UTC time of the modem in ISO8601 format."""
         _log.debug('Querying system time')
-        response = self.atcommand('AT%UTC', filter=['%UTC:'])
+        response = await self.atcommand('AT%UTC', filter=['%UTC:'])
         if response[0] == 'ERROR':
-            self._handle_at_exception(response)
+            await self._handle_at_error(response)
         return response[0].replace(' ', 'T') + 'Z'
 
-    def s_register_get(self, register: 'str|int') -> int:
-        """Returns the value of the S-register requested.
+    async def s_register_get(self, register: 'str|int') -> int:
+        """Gets the value of the S-register requested.
 
         Args:
             register: The register name/number (e.g. S80)
@@ -969,46 +1402,20 @@ class IdpModem:
             except ValueError:
                 raise ValueError(f'Invalid S-register {register}')
         _log.debug(f'Querying S-register {register}')
-        response = self.atcommand(f'ATS{register}?')
+        response = await self.atcommand(f'ATS{register}?')
         if response[0] == 'ERROR':
-            self._handle_at_exception(response)
+            await self._handle_at_error(response)
         return int(response[0])
 
-    def _s_registers_read(self) -> None:
-        command = 'AT'
+    async def _s_registers_read(self) -> None:
+        """Reads all defined S-registers."""
+        batch = self.batch()
         for reg in self.s_registers:
-            if command != 'AT':
-                command += ' '
-            command += f'{reg}?'
-        response = self.atcommand(command)
-        if response[0] == 'ERROR':
+            batch.query(reg)
+        _log.debug('Querying all S-register values')
+        results = await batch.execute_async()
+        if batch.errors:
             _log.error('Could not read S-registers')
-            raise
-        index = 0
-        for name, register in self.s_registers.items():
-            register.value = response[index]
-            index += 1
-
-    def s_register_get_definitions(self) -> list:
-        """Returns a list of S-register definitions.
-        R=read-only, S=signed, V=volatile
-        
-        Returns:
-            tuple(register, RSV, current, default, minimum, maximum) or None
-        """
-        raise NotImplementedError
-        #: AT%SREG
-        #: Sreg, RSV, CurrentVal, DefaultVal, MinimumVal, MaximumVal
-        response = self.atcommand('AT%SREG')
-        if response[0] == 'ERROR':
-            self._handle_at_exception(response)
-        response.remove('OK')
-        # header_rows = response[0:1]
-        # Sreg RSV CurrentVal NvmValue DefaultValue MinimumValue MaximumVal
-        reg_defs = response[2:]
-        registers = []
-        for row in reg_defs:
-            reg_def = row.split(' ')
-            reg_def = tuple(filter(None, reg_def))
-            registers.append(reg_def)
-        return registers
+            await self._handle_at_error(batch.errors[0])
+        for register, value in zip(self.s_registers.values(), results):
+            register.value = value
@@ -0,0 +1,323 @@
+"""Multiplexes many IDP modems over a single asyncio event loop.
+
+A `ModemPool` drives any number of modems from one thread. Each modem has its
+own command queue serviced by a worker task, unsolicited data from every
+modem is passed to a shared set of event handlers, and command statistics
+are aggregated across the pool.
+
+On POSIX, pyserial waits on each port with `select()`, which cannot watch
+file descriptors numbered 1024 or above. Each open port uses several
+descriptors, so a single process is practically limited to roughly 200 ports.
+
+Example::
+
+    pool = ModemPool()
+    pool.add('north', '/dev/ttyUSB0')
+    pool.add('south', '/dev/ttyUSB1')
+    await pool.connect()
+    temperatures = await pool.broadcast('temperature_get')
+    await pool.disconnect()
+
+"""
+import asyncio
+import inspect
+import logging
+import threading
+from functools import partial
+from time import monotonic
+from typing import Callable
+
+from idpmodem.aterror import AtTimeout
+from idpmodem.asyncio.modem import IdpModem
+
+_log = logging.getLogger(__name__)
+
+
+class _PoolMember:
+    """A modem in the pool with its command queue and statistics."""
+    def __init__(self, name: str, modem: IdpModem) -> None:
+        self.name = name
+        self.modem = modem
+        self.queue: asyncio.Queue = None
+        self.worker: asyncio.Task = None
+        self.statistics = {
+            'commands': 0,
+            'errors': 0,
+            'timeouts': 0,
+            'latency': 0.0,
+            'queue_peak': 0,
+        }
+
+
+class ModemPool:
+    """Manages a set of named asyncio modems from a single event loop.
+
+    Operations are submitted by modem name and executed in the order
+    submitted for that modem, while operations on different modems run
+    concurrently.
+
+    Attributes:
+        modem_kwargs (dict): Default keyword arguments for each `IdpModem`.
+
+    """
+    def __init__(self, **modem_kwargs) -> None:
+        """Create an empty pool.
+
+        Args:
+            **modem_kwargs: Defaults passed to each `IdpModem` created by `add`
+                e.g. `baudrate`, `error_detail`
+
+        """
+        self.modem_kwargs = modem_kwargs
+        self._members: 'dict[str, _PoolMember]' = {}
+        self._event_handlers: 'list[Callable]' = []
+        self._events: asyncio.Queue = None
+        self._dispatcher: asyncio.Task = None
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._members
+
+    def __getitem__(self, name: str) -> IdpModem:
+        return self._members[name].modem
+
+    @property
+    def names(self) -> 'list[str]':
+        return list(self._members.keys())
+
+    def add(self, name: str, serial_port: str, **kwargs) -> IdpModem:
+        """Adds a modem to the pool (connected by the next `connect`).
+
+        Args:
+            name: A unique name for the modem within the pool.
+            serial_port: The serial port (or pyserial URL) of the modem.
+            **kwargs: Overrides of the pool `modem_kwargs` for this modem.
+
+        Returns:
+            The `IdpModem` instance.
+
+        Raises:
+            ValueError if the name is already in use.
+
+        """
+        if name in self._members:
+            raise ValueError(f'Modem {name} already in pool')
+        modem = IdpModem(serial_port, **{**self.modem_kwargs, **kwargs})
+        self._members[name] = _PoolMember(name, modem)
+        return modem
+
+    async def remove(self, name: str) -> None:
+        """Disconnects a modem and removes it from the pool."""
+        member = self._members.pop(name)
+        await self._stop(member)
+
+    def add_event_handler(self, handler: Callable) -> None:
+        """Registers a handler for unsolicited data from any modem.
+
+        Args:
+            handler: A function or coroutine function called with
+                `(name, data)` for each unsolicited line received.
+
+        """
+        if handler not in self._event_handlers:
+            self._event_handlers.append(handler)
+
+    def remove_event_handler(self, handler: Callable) -> None:
+        """Unregisters an event handler."""
+        self._event_handlers.remove(handler)
+
+    async def connect(self) -> 'list[str]':
+        """Connects all modems not yet connected and starts their workers.
+
+        Returns:
+            The names of any modems that failed to connect.
+
+        """
+        if self._events is None:
+            self._events = asyncio.Queue()
+            self._dispatcher = asyncio.create_task(self._dispatch())
+        pending = [m for m in self._members.values() if m.worker is None]
+        results = await asyncio.gather(
+            *[self._start(member) for member in pending],
+            return_exceptions=True)
+        failed = []
+        for member, result in zip(pending, results):
+            if isinstance(result, Exception):
+                _log.error(f'Unable to connect {member.name}: {result}')
+                failed.append(member.name)
+        return failed
+
+    async def disconnect(self) -> None:
+        """Disconnects all modems and stops event dispatch."""
+        await asyncio.gather(*[self._stop(m) for m in self._members.values()])
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            try:
+                await self._dispatcher
+            except asyncio.CancelledError:
+                pass
+        self._dispatcher = None
+        self._events = None
+
+    async def _start(self, member: _PoolMember) -> None:
+        if member.modem.transport is None:
+            await member.modem.connect()
+        member.queue = asyncio.Queue()
+        previous = member.modem.protocol.event_callback
+        member.modem.protocol.event_callback = partial(self._unsolicited,
+                                                       member,
+                                                       previous)
+        member.worker = asyncio.create_task(self._work(member))
+
+    async def _stop(self, member: _PoolMember) -> None:
+        if member.worker is not None:
+            member.worker.cancel()
+            try:
+                await member.worker
+            except asyncio.CancelledError:
+                pass
+            member.worker = None
+        while member.queue is not None and not member.queue.empty():
+            future: asyncio.Future = member.queue.get_nowait()[-1]
+            if not future.done():
+                future.set_exception(ConnectionError('Modem pool stopped'))
+        await member.modem.disconnect()
+
+    def _unsolicited(self,
+                     member: _PoolMember,
+                     previous: 'Callable|None',
+                     data: str) -> None:
+        """Chains to any prior callback then queues data for the handlers."""
+        if previous != member.modem._unsolicited:
+            member.modem._unsolicited(data)
+        if previous is not None:
+            previous(data)
+        if self._events is not None:
+            self._events.put_nowait((member.name, data))
+
+    async def _dispatch(self) -> None:
+        """Passes unsolicited data from all modems to the event handlers."""
+        while True:
+            name, data = await self._events.get()
+            for handler in list(self._event_handlers):
+                try:
+                    result = handler(name, data)
+                    if asyncio.iscoroutine(result):
+                        await result
+                except Exception as err:
+                    _log.exception(f'Event handler {handler} error: {err}')
+
+    async def _work(self, member: _PoolMember) -> None:
+        """Executes the operations queued for a modem in order."""
+        while True:
+            operation, args, kwargs, future = await member.queue.get()
+            if future.done():
+                continue
+            start = monotonic()
+            try:
+                result = await operation(member.modem, *args, **kwargs)
+                if not future.done():
+                    future.set_result(result)
+            except asyncio.CancelledError:
+                if not future.done():
+                    future.set_exception(ConnectionError('Modem pool stopped'))
+                raise
+            except Exception as err:
+                if isinstance(err, AtTimeout):
+                    member.statistics['timeouts'] += 1
+                else:
+                    member.statistics['errors'] += 1
+                if not future.done():
+                    future.set_exception(err)
+            finally:
+                member.statistics['commands'] += 1
+                member.statistics['latency'] += monotonic() - start
+
+    def submit(self,
+               name: str,
+               operation: 'str|Callable',
+               *args,
+               **kwargs) -> asyncio.Future:
+        """Queues an operation on a modem.
+
+        Args:
+            name: The name of the modem in the pool.
+            operation: The name of an `IdpModem` coroutine method
+                (e.g. `'temperature_get'`) or a coroutine function whose first
+                argument is the `IdpModem`.
+            *args: Positional arguments passed to the operation.
+            **kwargs: Keyword arguments passed to the operation.
+
+        Returns:
+            A future resolved with the result of the operation.
+
+        Raises:
+            KeyError if the modem is not in the pool.
+            ConnectionError if the modem is not connected.
+            ValueError if the operation is not a coroutine.
+
+        """
+        member = self._members[name]
+        if member.worker is None:
+            raise ConnectionError(f'Modem {name} not connected')
+        if isinstance(operation, str):
+            operation = getattr(IdpModem, operation, None)
+        if not inspect.iscoroutinefunction(operation):
+            raise ValueError('Operation must be an IdpModem coroutine')
+        future = asyncio.get_running_loop().create_future()
+        member.queue.put_nowait((operation, args, kwargs, future))
+        member.statistics['queue_peak'] = max(member.statistics['queue_peak'],
+                                              member.queue.qsize())
+        return future
+
+    async def broadcast(self,
+                        operation: 'str|Callable',
+                        *args,
+                        **kwargs) -> dict:
+        """Runs an operation on every connected modem concurrently.
+
+        Returns:
+            A dictionary of results (or the exception raised) by modem name.
+
+        """
+        names = [m.name for m in self._members.values() if m.worker]
+        futures = [self.submit(n, operation, *args, **kwargs) for n in names]
+        results = await asyncio.gather(*futures, return_exceptions=True)
+        return dict(zip(names, results))
+
+    def statistics(self, name: str = None) -> dict:
+        """Gets command statistics for one modem or aggregated for the pool.
+
+        Returns:
+            Dictionary including:
+            - `commands` (int) operations completed
+            - `errors` (int) operations that raised an exception
+            - `timeouts` (int) operations that raised `AtTimeout`
+            - `latency` (float) average seconds per operation
+            - `queued` (int) operations waiting
+            - `queue_peak` (int) maximum operations waiting
+            - `modems` (int) number of modems (pool only)
+            - `connected` (int) number of connected modems (pool only)
+            - `threads` (int) threads in the process (pool only)
+
+        """
+        members = ([self._members[name]] if name is not None
+                   else list(self._members.values()))
+        commands = sum(m.statistics['commands'] for m in members)
+        latency = sum(m.statistics['latency'] for m in members)
+        stats = {
+            'commands': commands,
+            'errors': sum(m.statistics['errors'] for m in members),
+            'timeouts': sum(m.statistics['timeouts'] for m in members),
+            'latency': round(latency / commands, 3) if commands else 0.0,
+            'queued': sum(m.queue.qsize() for m in members if m.queue),
+            'queue_peak': max([m.statistics['queue_peak'] for m in members],
+                              default=0),
+        }
+        if name is None:
+            stats['modems'] = len(members)
+            stats['connected'] = len([m for m in members if m.worker])
+            stats['threads'] = threading.active_count()
+        return stats
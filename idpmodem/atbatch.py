@@ -0,0 +1,199 @@
+"""Batching of S-register operations into the fewest AT command lines.
+
+The modem accepts multiple basic S-register commands on a single line
+separated by spaces (e.g. `ATS39? S41? S51?`), returning one response line
+per query in order, followed by a single result code.
+
+A batch collects queries, settings and trace captures, packs them into as
+few lines as fit within the modem's maximum command line length, then maps
+each response back to the request that produced it.
+
+If any command on a line fails the modem aborts the whole line, so every
+request on that line gets a result of `None`.
+
+"""
+import logging
+import os
+from typing import Callable
+
+AT_MAX_LINE_LENGTH = int(os.getenv('AT_MAX_LINE_LENGTH', 512))
+TRACE_DATA_REGISTER_OFFSET = 100
+
+_log = logging.getLogger(__name__)
+
+
+def _register_number(register: 'str|int') -> int:
+    if isinstance(register, str):
+        try:
+            register = int(register.upper().replace('S', ''))
+        except ValueError:
+            raise ValueError(f'Invalid S-register {register}')
+    if not isinstance(register, int) or register < 0:
+        raise ValueError(f'Invalid S-register {register}')
+    return register
+
+
+class _BatchItem:
+    """A request occupying one or more commands within a line."""
+    def __init__(self,
+                 commands: 'list[str]',
+                 queries: int,
+                 trace: 'tuple[int, int]' = None) -> None:
+        self.commands = commands
+        self.queries = queries
+        self.trace = trace
+
+    def length(self, elide_trace: bool = False) -> int:
+        commands = self.commands[3:] if elide_trace else self.commands
+        return sum(len(c) for c in commands) + len(commands)
+
+
+class AtBatch:
+    """Builds and executes a set of S-register operations.
+
+    Requests are executed in the order added. Each request method returns
+    the index of its result in the list returned by `execute`.
+
+    Attributes:
+        max_length (int): The maximum characters per command line.
+        errors (list): The responses of any lines that failed.
+
+    """
+    def __init__(self,
+                 atcommand: Callable,
+                 max_length: int = AT_MAX_LINE_LENGTH) -> None:
+        """Create a batch.
+
+        Args:
+            atcommand: The function that sends a command line and returns
+                the response as a list of strings (e.g. `IdpModem.atcommand`)
+            max_length: The maximum characters per command line.
+
+        """
+        self._atcommand = atcommand
+        self._items: 'list[_BatchItem]' = []
+        self.max_length = max_length
+        self.errors: 'list[list[str]]' = []
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def query(self, register: 'str|int') -> int:
+        """Adds a query of an S-register whose result is an `int`."""
+        reg = _register_number(register)
+        return self._add(_BatchItem([f'S{reg}?'], 1))
+
+    def set(self, register: 'str|int', value: int) -> int:
+        """Adds a setting of an S-register whose result is `True`."""
+        reg = _register_number(register)
+        return self._add(_BatchItem([f'S{reg}={int(value)}'], 0))
+
+    def trace(self,
+              trace_class: int,
+              trace_subclass: int,
+              data_indices: 'list[int]') -> int:
+        """Adds a trace capture whose result is a `list` of `int`.
+
+        Adjacent captures of the same class and subclass within a line
+        share a single capture rather than repeating the `S90/S91/S92` setup.
+
+        Args:
+            trace_class: The trace class (`S90`).
+            trace_subclass: The trace subclass (`S91`).
+            data_indices: The data indices to read (`S100` + index).
+
+        """
+        if not data_indices:
+            raise ValueError('No trace data indices specified')
+        commands = [f'S90={int(trace_class)}',
+                    f'S91={int(trace_subclass)}',
+                    'S92=1']
+        for i in data_indices:
+            commands.append(f'S{TRACE_DATA_REGISTER_OFFSET + int(i)}?')
+        return self._add(_BatchItem(commands,
+                                    len(data_indices),
+                                    (int(trace_class), int(trace_subclass))))
+
+    def _add(self, item: _BatchItem) -> int:
+        if 2 + item.length() - 1 > self.max_length:
+            raise ValueError('Request exceeds maximum command line length')
+        self._items.append(item)
+        return len(self._items) - 1
+
+    def _plan(self) -> 'list[tuple[str, list[int]]]':
+        """Packs requests into lines as tuples (command, request indices)."""
+        lines = []
+        command = ''
+        indices = []
+        last_trace = None
+        for i, item in enumerate(self._items):
+            elide = item.trace is not None and item.trace == last_trace
+            length = item.length(elide)
+            if command and 2 + len(command) + length > self.max_length:
+                lines.append((f'AT{command}', indices))
+                command, indices, last_trace = '', [], None
+                elide = False
+            commands = item.commands[3:] if elide else item.commands
+            command += (' ' if command else '') + ' '.join(commands)
+            indices.append(i)
+            if item.trace is not None:
+                last_trace = item.trace
+            elif any(c.startswith(('S90=', 'S91=')) for c in commands):
+                last_trace = None
+        if command:
+            lines.append((f'AT{command}', indices))
+        return lines
+
+    def commands(self) -> 'list[str]':
+        """The command lines that `execute` will send."""
+        return [line for line, _ in self._plan()]
+
+    def execute(self) -> list:
+        """Sends the batch and returns the result of each request.
+
+        Returns:
+            A list of results in the order requested. Queries return `int`,
+            settings return `True`, trace captures return a list of `int`.
+            Any request on a line that returned `ERROR` is `None`.
+
+        """
+        results = [None] * len(self._items)
+        self.errors = []
+        for command, indices in self._plan():
+            response = self._atcommand(command)
+            self._map_response(command, indices, response, results)
+        return results
+
+    async def execute_async(self) -> list:
+        """Sends the batch using a coroutine `atcommand` (see `execute`)."""
+        results = [None] * len(self._items)
+        self.errors = []
+        for command, indices in self._plan():
+            response = await self._atcommand(command)
+            self._map_response(command, indices, response, results)
+        return results
+
+    def _map_response(self,
+                      command: str,
+                      indices: 'list[int]',
+                      response: 'list[str]',
+                      results: list) -> None:
+        """Puts the values of a line response into the results by request."""
+        if not response or response[0] == 'ERROR':
+            _log.warning(f'Batch line failed: {command} ({response})')
+            self.errors.append(response)
+            return
+        values = [r for r in response if r != 'OK']
+        expected = sum(self._items[i].queries for i in indices)
+        if len(values) != expected:
+            _log.error(f'Expected {expected} values but got {values}')
+            self.errors.append(response)
+            return
+        for i in indices:
+            item = self._items[i]
+            if item.queries == 0:
+                results[i] = True
+                continue
+            parsed = [int(v) for v in values[:item.queries]]
+            values = values[item.queries:]
+            results[i] = parsed if item.trace is not None else parsed[0]
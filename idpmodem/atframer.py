@@ -0,0 +1,153 @@
+"""Incremental framer for the AT command byte stream of an IDP modem.
+
+Transport-agnostic: used by both the threaded and asyncio protocols to split
+received bytes into typed frames regardless of how the bytes were chunked by
+the serial driver.
+
+"""
+from enum import IntEnum
+from typing import NamedTuple
+
+from idpmodem.crcxmodem import CrcAccumulator
+
+
+class AtFrameType(IntEnum):
+    ECHO = 0
+    RESPONSE = 1
+    RESULT = 2
+    CRC = 3
+    UNSOLICITED = 4
+
+
+class AtFrame(NamedTuple):
+    """A frame extracted from the modem byte stream.
+
+    Attributes:
+        frame_type (AtFrameType): The type of frame.
+        data (bytes): The raw frame including any <cr><lf> framing.
+        crc_valid (bool): For CRC frames, indicates if the received CRC
+            matches the response bytes preceding it.
+
+    """
+    frame_type: AtFrameType
+    data: bytes
+    crc_valid: bool = None
+
+    @property
+    def content(self) -> bytes:
+        """The frame data without leading/trailing whitespace."""
+        return self.data.strip()
+
+
+class AtFramer:
+    """Splits an AT response stream into echo, response, result and CRC frames.
+
+    Accepts chunks of any length. Uses a single reusable buffer and remembers
+    how far it has already scanned so that each byte is searched only once.
+
+    Handles command echo terminated with <cr>, verbose response framed with
+    <cr><lf>, the trailing `*XXXX` CRC line, and unsolicited data terminated
+    with <lf> when no command is pending.
+
+    A running CRC is kept over the response bytes as they are framed,
+    excluding the echo as the modem does, so the trailing CRC line is
+    validated without a second pass over the response.
+
+    Attributes:
+        buffer (bytearray): Bytes received but not yet framed.
+        pending (bool): True while a command response is expected.
+        crc (CrcAccumulator): The running CRC of the current response.
+
+    """
+    RESULT_CODES = (b'OK', b'ERROR')
+    CRC_PREFIX = b'*'
+
+    def __init__(self) -> None:
+        self.buffer = bytearray()
+        self.pending = False
+        self.crc = CrcAccumulator()
+        self._scan = 0
+        self._echo: bytes = None
+
+    def expect(self, command: 'str|None') -> None:
+        """Sets the command whose echo and response are expected next.
+
+        Args:
+            command: The command as sent (including any CRC) or None if no
+                command is pending.
+
+        """
+        self.crc.reset()
+        if command is None:
+            self.pending = False
+            self._echo = None
+        else:
+            self.pending = True
+            self._echo = command.encode() + b'\r'
+
+    def clear(self) -> bytes:
+        """Discards any partially received data and returns it."""
+        discarded = bytes(self.buffer)
+        del self.buffer[:]
+        self._scan = 0
+        return discarded
+
+    def feed(self, data: 'bytes|bytearray') -> 'list[AtFrame]':
+        """Buffers received data and returns any complete frames.
+
+        Args:
+            data: Bytes received from the modem (any length).
+
+        Returns:
+            A list of `AtFrame` in the order received (may be empty).
+
+        """
+        frames = []
+        buffer = self.buffer
+        buffer.extend(data)
+        while len(buffer) > 0:
+            echo = self._echo
+            if echo is not None and buffer.startswith(echo):
+                del buffer[:len(echo)]
+                self._scan = 0
+                self._echo = None
+                frames.append(AtFrame(AtFrameType.ECHO, echo))
+                continue
+            eol = buffer.find(b'\n', self._scan)
+            if eol == -1:
+                self._scan = len(buffer)
+                break
+            eol += 1
+            if self.pending:
+                if eol == 2 and buffer[0] == 0x0D:
+                    #: Leading <cr><lf> of a framed response
+                    self._scan = eol
+                    continue
+                if eol == 1:
+                    #: (Unexpected) drop any empty lines
+                    del buffer[:eol]
+                    self._scan = 0
+                    continue
+            line = bytes(buffer[:eol])
+            del buffer[:eol]
+            self._scan = 0
+            frame_type = self._classify(line)
+            if frame_type == AtFrameType.CRC:
+                valid = self.crc.matches(line.decode('ascii', 'replace'))
+                self.crc.reset()
+                frames.append(AtFrame(frame_type, line, valid))
+                continue
+            if frame_type != AtFrameType.UNSOLICITED:
+                self.crc.update(line)
+            frames.append(AtFrame(frame_type, line))
+        return frames
+
+    def _classify(self, line: bytes) -> AtFrameType:
+        if not self.pending:
+            return AtFrameType.UNSOLICITED
+        content = line.strip()
+        if content in self.RESULT_CODES:
+            return AtFrameType.RESULT
+        if content.startswith(self.CRC_PREFIX):
+            return AtFrameType.CRC
+        return AtFrameType.RESPONSE
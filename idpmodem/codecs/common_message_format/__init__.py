@@ -1,11 +1,13 @@
 import xml.etree.ElementTree as ET
 
 from .base import BaseCodec, CodecList
+from .bits import BitReader, BitWriter
 from .constants import *
-from .fields import (ArrayField, BooleanField, DataField, EnumField,
-                     SignedIntField, StringField, UnsignedIntField)
+from .fields import (ArrayElement, ArrayField, BooleanField, DataField,
+                     EnumField, SignedIntField, StringField, UnsignedIntField)
 from .fields.base_field import FieldCodec, Fields
 from .fields.helpers import optimal_bits
+from .compiled import CompiledMessage
 from .message_definitions import MessageDefinitions
 from .messages import MessageCodec, Messages
 from .services import ServiceCodec, Services
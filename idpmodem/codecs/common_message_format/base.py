@@ -1,4 +1,32 @@
+_SLOT_NAMES: 'dict[type, tuple[str, ...]]' = {}
+
+
+def slot_names(cls: type) -> 'tuple[str, ...]':
+    """Returns the names of all `__slots__` declared by a class hierarchy."""
+    try:
+        return _SLOT_NAMES[cls]
+    except KeyError:
+        names = []
+        for c in reversed(cls.__mro__):
+            slots = c.__dict__.get('__slots__', ())
+            if isinstance(slots, str):
+                slots = (slots, )
+            names.extend(s for s in slots
+                         if s not in ('__dict__', '__weakref__'))
+        _SLOT_NAMES[cls] = tuple(names)
+        return _SLOT_NAMES[cls]
+
+
 class BaseCodec:
+    """Base class for named codecs.
+
+    Codecs declare `__slots__` to keep large definition sets and decoded
+    array elements compact. Subclasses that do not declare `__slots__`
+    (e.g. application message classes) get a `__dict__` as usual.
+
+    """
+    __slots__ = ('_name', '_description')
+
     def __init__(self, name: str, description: str = None) -> None:
         if not name or name.strip() == '':
             raise ValueError('Invalid name must be non-empty')
@@ -25,12 +53,23 @@ class BaseCodec:
         """Indicates attribute equivalence, with optional exceptions."""
         if not isinstance(other, self.__class__):
             return NotImplemented
-        for attr, val in self.__dict__.items():
+        for attr, val in self._attributes().items():
             if exclude is not None and attr in exclude:
                 continue
-            if not hasattr(other, attr) or val != other.__dict__[attr]:
+            if not hasattr(other, attr) or val != getattr(other, attr):
                 return False
         return True
+
+    def _attributes(self) -> dict:
+        """Returns the instance attributes from slots and any `__dict__`."""
+        attributes = {}
+        for attr in slot_names(self.__class__):
+            try:
+                attributes[attr] = getattr(self, attr)
+            except AttributeError:
+                pass
+        attributes.update(getattr(self, '__dict__', {}))
+        return attributes
     
     def __eq__(self, other: object) -> bool:
         return self._attribute_equivalence(other)
@@ -41,13 +80,48 @@ class CodecList(list):
     
     Used for Fields, Messages, Services.
 
+    Objects are indexed by name so that lookup, replacement, deletion and
+    duplicate checks by name do not scan the list. The index is maintained
+    by `add`, `append`, `extend`, `delete` and positional assignment or
+    removal, and rebuilt on first use after the list is copied or unpickled.
+
     Attributes:
         codec_cls: The object type the list is comprised of.
 
     """
+    _INDEXES = ('_names',)
+    _indexed = False
+
     def __init__(self, codec_cls: BaseCodec):
         super().__init__()
         self.list_type = codec_cls
+        self._names: 'dict[str, int]' = {}
+        self._indexed = True
+
+    def __getstate__(self) -> dict:
+        """Omits indexes when copied or pickled, to be rebuilt on first use."""
+        state = self.__dict__.copy()
+        for attr in self._INDEXES:
+            state[attr] = {}
+        state['_indexed'] = False
+        return state
+
+    def _reindex(self) -> None:
+        """Rebuilds the name index from the list contents."""
+        self._names = {}
+        for i, o in enumerate(self):
+            self._names.setdefault(o.name, i)
+        self._indexed = True
+
+    def _index_append(self, codec: BaseCodec, position: int) -> None:
+        """Adds an object appended at a list position to the indexes."""
+        self._names.setdefault(codec.name, position)
+
+    def _position(self, name: str) -> 'int|None':
+        """Returns the list index of a name, or None if not found."""
+        if not self._indexed:
+            self._reindex()
+        return self._names.get(name)
 
     def add(self, codec: BaseCodec) -> bool:
         """Add an object to the end of the list.
@@ -61,13 +135,33 @@ class CodecList(list):
         """
         if not isinstance(codec, self.list_type):
             raise ValueError(f'Invalid {self.list_type} definition')
-        for o in self:
-            if o.name == codec.name:
-                raise ValueError(f'Duplicate {self.list_type}'
-                                 f' name {codec.name} found')
+        if self._position(codec.name) is not None:
+            raise ValueError(f'Duplicate {self.list_type}'
+                             f' name {codec.name} found')
         self.append(codec)
         return True
 
+    def append(self, codec: BaseCodec) -> None:
+        super().append(codec)
+        if self._indexed:   # else rebuilt on first use after copy/unpickle
+            self._index_append(codec, len(self) - 1)
+
+    def extend(self, codecs: 'list[BaseCodec]') -> None:
+        start = len(self)
+        super().extend(codecs)
+        if self._indexed:
+            for position in range(start, len(self)):
+                self._index_append(super().__getitem__(position), position)
+
+    def __iadd__(self, codecs: 'list[BaseCodec]') -> 'CodecList':
+        self.extend(codecs)
+        return self
+
+    def __contains__(self, o: 'str|BaseCodec') -> bool:
+        if isinstance(o, str):
+            return self._position(o) is not None
+        return super().__contains__(o)
+
     def __getitem__(self, n: 'str|int') -> BaseCodec:
         """Retrieves an object by name or index.
         
@@ -79,20 +173,54 @@ class CodecList(list):
 
         """
         if isinstance(n, str):
-            for o in self:
-                if o.name == n:
-                    return o
-            raise ValueError(f'{self.list_type} name {n} not found')
+            position = self._position(n)
+            if position is None:
+                raise ValueError(f'{self.list_type} name {n} not found')
+            return super().__getitem__(position)
         return super().__getitem__(n)
 
     def __setitem__(self, n: 'str|int', value):
         if isinstance(n, str):
-            for o in self:
-                if o.name == n:
-                    o.value = value
-                    break
+            position = self._position(n)
+            if position is not None:
+                super().__getitem__(position).value = value
         else:
+            if isinstance(n, int) and isinstance(value, self.list_type):
+                position = self._position(value.name)
+                if position is not None and position != n % len(self):
+                    raise ValueError(f'Duplicate {self.list_type}'
+                                     f' name {value.name} found')
             super().__setitem__(n, value)
+            self._reindex()
+
+    def __delitem__(self, n: 'int|slice'):
+        super().__delitem__(n)
+        self._reindex()
+
+    def insert(self, index: int, codec: BaseCodec) -> None:
+        super().insert(index, codec)
+        self._reindex()
+
+    def remove(self, codec: BaseCodec) -> None:
+        super().remove(codec)
+        self._reindex()
+
+    def pop(self, index: int = -1) -> BaseCodec:
+        codec = super().pop(index)
+        self._reindex()
+        return codec
+
+    def clear(self) -> None:
+        super().clear()
+        self._reindex()
+
+    def sort(self, *args, **kwargs) -> None:
+        super().sort(*args, **kwargs)
+        self._reindex()
+
+    def reverse(self) -> None:
+        super().reverse()
+        self._reindex()
 
     def delete(self, name: str) -> bool:
         """Delete an object from the list by name.
@@ -103,8 +231,8 @@ class CodecList(list):
         Returns:
             boolean: success
         """
-        for o in self:
-            if o.name == name:
-                self.remove(o)
-                return True
-        return False
+        position = self._position(name)
+        if position is None:
+            return False
+        del self[position]
+        return True
@@ -0,0 +1,146 @@
+"""Bit-level reading and writing of over-the-air message payloads.
+
+Fields are packed most-significant bit first without byte alignment.
+`BitReader` tracks an integer bit offset into the payload and `BitWriter`
+accumulates bits into a `bytearray`, so neither copies the remainder of the
+payload per field.
+
+"""
+
+
+class BitReader:
+    """Reads unsigned integers of any bit width from a bytes buffer.
+
+    Attributes:
+        position (int): The bit offset of the next read.
+        remaining (int): The number of unread bits.
+
+    """
+    def __init__(self,
+                 data: 'bytes|bytearray',
+                 position: int = 0,
+                 length: int = None) -> None:
+        """Create a reader.
+
+        Args:
+            data: The payload bytes.
+            position: The bit offset to start reading from.
+            length: The number of valid bits (default all of `data`).
+
+        """
+        self._data = data
+        self._length = len(data) * 8 if length is None else length
+        self.position = position
+
+    @classmethod
+    def from_binary_str(cls, binary_str: str) -> 'BitReader':
+        """Create a reader from a string of '0'/'1' characters."""
+        length = len(binary_str)
+        if length == 0:
+            return cls(b'', length=0)
+        padded = binary_str + '0' * (-length % 8)
+        data = int(padded, 2).to_bytes(len(padded) // 8, 'big')
+        return cls(data, length=length)
+
+    @property
+    def remaining(self) -> int:
+        return self._length - self.position
+
+    def read(self, bits: int) -> int:
+        """Reads an unsigned integer of the given width and advances."""
+        if bits == 0:
+            return 0
+        start = self.position
+        end = start + bits
+        if bits < 0 or end > self._length:
+            raise ValueError(f'Cannot read {bits} bits at offset {start}'
+                             f' of {self._length}')
+        first = start >> 3
+        last = (end + 7) >> 3
+        chunk = int.from_bytes(self._data[first:last], 'big')
+        self.position = end
+        return (chunk >> ((last << 3) - end)) & ((1 << bits) - 1)
+
+    def read_bool(self) -> bool:
+        """Reads a single bit as a boolean and advances."""
+        position = self.position
+        if position >= self._length:
+            raise ValueError(f'Cannot read 1 bit at offset {position}')
+        self.position = position + 1
+        return bool(self._data[position >> 3] & (0x80 >> (position & 7)))
+
+    def read_signed(self, bits: int) -> int:
+        """Reads a two's complement integer of the given width and advances."""
+        value = self.read(bits)
+        if value & (1 << (bits - 1)):
+            value -= 1 << bits
+        return value
+
+    def read_bytes(self, length: int) -> bytes:
+        """Reads a number of whole bytes (not necessarily aligned)."""
+        if self.position & 7 == 0:
+            start = self.position >> 3
+            if self.position + length * 8 > self._length:
+                raise ValueError(f'Cannot read {length} bytes at offset'
+                                 f' {self.position} of {self._length}')
+            self.position += length * 8
+            return bytes(self._data[start:start + length])
+        return self.read(length * 8).to_bytes(length, 'big')
+
+
+class BitWriter:
+    """Packs unsigned integers of any bit width into bytes.
+
+    Attributes:
+        bit_length (int): The number of bits written.
+
+    """
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+        self._pending = 0
+        self._pending_bits = 0
+
+    @property
+    def bit_length(self) -> int:
+        return len(self._buffer) * 8 + self._pending_bits
+
+    def write(self, value: int, bits: int) -> None:
+        """Appends the low `bits` bits of a value (two's complement if < 0)."""
+        if bits == 0:
+            return
+        pending = (self._pending << bits) | (value & ((1 << bits) - 1))
+        pending_bits = self._pending_bits + bits
+        if pending_bits >= 8:
+            extra = pending_bits & 7
+            self._buffer += (pending >> extra).to_bytes(pending_bits >> 3,
+                                                        'big')
+            pending &= (1 << extra) - 1
+            pending_bits = extra
+        self._pending = pending
+        self._pending_bits = pending_bits
+
+    def write_bool(self, value: bool) -> None:
+        """Appends a single bit."""
+        self.write(1 if value else 0, 1)
+
+    def write_bytes(self, data: 'bytes|bytearray') -> None:
+        """Appends whole bytes (not necessarily aligned)."""
+        if self._pending_bits == 0:
+            self._buffer += data
+        else:
+            self.write(int.from_bytes(data, 'big'), len(data) * 8)
+
+    def to_bytes(self) -> bytes:
+        """Returns the bits written, zero padded to the next whole byte."""
+        if self._pending_bits == 0:
+            return bytes(self._buffer)
+        last = self._pending << (8 - self._pending_bits)
+        return bytes(self._buffer) + bytes([last])
+
+    def to_binary_str(self) -> str:
+        """Returns the bits written as a string of '0'/'1' characters."""
+        if self.bit_length == 0:
+            return ''
+        data = self.to_bytes()
+        return format(int.from_bytes(data, 'big'),
+                      f'0{len(data) * 8}b')[:self.bit_length]
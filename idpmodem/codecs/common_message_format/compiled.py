@@ -0,0 +1,349 @@
+"""Precomputed encode/decode plans for frequently used message definitions.
+
+`MessageCodec.compile()` flattens a message definition once so that each
+subsequent encode or decode avoids walking the field list with type checks
+and presence lookups.
+
+Leading mandatory fields of fixed bit width (boolean, enum and integer) are
+packed or unpacked together as a single integer using precomputed shifts
+and masks. Remaining fields use pre-bound `read`/`write` methods.
+
+`decode_many` applies the same shifts and masks column by column across a
+batch of payloads, producing an `array.array` per fixed-width field.
+
+"""
+from array import array
+from math import ceil
+from typing import Iterable
+
+from idpmodem.constants import DataFormat
+
+from .bits import BitReader, BitWriter
+from .fields import (ArrayField, BooleanField, EnumField, SignedIntField,
+                     UnsignedIntField)
+from .fields.base_field import FieldCodec
+
+_FIXED_WIDTH = (BooleanField, EnumField, SignedIntField, UnsignedIntField)
+
+
+def _width(field: FieldCodec) -> int:
+    return 1 if isinstance(field, BooleanField) else field.size
+
+
+def _unpacker(field: FieldCodec):
+    """Returns a function to set the field from its unsigned bits."""
+    if isinstance(field, BooleanField):
+        def unpack(value: int):
+            field._value = value == 1
+    elif isinstance(field, SignedIntField):
+        sign = 1 << (field.size - 1)
+        full = 1 << field.size
+        def unpack(value: int):
+            field._value = value - full if value & sign else value
+    elif isinstance(field, EnumField):
+        def unpack(value: int):
+            field.value = value
+    else:
+        def unpack(value: int):
+            field._value = value
+    return unpack
+
+
+def _packer(field: FieldCodec):
+    """Returns a function to get the field value as an int (or None)."""
+    if isinstance(field, BooleanField):
+        def pack() -> 'int|None':
+            value = field.value
+            return None if value is None else int(value)
+    elif isinstance(field, EnumField):
+        index = {item: i for i, item in enumerate(field.items)}
+        def pack() -> 'int|None':
+            return index.get(field.value)
+    else:
+        def pack() -> 'int|None':
+            return field.value
+    return pack
+
+
+def _converter(field: FieldCodec):
+    """Returns a function to get a value from unsigned bits, without storing."""
+    if isinstance(field, BooleanField):
+        return lambda value: value == 1
+    if isinstance(field, SignedIntField):
+        sign = 1 << (field.size - 1)
+        full = 1 << field.size
+        return lambda value: value - full if value & sign else value
+    if isinstance(field, EnumField):
+        items = field.items
+        def to_item(value: int) -> str:
+            if value >= len(items):
+                raise ValueError(f'Invalid enum index {value}')
+            return items[value]
+        return to_item
+    return lambda value: value
+
+
+def _index(field: FieldCodec):
+    """Returns a function to validate a value as an int, without storing."""
+    if isinstance(field, BooleanField):
+        valid = (False, True)
+        index = {False: 0, True: 1}
+    elif isinstance(field, EnumField):
+        valid = range(0, len(field.items))
+        index = {item: i for i, item in enumerate(field.items)}
+    elif isinstance(field, SignedIntField):
+        valid = range(-2**(field.size - 1), 2**(field.size - 1))
+        index = {}
+    else:
+        valid = range(0, 2**field.size)
+        index = {}
+    name = field.name
+    def to_int(value) -> int:
+        if value is None:
+            raise ValueError(f'No value defined in field {name}')
+        if value in index:
+            return index[value]
+        if type(value) is not int or value not in valid:
+            raise ValueError(f'Invalid {name} value {value}')
+        return value
+    return to_int
+
+
+def _typecode(field: FieldCodec) -> str:
+    """Returns the smallest `array` typecode holding the field values."""
+    signed = isinstance(field, SignedIntField)
+    for code in ('b', 'h', 'i', 'l', 'q'):
+        if not signed:
+            code = code.upper()
+        if array(code).itemsize * 8 >= _width(field):
+            return code
+    raise ValueError(f'No array type for {field.name} of {field.size} bits')
+
+
+def _presence(field: FieldCodec):
+    """Returns a function indicating if an optional field has a value."""
+    if isinstance(field, ArrayField):
+        return lambda: field.elements is not None
+    if hasattr(field, 'value'):
+        return lambda: field.value is not None
+    raise ValueError('Unknown value of optional')
+
+
+class CompiledMessage:
+    """A flattened encode/decode plan for a `MessageCodec`.
+
+    Decoding populates the field values of the message definition, the same
+    as `MessageCodec.decode`. `decode_dict` and `encode_dict` do not modify
+    the message definition, so a compiled plan may be shared across threads.
+
+    Attributes:
+        message (MessageCodec): The message definition compiled.
+        prefix_bits (int): The bits of leading fixed-width fields.
+
+    """
+    def __init__(self, message) -> None:
+        self.message = message
+        fields: 'list[FieldCodec]' = list(message.fields)
+        prefix: 'list[FieldCodec]' = []
+        for field in fields:
+            if field.optional or not isinstance(field, _FIXED_WIDTH):
+                break
+            prefix.append(field)
+        self.prefix_bits = sum(_width(field) for field in prefix)
+        self._prefix_bytes = ceil(self.prefix_bits / 8)
+        self._unpackers = []
+        self._packers = []
+        self._converters = []
+        self._indexers = []
+        self._columns = []
+        offset = 0
+        for field in prefix:
+            width = _width(field)
+            shift = self._prefix_bytes * 8 - offset - width
+            mask = (1 << width) - 1
+            self._unpackers.append((_unpacker(field), shift, mask))
+            self._packers.append((_packer(field), width, mask, field.name))
+            self._converters.append((field.name, _converter(field), shift,
+                                     mask))
+            self._indexers.append((field.name, _index(field), width, mask,
+                                   getattr(field, 'default', None)))
+            sign = (1 << (width - 1)) if isinstance(field,
+                                                    SignedIntField) else 0
+            limit = (len(field.items) if isinstance(field, EnumField)
+                     else None)
+            self._columns.append((field.name, _typecode(field), shift, mask,
+                                  sign, limit))
+            offset += width
+        self._readers = []
+        self._writers = []
+        self._value_readers = []
+        self._value_writers = []
+        self._suffix_columns = []
+        for field in fields[len(prefix):]:
+            fixed = not field.optional and isinstance(field, _FIXED_WIDTH)
+            self._suffix_columns.append((field.name,
+                                         _typecode(field) if fixed else None,
+                                         isinstance(field, EnumField)))
+            self._value_readers.append((field.name, field.optional,
+                                        field.read_value))
+            self._value_writers.append((field.name, field.optional,
+                                        field.write_value,
+                                        getattr(field, 'default', None)))
+            self._readers.append((field.optional, field.read))
+            present = _presence(field) if field.optional else None
+            self._writers.append((field.name, present, field.write))
+
+    def decode(self, databytes: bytes) -> None:
+        """Parses and stores field values from raw data including SIN/MIN.
+
+        Args:
+            databytes: A bytes array (typically from the forward message)
+
+        """
+        if self._unpackers:
+            end = 2 + self._prefix_bytes
+            if len(databytes) < end:
+                raise ValueError(f'Payload too short for {self.message.name}')
+            chunk = int.from_bytes(databytes[2:end], 'big')
+            for unpack, shift, mask in self._unpackers:
+                unpack((chunk >> shift) & mask)
+        reader = BitReader(databytes, position=16 + self.prefix_bits)
+        for optional, read in self._readers:
+            if optional and not reader.read_bool():
+                continue
+            read(reader)
+
+    def encode(self,
+               data_format: int = DataFormat.BASE64,
+               exclude: list = None) -> dict:
+        """Encodes using the specified data format (see `MessageCodec.encode`).
+        """
+        if data_format not in [DataFormat.BASE64, DataFormat.HEX]:
+            raise ValueError(f'data_format {data_format} unsupported')
+        writer = BitWriter()
+        if self._packers:
+            packed = 0
+            for pack, width, mask, name in self._packers:
+                value = pack()
+                if value is None:
+                    raise ValueError(f'No value defined in field {name}')
+                packed = (packed << width) | (value & mask)
+            writer.write(packed, self.prefix_bits)
+        for name, present, write in self._writers:
+            if present is not None:
+                included = present() and not (exclude and name in exclude)
+                writer.write_bool(included)
+                if not included:
+                    continue
+            write(writer)
+        return self.message._payload_dict(writer.to_bytes(), data_format)
+
+    def decode_dict(self, databytes: bytes) -> dict:
+        """Returns field values parsed from raw data including SIN/MIN.
+
+        See `MessageCodec.decode_dict`.
+
+        """
+        message = self.message
+        if len(databytes) < 2 or tuple(databytes[:2]) != (message.sin,
+                                                          message.min):
+            raise ValueError(f'Payload is not {message.name}'
+                             f' ({message.sin}, {message.min})')
+        values = {}
+        if self._converters:
+            end = 2 + self._prefix_bytes
+            if len(databytes) < end:
+                raise ValueError(f'Payload too short for {message.name}')
+            chunk = int.from_bytes(databytes[2:end], 'big')
+            for name, convert, shift, mask in self._converters:
+                values[name] = convert((chunk >> shift) & mask)
+        reader = BitReader(databytes, position=16 + self.prefix_bits)
+        for name, optional, read_value in self._value_readers:
+            if optional and not reader.read_bool():
+                continue
+            values[name] = read_value(reader)
+        return values
+
+    def encode_dict(self, values: dict) -> bytes:
+        """Returns raw data including SIN/MIN encoded from field values.
+
+        See `MessageCodec.encode_dict`.
+
+        """
+        writer = BitWriter()
+        writer.write(self.message.sin, 8)
+        writer.write(self.message.min, 8)
+        if self._indexers:
+            packed = 0
+            for name, index, width, mask, default in self._indexers:
+                value = values.get(name)
+                value = index(default if value is None else value)
+                packed = (packed << width) | (value & mask)
+            writer.write(packed, self.prefix_bits)
+        for name, optional, write_value, default in self._value_writers:
+            value = values.get(name)
+            if optional:
+                writer.write_bool(value is not None)
+                if value is None:
+                    continue
+            elif value is None:
+                value = default
+            write_value(writer, value)
+        databytes = writer.to_bytes()
+        self.message._check_size(len(databytes) - 2)
+        return databytes
+
+    def decode_many(self,
+                    payloads: 'Iterable[bytes]',
+                    ) -> 'dict[str, array|list]':
+        """Returns columns of field values parsed from many payloads.
+
+        See `MessageCodec.decode_many`.
+
+        """
+        message = self.message
+        payloads = list(payloads)
+        end = 2 + self._prefix_bytes
+        header = bytes([message.sin, message.min])
+        for payload in payloads:
+            if payload[:2] != header or len(payload) < end:
+                raise ValueError(f'Payload is not {message.name}'
+                                 f' ({message.sin}, {message.min})')
+        columns = {}
+        if self._columns:
+            chunks = [int.from_bytes(payload[2:end], 'big')
+                      for payload in payloads]
+            for name, typecode, shift, mask, sign, limit in self._columns:
+                if sign:
+                    columns[name] = array(typecode, [
+                        (((chunk >> shift) & mask) ^ sign) - sign
+                        for chunk in chunks])
+                else:
+                    columns[name] = array(typecode, [
+                        (chunk >> shift) & mask for chunk in chunks])
+                if limit is not None and columns[name]:
+                    index = max(columns[name])
+                    if index >= limit:
+                        raise ValueError(f'Invalid enum index {index}')
+        if not self._value_readers:
+            return columns
+        suffix = {name: [] for name, _, _ in self._suffix_columns}
+        for payload in payloads:
+            reader = BitReader(payload, position=16 + self.prefix_bits)
+            for name, optional, read_value in self._value_readers:
+                if optional and not reader.read_bool():
+                    suffix[name].append(None)
+                    continue
+                suffix[name].append(read_value(reader))
+        items = {field.name: field.items for field in message.fields
+                 if isinstance(field, EnumField)}
+        for name, typecode, is_enum in self._suffix_columns:
+            values = suffix[name]
+            if typecode is None:
+                columns[name] = values
+                continue
+            if is_enum:
+                index = {item: i for i, item in enumerate(items[name])}
+                values = [index[value] for value in values]
+            columns[name] = array(typecode, values)
+        return columns
@@ -1,4 +1,4 @@
-from .array_field import ArrayField
+from .array_field import ArrayElement, ArrayField
 from .boolean_field import BooleanField
 from .data_field import DataField
 from .enum_field import EnumField
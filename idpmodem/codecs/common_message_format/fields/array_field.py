@@ -1,8 +1,144 @@
-from copy import deepcopy
-
 from .. import ET
 from .base_field import FieldCodec, Fields
-from .helpers import decode_field_length, encode_field_length
+from ..bits import BitReader, BitWriter
+from .helpers import read_field_length, write_field_length
+
+
+class ElementField:
+    """A field of an `ArrayElement`, viewed through the array definition.
+
+    Behaves as the `FieldCodec` of the array definition holding the element
+    value. Setting `value` validates it and stores it in the element.
+
+    """
+    __slots__ = ('_element', '_index')
+
+    def __init__(self, element: 'ArrayElement', index: int) -> None:
+        self._element = element
+        self._index = index
+
+    def _cell(self) -> FieldCodec:
+        """Returns a copy of the field definition holding the value."""
+        cell = self._element.fields[self._index].clone()
+        cell._value = self._element._values[self._index]
+        return cell
+
+    @property
+    def value(self):
+        return self._cell().value
+
+    @value.setter
+    def value(self, v):
+        cell = self._cell()
+        cell.value = v
+        self._element._values[self._index] = cell._value
+
+    def __getattr__(self, name: str):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self._cell(), name)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, ElementField):
+            other = other._cell()
+        return self._cell() == other
+
+    def __repr__(self) -> str:
+        return repr(self._cell())
+
+
+class ArrayElement:
+    """An element of an `ArrayField`, holding one value per field.
+
+    The fields are defined once by the array, and each element stores only
+    its values. Fields are accessed by name or index as with `Fields`, as an
+    `ElementField` or for a nested array its `ArrayField`.
+
+    """
+    __slots__ = ('_fields', '_values')
+
+    def __init__(self, fields: Fields, values: list) -> None:
+        self._fields = fields
+        self._values = values
+
+    @property
+    def fields(self) -> Fields:
+        """The array definition of the element fields."""
+        return self._fields
+
+    def _index(self, key: 'str|int') -> int:
+        if isinstance(key, str):
+            index = self._fields._position(key)
+            if index is None:
+                raise ValueError(f'FieldCodec name {key} not found')
+            return index
+        return range(len(self._values))[key]
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __getitem__(self, key: 'str|int') -> 'ElementField|ArrayField':
+        index = self._index(key)
+        if isinstance(self._values[index], ArrayField):
+            return self._values[index]
+        return ElementField(self, index)
+
+    def __setitem__(self, key: 'str|int', value) -> None:
+        index = self._index(key)
+        if isinstance(self._values[index], ArrayField):
+            self._values[index].elements = value
+        else:
+            ElementField(self, index).value = value
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self._values)))
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ArrayElement):
+            return NotImplemented
+        return self._values == other._values and self._fields == other._fields
+
+    def __repr__(self) -> str:
+        return repr({f.name: v for f, v in zip(self._fields, self._values)})
+
+    @classmethod
+    def read(cls,
+             fields: Fields,
+             reader: BitReader,
+             cells: 'list[FieldCodec]') -> 'ArrayElement':
+        """Reads an element using working copies of the field definitions."""
+        values = []
+        for cell in cells:
+            if isinstance(cell, ArrayField):
+                cell = cell.clone()
+                if not cell.optional or reader.read_bool():
+                    cell.read(reader)
+                values.append(cell)
+            elif cell.optional and not reader.read_bool():
+                values.append(None)
+            else:
+                cell.read(reader)
+                values.append(cell._value)
+        return cls(fields, values)
+
+    def write(self, writer: BitWriter, cells: 'list[FieldCodec]') -> None:
+        """Writes the element using working copies of the field definitions.
+
+        Optional fields are flagged present as by `Fields.write`.
+
+        """
+        for cell, value in zip(cells, self._values):
+            if isinstance(value, ArrayField):
+                cell = value
+                present = cell.elements is not None
+            else:
+                cell._value = value
+                present = cell.value is not None
+            if cell.optional:
+                writer.write_bool(present)
+                if not present:
+                    continue
+            cell.write(writer)
 
 
 class ArrayField(FieldCodec):
@@ -15,9 +151,11 @@ class ArrayField(FieldCodec):
         description (str): An optional description of the array/use.
         optional (bool): Indicates if the array is optional in the Message
         fixed (bool): Indicates if the array is always the fixed `size`
-        elements (list): The enumerated list of ArrayElements
+        elements (list): The enumerated list of `ArrayElement`s
 
     """
+    __slots__ = ('_size', '_fixed', '_fields', '_elements')
+
     def __init__(self,
                  name: str,
                  size: int,
@@ -25,7 +163,7 @@ class ArrayField(FieldCodec):
                  description: str = None,
                  optional: bool = False,
                  fixed: bool = False,
-                 elements: 'list[Fields]' = []) -> None:
+                 elements: 'list[Fields|ArrayElement]' = None) -> None:
         """Initializes an ArrayField instance.
         
         Args:
@@ -45,7 +183,7 @@ class ArrayField(FieldCodec):
         self._size = size
         self._fixed = fixed
         self._fields = fields
-        self._elements = elements or []
+        self._elements = [self._element(e) for e in elements or []]
     
     @property
     def size(self) -> int:
@@ -75,18 +213,22 @@ class ArrayField(FieldCodec):
         self._fields = fields
 
     @property
-    def elements(self) -> 'list[Fields]':
-        """The list of elements (field sets) in the array."""
+    def elements(self) -> 'list[ArrayElement]':
+        """The list of elements (field values) in the array."""
         return self._elements
     
     @elements.setter
-    def elements(self, elements: 'list[Fields]'):
+    def elements(self, elements: 'list[Fields|ArrayElement]'):
         if (not isinstance(elements, list) or 
-            not all(isinstance(item, Fields) for item in elements)):
+            not all(isinstance(item, (Fields, ArrayElement))
+                    for item in elements)):
             raise ValueError('Elements must be a list of grouped Fields')
-        for fields in elements:
-            # assert isinstance(fields, Fields)
-            for index, field in enumerate(fields):
+        for element in elements:
+            if isinstance(element, ArrayElement):
+                if element.fields is not self.fields:
+                    self._valid_element(element.fields)
+                continue
+            for index, field in enumerate(element):
                 assert isinstance(field, FieldCodec)
                 if (field.name != self.fields[index].name):
                     raise ValueError(f'fields[{index}].name'
@@ -101,10 +243,25 @@ class ArrayField(FieldCodec):
                     not isinstance(field, ArrayField) and
                     field.value is None):
                     raise ValueError(f'fields[{index}].value missing')
-                try:
-                    self._elements[index] = fields
-                except IndexError:
-                    self._elements.append(fields)
+        self._elements = [self._element(e) for e in elements]
+
+    def _element(self, element: 'Fields|ArrayElement') -> ArrayElement:
+        """Returns the element values of a set of fields, sharing `fields`."""
+        if isinstance(element, ArrayElement):
+            return ArrayElement(self.fields, list(element._values))
+        return ArrayElement(self.fields,
+                            [f if isinstance(f, ArrayField) else f._value
+                             for f in element])
+
+    def _cells(self) -> 'list[FieldCodec]':
+        """Returns working copies of the fields to read or write elements."""
+        return [field.clone() for field in self.fields]
+
+    def clone(self) -> 'ArrayField':
+        """Returns a copy sharing the element definition, without elements."""
+        field = super().clone()
+        field._elements = []
+        return field
 
     @property
     def bits(self) -> int:
@@ -141,69 +298,78 @@ class ArrayField(FieldCodec):
                                  f' does not match {field.size}')
         return True
 
-    def append(self, element: Fields):
+    def append(self, element: 'Fields|ArrayElement'):
         """Adds the array element to the list of elements."""
+        if isinstance(element, ArrayElement):
+            if element.fields is not self.fields:
+                self._valid_element(element.fields)
+            self._elements.append(self._element(element))
+            return
         if not isinstance(element, Fields):
             raise ValueError('Invalid element definition must be Fields')
         if not self._valid_element(element):
             raise ValueError('Invalid element definition'
                              f' - requires {self.fields}')
+        values = []
         for i, field in enumerate(element):
             assert isinstance(field, FieldCodec)
-            if (hasattr(field, 'description') and
-                field.description != self.fields[i].description):
-                element[i].description = self.fields[i].description
-            if hasattr(field, 'value') and field.value is None:
-                element[i].value = self.fields[i].default
-        self._elements.append(element)
+            if isinstance(field, ArrayField):
+                values.append(field)
+                continue
+            if field.value is None:
+                field = self.fields[i].clone()
+                field.value = self.fields[i].default
+            values.append(field._value)
+        self._elements.append(ArrayElement(self.fields, values))
 
-    def new_element(self) -> Fields:
+    def new_element(self) -> ArrayElement:
         """Returns an empty element at the end of the elements list."""
-        new_index = len(self._elements)
-        new_fields = deepcopy(self.fields)
-        self.append(Fields(new_fields))
-        return self.elements[new_index]
+        values = []
+        for cell in self._cells():
+            if isinstance(cell, ArrayField):
+                values.append(cell)
+                continue
+            if cell.value is None:
+                cell.value = cell.default
+            values.append(cell._value)
+        element = ArrayElement(self.fields, values)
+        self._elements.append(element)
+        return element
 
-    def encode(self) -> str:
-        """Returns the binary string of the field value."""
+    def write(self, writer: BitWriter) -> None:
+        """Writes the elements, count-prefixed unless fixed."""
         if len(self.elements) == 0:
             raise ValueError('No elements to encode')
-        binstr = ''
+        if not self.fixed:
+            write_field_length(writer, len(self.elements))
+        cells = self._cells()
         for element in self.elements:
-            for field in element:
-                binstr += field.encode()
+            element.write(writer, cells)
+
+    def write_value(self, writer: BitWriter, value: 'list[dict]') -> None:
+        """Writes a list of elements, each a dictionary of field values."""
+        if not value:
+            raise ValueError('No elements to encode')
+        if len(value) > self.size:
+            raise ValueError(f'{len(value)} elements exceeds size {self.size}')
+        if self.fixed and len(value) != self.size:
+            raise ValueError(f'Fixed array requires {self.size} elements')
         if not self.fixed:
-            binstr = encode_field_length(len(self.elements)) + binstr
-        return binstr
+            write_field_length(writer, len(value))
+        for element in value:
+            self.fields.write_values(writer, element)
 
-    def decode(self, binary_str: str) -> int:
-        """Populates the field value from binary and returns the next offset.
-        
-        Args:
-            binary_str (str): The binary string to decode
-        
-        Returns:
-            The bit offset after parsing
-        """
-        if self.fixed:
-            length = self.size
-            bit_index = 0
-        else:
-            (length, bit_index) = decode_field_length(binary_str)
-        for index in range(0, length):
-            fields = Fields(self.fields)
-            for field in fields:
-                if field.optional:
-                    if binary_str[bit_index] == '0':
-                        bit_index += 1
-                        continue
-                    bit_index += 1
-                bit_index += field.decode(binary_str[bit_index:])
-            try:
-                self._elements[index] = fields
-            except IndexError:
-                self._elements.append(fields)
-        return bit_index
+    def read_value(self, reader: BitReader) -> 'list[dict]':
+        """Returns a list of elements, each a dictionary of field values."""
+        length = self.size if self.fixed else read_field_length(reader)
+        return [self.fields.read_values(reader) for _ in range(length)]
+
+    def read(self, reader: BitReader) -> None:
+        """Populates the elements."""
+        length = self.size if self.fixed else read_field_length(reader)
+        cells = self._cells()
+        self._elements = [ArrayElement.read(self.fields, reader, cells)
+                          for _ in range(length)]
 
     def xml(self) -> ET.Element:
         """Returns the Array XML definition for a Message Definition File."""
@@ -1,4 +1,6 @@
 from .. import DATA_TYPES, ET, BaseCodec, CodecList
+from ..base import slot_names
+from ..bits import BitReader, BitWriter
 
 
 class FieldCodec(BaseCodec):
@@ -11,6 +13,8 @@ class FieldCodec(BaseCodec):
         optional (bool): Optional indication the field is optional.
 
     """
+    __slots__ = ('_data_type', '_optional')
+
     def __init__(self,
                  name: str,
                  data_type: str,
@@ -45,6 +49,18 @@ class FieldCodec(BaseCodec):
             value = False
         self._optional = value
 
+    def clone(self) -> 'FieldCodec':
+        """Returns a copy sharing the (immutable) definition and value."""
+        field = self.__class__.__new__(self.__class__)
+        for attr in slot_names(self.__class__):
+            try:
+                setattr(field, attr, getattr(self, attr))
+            except AttributeError:
+                pass
+        if hasattr(self, '__dict__'):
+            field.__dict__.update(self.__dict__)
+        return field
+
     @property
     def bits(self) -> int:
         """Must be subclassed."""
@@ -76,13 +92,40 @@ class FieldCodec(BaseCodec):
             optional.text = 'true'
         return xmlfield
     
-    def decode(self, *args, **kwargs):
-        """Must be subclassed."""
-        raise NotImplementedError('Subclass must define decode')
+    def read_value(self, reader: BitReader) -> object:
+        """Must be subclassed to return a value without storing it."""
+        raise NotImplementedError('Subclass must define read_value')
+
+    def write_value(self, writer: BitWriter, value: object) -> None:
+        """Must be subclassed to write a value that is not stored."""
+        raise NotImplementedError('Subclass must define write_value')
+
+    def read(self, reader: BitReader) -> None:
+        """Populates the field value."""
+        self._value = self.read_value(reader)
+
+    def write(self, writer: BitWriter) -> None:
+        """Writes the field value."""
+        self.write_value(writer, self.value)
+
+    def decode(self, binary_str: str) -> int:
+        """Populates the field value from binary and returns the next offset.
+        
+        Args:
+            binary_str (str): The binary string to decode
+        
+        Returns:
+            The bit offset after parsing
+        """
+        reader = BitReader.from_binary_str(binary_str)
+        self.read(reader)
+        return reader.position
     
-    def encode(self, *args, **kwargs):
-        """Must be subclassed."""
-        raise NotImplementedError('Subclass must define encode')
+    def encode(self) -> str:
+        """Returns the binary string of the field value."""
+        writer = BitWriter()
+        self.write(writer)
+        return writer.to_binary_str()
     
     def xml(self, *args, **kwargs):
         """Must be subclassed."""
@@ -97,6 +140,72 @@ class Fields(CodecList):
             for field in fields:
                 self.add(field)
     
+    def clone(self) -> 'Fields':
+        """Returns a list of field copies sharing each definition.
+
+        Used to instantiate array elements without deep copying.
+
+        """
+        fields = Fields()
+        fields.extend([field.clone() for field in self])
+        return fields
+
+    def read(self, reader: BitReader) -> None:
+        """Populates each field, skipping optional fields not present."""
+        for field in self:
+            if field.optional and not reader.read_bool():
+                continue
+            field.read(reader)
+
+    def write(self, writer: BitWriter, exclude: 'list[str]' = None) -> None:
+        """Writes each field, flagging the presence of optional fields.
+
+        Args:
+            writer: The destination.
+            exclude: Names of optional fields to mark not present.
+
+        """
+        for field in self:
+            if field.optional:
+                if exclude is not None and field.name in exclude:
+                    present = False
+                elif hasattr(field, 'value'):
+                    present = field.value is not None
+                elif hasattr(field, 'elements'):
+                    present = field.elements is not None
+                else:
+                    raise ValueError('Unknown value of optional')
+                writer.write_bool(present)
+                if not present:
+                    continue
+            field.write(writer)
+
+    def read_values(self, reader: BitReader) -> dict:
+        """Returns the values of fields present, without storing them."""
+        values = {}
+        for field in self:
+            if field.optional and not reader.read_bool():
+                continue
+            values[field.name] = field.read_value(reader)
+        return values
+
+    def write_values(self, writer: BitWriter, values: dict) -> None:
+        """Writes values by field name without storing them.
+
+        Optional fields missing from `values` (or None) are marked not present.
+        Mandatory fields missing from `values` use the field default if any.
+
+        """
+        for field in self:
+            value = values.get(field.name)
+            if field.optional:
+                writer.write_bool(value is not None)
+                if value is None:
+                    continue
+            elif value is None:
+                value = getattr(field, 'default', None)
+            field.write_value(writer, value)
+
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Fields):
             return NotImplemented
@@ -1,9 +1,12 @@
 from .. import ET
+from ..bits import BitReader, BitWriter
 from .base_field import FieldCodec
 
 
 class BooleanField(FieldCodec):
     """A Boolean field."""
+    __slots__ = ('_default', '_value')
+
     def __init__(self,
                  name: str,
                  description: str = None,
@@ -52,23 +55,17 @@ class BooleanField(FieldCodec):
         bits = 0 if self._value is None else 1
         return bits + (1 if self.optional else 0)
     
-    def encode(self) -> str:
-        """Returns the binary string of the field value."""
-        if self.value is None and not self.optional:
+    def write_value(self, writer: BitWriter, value: bool) -> None:
+        """Writes a boolean value."""
+        if value is None:
             raise ValueError('No value assigned to field')
-        return '1' if self.value else '0'
+        if not isinstance(value, bool):
+            raise ValueError(f'Invalid boolean value {value}')
+        writer.write_bool(value)
 
-    def decode(self, binary_str: str) -> int:
-        """Populates the field value from binary and returns the next offset.
-        
-        Args:
-            binary_str (str): The binary string to decode
-        
-        Returns:
-            The bit offset after parsing
-        """
-        self.value = True if binary_str[0] == '1' else False
-        return 1
+    def read_value(self, reader: BitReader) -> bool:
+        """Returns the boolean value."""
+        return reader.read_bool()
 
     def xml(self) -> ET.Element:
         """Returns the Boolean XML definition for a Message Definition File."""
@@ -3,7 +3,8 @@ from warnings import warn
 
 from .. import ET
 from .base_field import FieldCodec
-from .helpers import decode_field_length, encode_field_length
+from ..bits import BitReader, BitWriter
+from .helpers import read_field_length, write_field_length
 
 
 class DataField(FieldCodec):
@@ -13,6 +14,8 @@ class DataField(FieldCodec):
 
     """
     SUPPORTED_DATA_TYPES = ['data', 'float', 'double']
+    __slots__ = ('_size', '_fixed', '_precision', '_default', '_value')
+
     def __init__(self,
                  name: str,
                  size: int,
@@ -166,36 +169,39 @@ class DataField(FieldCodec):
             bits = L + len(self._value) * 8
         return bits + (1 if self.optional else 0)
     
-    def encode(self) -> str:
-        """Returns the binary string of the field value."""
-        if self.value is None and not self.optional:
-            raise ValueError(f'No value defined for DataField {self.name}')
-        binstr = ''
-        binstr = ''.join(format(b, '08b') for b in self._value)
+    def _write_raw(self, writer: BitWriter, raw: bytes) -> None:
         if self.fixed:   #:pad to fixed length
-            binstr += ''.join('0' for bit in range(len(binstr), self.bits))
+            writer.write_bytes(raw.ljust(self.size, b'\0'))
         else:
-            binstr = encode_field_length(len(self._value)) + binstr
-        return binstr
+            write_field_length(writer, len(raw))
+            writer.write_bytes(raw)
 
-    def decode(self, binary_str: str) -> int:
-        """Populates the field value from binary and returns the next offset.
-        
-        Args:
-            binary_str (str): The binary string to decode
-        
-        Returns:
-            The bit offset after parsing
-        """
-        if self.fixed:
-            binary = binary_str[:self.bits]
-            bits = self.bits
-        else:
-            (length, bit_index) = decode_field_length(binary_str)
-            binary = binary_str[bit_index:length * 8 + bit_index]
-            bits = len(binary)
-        self._value = int(binary, 2).to_bytes(int(bits / 8), 'big')
-        return self.bits
+    def _read_raw(self, reader: BitReader) -> bytes:
+        length = self.size if self.fixed else read_field_length(reader)
+        return reader.read_bytes(length)
+
+    def write_value(self, writer: BitWriter, value: 'bytes|float') -> None:
+        """Writes bytes, or a float for `float`/`double` data types."""
+        if value is None:
+            raise ValueError(f'No value defined for DataField {self.name}')
+        self._write_raw(writer, self._validate_data(value))
+
+    def read_value(self, reader: BitReader) -> 'bytes|float':
+        """Returns bytes, or a float for `float`/`double` data types."""
+        raw = self._read_raw(reader)
+        if self.data_type in ('float', 'double'):
+            return self._convert_to_float(raw)
+        return raw
+
+    def write(self, writer: BitWriter) -> None:
+        """Writes the raw field value."""
+        if self.value is None:
+            raise ValueError(f'No value defined for DataField {self.name}')
+        self._write_raw(writer, self._value)
+
+    def read(self, reader: BitReader) -> None:
+        """Populates the raw field value."""
+        self._value = self._read_raw(reader)
 
     def xml(self) -> ET.Element:
         """Returns the Data XML definition for a Message Definition File."""
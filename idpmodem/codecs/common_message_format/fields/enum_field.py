@@ -1,10 +1,13 @@
 from .. import ET
+from ..bits import BitReader, BitWriter
 from .base_field import FieldCodec
 from .helpers import optimal_bits
 
 
 class EnumField(FieldCodec):
     """An enumerated field sends an index over-the-air representing a string."""
+    __slots__ = ('_items', '_size', '_default', '_value')
+
     def __init__(self,
                  name: str,
                  items: 'list[str]',
@@ -123,25 +126,22 @@ class EnumField(FieldCodec):
         bits = self.size if self._value is not None else 0
         return bits + (1 if self.optional else 0)
     
-    def encode(self) -> str:
-        """Returns the binary string of the field value."""
-        if self.value is None:
+    def write_value(self, writer: BitWriter, value: 'str|int') -> None:
+        """Writes the index of an item (or index)."""
+        if value is None:
             raise ValueError(f'No value configured in EnumField {self.name}')
-        _format = f'0{self.size}b'
-        binstr = format(self.items.index(self.value), _format)
-        return binstr
+        writer.write(self._validate_enum(value), self.size)
 
-    def decode(self, binary_str: str) -> int:
-        """Populates the field value from binary and returns the next offset.
-        
-        Args:
-            binary_str (str): The binary string to decode
-        
-        Returns:
-            The bit offset after parsing
-        """
-        self.value = int(binary_str[:self.size], 2)
-        return self.size
+    def read_value(self, reader: BitReader) -> str:
+        """Returns the item at the index read."""
+        index = reader.read(self.size)
+        if index >= len(self.items):
+            raise ValueError(f'Invalid enum index {index}')
+        return self.items[index]
+
+    def read(self, reader: BitReader) -> None:
+        """Populates the field value from its index."""
+        self.value = self.read_value(reader)
 
     def xml(self) -> ET.Element:
         """Returns the Enum XML definition for a Message Definition File."""
@@ -1,5 +1,7 @@
 import math
 
+from ..bits import BitReader, BitWriter
+
 
 def optimal_bits(value_range: 'tuple[int, int]') -> int:
     """Returns the optimal number of bits for encoding a specified range.
@@ -25,16 +27,14 @@ def optimal_bits(value_range: 'tuple[int, int]') -> int:
     return max(1, math.ceil(math.log2(total_range)))
 
 
-def encode_field_length(length) -> str:
+def write_field_length(writer: BitWriter, length: int) -> None:
     if length < 128:
-        return f'0{length:07b}'
-    return f'1{length:015b}'
+        writer.write(length, 8)
+    else:
+        writer.write(0x8000 | length, 16)
 
 
-def decode_field_length(binstr: str) -> 'tuple[int, int]':
-    if binstr[0] == '0':
-        bit_index = 8
-    else:
-        bit_index = 16
-    length = int(binstr[1:bit_index], 2)
-    return (length, bit_index)
+def read_field_length(reader: BitReader) -> int:
+    if reader.read_bool():
+        return reader.read(15)
+    return reader.read(7)
@@ -1,11 +1,14 @@
 from warnings import warn
 
 from .. import ET
+from ..bits import BitReader, BitWriter
 from .base_field import FieldCodec
 
 
 class UnsignedIntField(FieldCodec):
     """An unsigned integer value using a defined number of bits over-the-air."""
+    __slots__ = ('_size', '_default', '_value')
+
     def __init__(self,
                  name: str,
                  size: int,
@@ -88,24 +91,17 @@ class UnsignedIntField(FieldCodec):
         bits = self.size if self._value is not None else 0
         return bits + (1 if self.optional else 0)
     
-    def encode(self) -> str:
-        """Returns the binary string of the field value."""
-        if self.value is None:
+    def write_value(self, writer: BitWriter, value: int) -> None:
+        """Writes an unsigned integer value."""
+        if value is None:
             raise ValueError(f'No value defined in UnsignedIntField {self.name}')
-        _format = f'0{self.size}b'
-        return format(self.value, _format)
+        if not isinstance(value, int) or value not in range(0, 2**self.size):
+            raise ValueError(f'Invalid {self.name} value {value}')
+        writer.write(value, self.size)
 
-    def decode(self, binary_str: str) -> int:
-        """Populates the field value from binary and returns the next offset.
-        
-        Args:
-            binary_str (str): The binary string to decode
-        
-        Returns:
-            The bit offset after parsing
-        """
-        self.value = int(binary_str[:self.size], 2)
-        return self.size
+    def read_value(self, reader: BitReader) -> int:
+        """Returns the unsigned integer value."""
+        return reader.read(self.size)
 
     def xml(self) -> ET.Element:
         """Returns the UnsignedInt XML definition for a Message Definition File.
@@ -121,6 +117,8 @@ class UnsignedIntField(FieldCodec):
 
 class SignedIntField(FieldCodec):
     """A signed integer value using a defined number of bits over-the-air."""
+    __slots__ = ('_size', '_default', '_value')
+
     def __init__(self,
                  name: str,
                  size: int,
@@ -206,37 +204,18 @@ class SignedIntField(FieldCodec):
         bits = self.size if self._value is not None else 0
         return bits + (1 if self.optional else 0)
     
-    def encode(self) -> str:
-        """Returns the binary string of the field value."""
-        if self.value is None:
-            raise ValueError(f'No value defined in UnsignedIntField {self.name}')
-        _format = f'0{self.size}b'
-        if self.value < 0:
-            invertedbin = format(self.value * -1, _format)
-            twocomplementbin = ''
-            i = 0
-            while len(twocomplementbin) < len(invertedbin):
-                twocomplementbin += '1' if invertedbin[i] == '0' else '0'
-                i += 1
-            binstr = format(int(twocomplementbin, 2) + 1, _format)
-        else:
-            binstr = format(self.value, _format)
-        return binstr
-
-    def decode(self, binary_str: str) -> int:
-        """Populates the field value from binary and returns the next offset.
-        
-        Args:
-            binary_str (str): The binary string to decode
-        
-        Returns:
-            The bit offset after parsing
-        """
-        value = int(binary_str[:self.size], 2)
-        if (value & (1 << (self.size - 1))) != 0:   #:sign bit set e.g. 8bit: 128-255
-            value = value - (1 << self.size)        #:compute negative value
-        self.value = value
-        return self.size
+    def write_value(self, writer: BitWriter, value: int) -> None:
+        """Writes a signed integer value in two's complement."""
+        if value is None:
+            raise ValueError(f'No value defined in SignedIntField {self.name}')
+        limit = 2**(self.size - 1)
+        if not isinstance(value, int) or value not in range(-limit, limit):
+            raise ValueError(f'Invalid {self.name} value {value}')
+        writer.write(value, self.size)
+
+    def read_value(self, reader: BitReader) -> int:
+        """Returns the signed integer value from two's complement."""
+        return reader.read_signed(self.size)
 
     def xml(self) -> ET.Element:
         """Returns the SignedInt XML definition for a Message Definition File.
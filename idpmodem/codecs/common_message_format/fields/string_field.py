@@ -2,11 +2,14 @@ from warnings import warn
 
 from .. import ET
 from .base_field import FieldCodec
-from .helpers import decode_field_length, encode_field_length
+from ..bits import BitReader, BitWriter
+from .helpers import read_field_length, write_field_length
 
 
 class StringField(FieldCodec):
     """A character string sent over-the-air."""
+    __slots__ = ('_size', '_fixed', '_default', '_value')
+
     def __init__(self,
                  name: str,
                  size: int,
@@ -94,40 +97,29 @@ class StringField(FieldCodec):
             bits = L + len(self._value) * 8
         return bits + (1 if self.optional else 0)
     
-    def encode(self) -> str:
-        """Returns the binary string of the field value."""
-        if self.value is None and not self.optional:
+    def write_value(self, writer: BitWriter, value: str) -> None:
+        """Writes a string, length-prefixed unless fixed."""
+        if value is None:
             raise ValueError(f'No value defined for StringField {self.name}')
-        binstr = ''.join(format(ord(c), '08b') for c in self.value)
+        char_bytes = self._validate_string(value).encode('latin-1')
         if self.fixed:
-            binstr += ''.join('0' for bit in range(len(binstr), self.bits))
+            writer.write_bytes(char_bytes.ljust(self.size, b'\0'))
         else:
-            binstr = encode_field_length(len(self.value)) + binstr
-        return binstr
+            write_field_length(writer, len(char_bytes))
+            writer.write_bytes(char_bytes)
 
-    def decode(self, binary_str: str) -> int:
-        """Populates the field value from binary and returns the next offset.
-        
-        Args:
-            binary_str (str): The binary string to decode
-        
-        Returns:
-            The bit offset after parsing
-        """
-        if self.fixed:
-            length = self.size
-            bit_index = 0
-        else:
-            (length, bit_index) = decode_field_length(binary_str)
-        n = int(binary_str[bit_index:bit_index + length * 8], 2)
-        char_bytes = n.to_bytes((n.bit_length() + 7) // 8, 'big')
-        for i, byte in enumerate(char_bytes):
-            if byte == 0:
-                warn('Truncating after 0 byte in string')
-                char_bytes = char_bytes[:i]
-                break
-        self.value = char_bytes.decode('utf-8', 'surrogatepass') or '\0'
-        return bit_index + length * 8
+    def read_value(self, reader: BitReader) -> str:
+        """Returns the string value."""
+        length = self.size if self.fixed else read_field_length(reader)
+        char_bytes = reader.read_bytes(length).lstrip(b'\0')
+        if b'\0' in char_bytes:
+            warn('Truncating after 0 byte in string')
+            char_bytes = char_bytes[:char_bytes.index(b'\0')]
+        return char_bytes.decode('utf-8', 'surrogatepass') or '\0'
+
+    def read(self, reader: BitReader) -> None:
+        """Populates the field value."""
+        self.value = self.read_value(reader)
 
     def xml(self) -> ET.Element:
         """Returns the String XML definition for a Message Definition File."""
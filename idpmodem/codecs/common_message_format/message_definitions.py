@@ -1,8 +1,24 @@
-from copy import deepcopy
+import hashlib
+import mmap
+import os
+import pickle
+from binascii import Error as BinasciiError
+from binascii import a2b_base64
+from warnings import warn
 
 from . import ET, XML_NAMESPACE
+from .fields import (ArrayField, BooleanField, DataField, EnumField,
+                     SignedIntField, StringField, UnsignedIntField)
+from .fields.base_field import FieldCodec, Fields
+from .messages import MessageCodec, Messages
 from .services import ServiceCodec, Services
 
+_XSI_TYPE = f'{{{XML_NAMESPACE["xsi"]}}}type'
+_CACHE_MAGIC = b'IDPMDFC'
+_CACHE_VERSION = 1   #: Increment when codec classes change incompatibly
+_TEXT_TAGS = ('Name', 'Description', 'SIN', 'MIN', 'Size', 'Optional',
+              'Fixed', 'Default')
+
 
 class MessageDefinitions:
     """A set of Message Definitions grouped into Services.
@@ -17,14 +33,229 @@ class MessageDefinitions:
                 raise ValueError('Invalid Services')
         self.services = services or Services()
     
-    def xml(self) -> ET.Element:
-        """Gets the XML structure of the complete message definitions."""
+    def _find_service(self, sin: int) -> ServiceCodec:
+        service = self.services.by_sin(sin)
+        if service is None:
+            raise ValueError(f'Service SIN {sin} not defined')
+        return service
+
+    def message(self,
+                sin: int,
+                min: int,
+                is_forward: bool,
+                ) -> 'MessageCodec|None':
+        """Returns the message definition for a SIN/MIN, or None.
+
+        Uses the SIN index of `services` and MIN index of each service's
+        messages, maintained by `add` and `delete`, rather than scanning.
+
+        Args:
+            sin: The Service Identification Number.
+            min: The Message Identification Number.
+            is_forward: Indicates a mobile-terminated message.
+
+        """
+        service = self.services.by_sin(sin)
+        if service is None:
+            return None
+        return service.message(min, is_forward)
+
+    def decode(self, databytes: bytes, is_forward: bool) -> MessageCodec:
+        """Parses field values into the message definition for a payload.
+
+        Args:
+            databytes: A bytes array starting with SIN and MIN.
+            is_forward: Indicates a mobile-terminated message.
+
+        Returns:
+            The `MessageCodec` populated with the decoded field values.
+
+        Raises:
+            ValueError if the SIN/MIN is not defined.
+
+        """
+        if len(databytes) < 2:
+            raise ValueError('Payload too short for SIN/MIN')
+        message = self.message(databytes[0], databytes[1], is_forward)
+        if message is None:
+            raise ValueError(f'Message ({databytes[0]}, {databytes[1]})'
+                             ' not defined')
+        message.decode(databytes)
+        return message
+
+    def decode_dict(self, databytes: bytes, is_forward: bool) -> dict:
+        """Returns a message dictionary parsed from raw data including SIN/MIN.
+
+        The definitions are not modified, so may be shared across threads.
+
+        Args:
+            databytes: A bytes array starting with SIN and MIN.
+            is_forward: Indicates a mobile-terminated message.
+
+        Returns:
+            Dictionary with `name`, `sin`, `min` and `fields` (field values).
+
+        """
+        if len(databytes) < 2:
+            raise ValueError('Payload too short for SIN/MIN')
+        service = self._find_service(databytes[0])
+        return service.decode_dict(databytes, is_forward)
+
+    def encode_dict(self, message: dict, is_forward: bool) -> bytes:
+        """Returns raw data including SIN/MIN encoded from a message dictionary.
+
+        The definitions are not modified, so may be shared across threads.
+
+        Args:
+            message: A dictionary with `sin`, `min` or `name`, and `fields`
+                values, as returned by `decode_dict`.
+            is_forward: Indicates a mobile-terminated message.
+
+        """
+        if 'sin' not in message:
+            raise ValueError('Message requires sin')
+        service = self._find_service(message['sin'])
+        return service.encode_dict(message, is_forward)
+
+    @classmethod
+    def mdf_import(cls, filename: str) -> 'MessageDefinitions':
+        """Creates message definitions from a Message Definition File.
+
+        The XML is parsed incrementally and each Field, Message and Service
+        element is discarded once its codec is built, so memory use is
+        bounded by the definitions rather than the XML document.
+
+        Args:
+            filename: The full path/filename of the `.idpmsg` file.
+
+        Returns:
+            A `MessageDefinitions` instance.
+
+        Raises:
+            ValueError if the file contains an invalid definition.
+
+        """
+        services = Services()
+        contexts: 'list[dict]' = []
+        field_lists: 'list[Fields]' = []
+        services_element = None
+        is_forward = False
+        for event, elem in ET.iterparse(filename, events=('start', 'end')):
+            tag = elem.tag.rpartition('}')[2]
+            if event == 'start':
+                if tag in ('Service', 'Message', 'Field'):
+                    contexts.append({'xsi_type': elem.get(_XSI_TYPE)})
+                elif tag == 'Fields':
+                    field_lists.append(Fields())
+                elif tag == 'ForwardMessages':
+                    is_forward = True
+                elif tag == 'ReturnMessages':
+                    is_forward = False
+                elif tag == 'Services':
+                    services_element = elem
+                continue
+            if tag in _TEXT_TAGS and contexts:
+                contexts[-1][tag] = (elem.text or '').strip()
+            elif tag == 'string' and contexts:
+                contexts[-1].setdefault('items', []).append(elem.text or '')
+            elif tag == 'Fields':
+                contexts[-1]['fields'] = field_lists.pop()
+            elif tag == 'Field':
+                field_lists[-1].add(_field_from_mdf(contexts.pop()))
+                elem.clear()
+            elif tag == 'Message':
+                context = contexts.pop()
+                service_context = contexts[-1]
+                sin = int(service_context['SIN'])
+                key = 'forward' if is_forward else 'return'
+                if key not in service_context:
+                    service_context[key] = Messages(sin, is_forward)
+                service_context[key].add(MessageCodec(
+                    name=context['Name'],
+                    sin=sin,
+                    min=int(context['MIN']),
+                    description=context.get('Description'),
+                    is_forward=is_forward,
+                    fields=context.get('fields')))
+                elem.clear()
+            elif tag == 'Service':
+                context = contexts.pop()
+                service = ServiceCodec(
+                    name=context['Name'],
+                    sin=int(context['SIN']),
+                    messages_forward=context.get('forward'),
+                    messages_return=context.get('return'))
+                service.description = context.get('Description')
+                services.add(service)
+                if services_element is not None:
+                    services_element.clear()
+        return cls(services)
+
+    @classmethod
+    def mdf_import_cached(cls,
+                          filename: str,
+                          cache_filename: str = None,
+                          ) -> 'MessageDefinitions':
+        """Creates message definitions from an MDF using a binary cache.
+
+        The cache is a versioned pickle keyed by the SHA-256 of the MDF. If
+        the cache is missing, stale or unreadable the MDF is imported using
+        `mdf_import` and the cache is (re)written. The cache is memory-mapped
+        when loading, and the name, SIN and MIN indexes are rebuilt lazily on
+        first lookup.
+
+        Args:
+            filename: The full path/filename of the `.idpmsg` file.
+            cache_filename: The cache path (default `filename` + `.cache`).
+
+        Returns:
+            A `MessageDefinitions` instance.
+
+        """
+        cache_filename = cache_filename or f'{filename}.cache'
+        sha256 = hashlib.sha256()
+        with open(filename, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                sha256.update(chunk)
+        header = (_CACHE_MAGIC + _CACHE_VERSION.to_bytes(2, 'big') +
+                  sha256.digest())
+        try:
+            with open(cache_filename, 'rb') as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    if mm[:len(header)] == header:
+                        with memoryview(mm) as view:
+                            definitions = pickle.loads(view[len(header):])
+                        if isinstance(definitions, cls):
+                            return definitions
+        except (OSError, ValueError, pickle.UnpicklingError, EOFError,
+                AttributeError, ImportError, TypeError):
+            pass
+        definitions = cls.mdf_import(filename)
+        tmp_filename = f'{cache_filename}.{os.getpid()}.tmp'
+        try:
+            with open(tmp_filename, 'wb') as f:
+                f.write(header)
+                pickle.dump(definitions, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_filename, cache_filename)
+        except OSError as err:
+            warn(f'Unable to write cache {cache_filename}: {err}')
+            if os.path.exists(tmp_filename):
+                os.remove(tmp_filename)
+        return definitions
+
+    def xml(self, include_service_description: bool = True) -> ET.Element:
+        """Gets the XML structure of the complete message definitions.
+
+        Args:
+            include_service_description: If False omits Service Description.
+
+        """
         xmsgdef = ET.Element('MessageDefinition',
                              attrib={'xmlns:xsd': XML_NAMESPACE['xsd']})
         services = ET.SubElement(xmsgdef, 'Services')
         for service in self.services:
             assert isinstance(service, ServiceCodec)
-            services.append(service.xml())
+            services.append(service.xml(include_service_description))
         return xmsgdef
     
     def mdf_export(self,
@@ -44,15 +275,7 @@ class MessageDefinitions:
                 Service for Inmarsat IDP Admin API V1 compatibility.
 
         """
-        if not include_service_description:
-            new_copy = deepcopy(self)
-            for service in new_copy.services:
-                assert isinstance(service, ServiceCodec)
-                if service.description is not None:
-                    service.description = None
-            tree = ET.ElementTree(new_copy.xml())
-        else:
-            tree = ET.ElementTree(self.xml())
+        tree = ET.ElementTree(self.xml(include_service_description))
         if pretty:
             indent = 2
         if indent:
@@ -66,6 +289,47 @@ class MessageDefinitions:
                 tree.write(f, encoding='utf-8', xml_declaration=True)
 
 
+def _field_from_mdf(context: dict) -> FieldCodec:
+    """Returns a field codec from the parsed child values of a Field."""
+    xsi_type = context['xsi_type']
+    kwargs = {
+        'name': context['Name'],
+        'description': context.get('Description'),
+        'optional': context.get('Optional') == 'true',
+    }
+    if xsi_type == 'BooleanField':
+        return BooleanField(default=context.get('Default') == 'true', **kwargs)
+    size = int(context['Size'])
+    default = context.get('Default')
+    if xsi_type in ('UnsignedIntField', 'SignedIntField'):
+        bits = 8 if size <= 8 else 16 if size <= 16 else 32
+        if default is not None:
+            default = int(default)
+        if xsi_type == 'UnsignedIntField':
+            return UnsignedIntField(size=size, data_type=f'uint_{bits}',
+                                    default=default, **kwargs)
+        return SignedIntField(size=size, data_type=f'int_{bits}',
+                              default=default, **kwargs)
+    if xsi_type == 'EnumField':
+        return EnumField(items=context.get('items', []), size=size,
+                         default=default, **kwargs)
+    fixed = context.get('Fixed') == 'true'
+    if xsi_type == 'StringField':
+        return StringField(size=size, fixed=fixed, default=default, **kwargs)
+    if xsi_type == 'DataField':
+        if default is not None:
+            try:
+                default = a2b_base64(default)
+            except BinasciiError:
+                warn(f'Ignoring invalid default for {kwargs["name"]}')
+                default = None
+        return DataField(size=size, fixed=fixed, default=default, **kwargs)
+    if xsi_type == 'ArrayField':
+        return ArrayField(size=size, fields=context.get('fields', Fields()),
+                          fixed=fixed, **kwargs)
+    raise ValueError(f'Unsupported field type {xsi_type}')
+
+
 def _indent(elem: ET.Element, level: int = 0, spaces: int = 2) -> ET.Element:
     i = '\n' + level * (' ' * spaces)
     if len(elem):
@@ -1,8 +1,12 @@
 import math
+from array import array
 from binascii import b2a_base64
+from typing import Iterable
 
 from . import ET
 from .base import BaseCodec, CodecList
+from .bits import BitReader, BitWriter
+from .compiled import CompiledMessage
 from .fields.base_field import FieldCodec, Fields
 
 from idpmodem.constants import DataFormat
@@ -21,6 +25,8 @@ class MessageCodec(BaseCodec):
 
     """
 
+    __slots__ = ('_is_forward', '_sin', '_min', '_fields')
+
     def __init__(self,
                  name: str,
                  sin: int,
@@ -86,16 +92,73 @@ class MessageCodec(BaseCodec):
         Args:
             databytes: A bytes array (typically from the forward message)
         """
-        binary_str = ''.join(format(int(b), '08b') for b in databytes)
-        bit_offset = 16   #: Begin after SIN/MIN bytes
-        for field in self.fields:
-            assert isinstance(field, FieldCodec)
-            if field.optional:
-                present = binary_str[bit_offset] == '1'
-                bit_offset += 1
-                if not present:
-                    continue
-            bit_offset += field.decode(binary_str[bit_offset:])
+        reader = BitReader(databytes, position=16)   #: Begin after SIN/MIN
+        self.fields.read(reader)
+
+    def decode_dict(self, databytes: bytes) -> dict:
+        """Returns field values parsed from raw data including SIN/MIN.
+
+        Unlike `decode`, the message definition is not modified so a single
+        definition may be shared by concurrent decoders.
+
+        Args:
+            databytes: A bytes array (typically from the forward message)
+
+        Returns:
+            Dictionary of field values by name. Optional fields not present
+                are omitted and array elements are lists of dictionaries.
+
+        Raises:
+            ValueError if the SIN/MIN do not match the definition.
+
+        """
+        if len(databytes) < 2 or tuple(databytes[:2]) != (self.sin, self.min):
+            raise ValueError(f'Payload is not {self.name}'
+                             f' ({self.sin}, {self.min})')
+        reader = BitReader(databytes, position=16)
+        return self.fields.read_values(reader)
+
+    def decode_many(self,
+                    payloads: 'Iterable[bytes]',
+                    ) -> 'dict[str, array|list]':
+        """Returns columns of field values parsed from many payloads.
+
+        Every payload must include the SIN/MIN of this message. Leading
+        mandatory boolean, enum and integer fields are extracted for all
+        payloads at once using precomputed shifts and masks. The message
+        definition is not modified.
+
+        Args:
+            payloads: An iterable of bytes arrays including SIN/MIN.
+
+        Returns:
+            Dictionary of columns by field name, each with one entry per
+                payload. Mandatory boolean, enum and integer fields are
+                `array.array` of integers (enum item index, boolean 0/1).
+                Other fields are lists of values, with None for optional
+                fields not present.
+
+        """
+        return self.compile().decode_many(payloads)
+
+    def encode_dict(self, values: dict) -> bytes:
+        """Returns raw data including SIN/MIN encoded from field values.
+
+        Unlike `encode`, the message definition is not modified so a single
+        definition may be shared by concurrent encoders.
+
+        Args:
+            values: Field values by name, as returned by `decode_dict`.
+                Mandatory fields not in `values` use the field default.
+
+        """
+        writer = BitWriter()
+        writer.write(self.sin, 8)
+        writer.write(self.min, 8)
+        self.fields.write_values(writer, values)
+        databytes = writer.to_bytes()
+        self._check_size(len(databytes) - 2)
+        return databytes
 
     def encode(self,
                data_format: int = DataFormat.BASE64,
@@ -112,34 +175,17 @@ class MessageCodec(BaseCodec):
         """
         if data_format not in [DataFormat.BASE64, DataFormat.HEX]:
             raise ValueError(f'data_format {data_format} unsupported')
-        bin_str = ''
-        for field in self.fields:
-            assert isinstance(field, FieldCodec)
-            if field.optional:
-                if exclude is not None and field.name in exclude:
-                    present = False
-                elif hasattr(field, 'value'):
-                    present = field.value is not None
-                elif hasattr(field, 'elements'):
-                    present = field.elements is not None
-                else:
-                    raise ValueError('Unknown value of optional')
-                bin_str += '1' if present else '0'
-                if not present:
-                    continue
-            bin_str += field.encode()
-        for _ in range(0, 8 - len(bin_str) % 8):   #:pad to next byte
-            bin_str += '0'
-        _format = f'0{int(len(bin_str) / 8 * 2)}X'   #:hex bytes 2 chars
-        hex_str = format(int(bin_str, 2), _format)
-        if (self.is_forward and len(hex_str) / 2 > 9998 or
-            not self.is_forward and len(hex_str) / 2 > 6398):
-            raise ValueError(f'{len(hex_str) / 2} bytes exceeds maximum size'
-                             ' for Payload')
+        writer = BitWriter()
+        self.fields.write(writer, exclude)
+        return self._payload_dict(writer.to_bytes(), data_format)
+
+    def _payload_dict(self, payload: bytes, data_format: int) -> dict:
+        """Formats an encoded payload (excluding SIN/MIN) for `encode`."""
+        self._check_size(len(payload))
         if data_format == DataFormat.HEX:
-            data = hex_str
+            data = payload.hex().upper()
         else:
-            data = b2a_base64(bytearray.fromhex(hex_str)).strip().decode()
+            data = b2a_base64(payload).strip().decode()
         return {
             'sin': self.sin,
             'min': self.min,
@@ -147,6 +193,22 @@ class MessageCodec(BaseCodec):
             'data': data
         }
 
+    def _check_size(self, length: int) -> None:
+        """Raises ValueError if the payload length exceeds the maximum."""
+        if (self.is_forward and length > 9998 or
+            not self.is_forward and length > 6398):
+            raise ValueError(f'{length} bytes exceeds maximum size'
+                             ' for Payload')
+
+    def compile(self) -> 'CompiledMessage':
+        """Returns a precomputed plan to repeatedly encode/decode the message.
+
+        The plan reflects the field definitions at the time of compiling,
+        so it must be recompiled if fields are added, removed or resized.
+
+        """
+        return CompiledMessage(self)
+
     def xml(self) -> ET.Element:
         """Returns the Message XML definition for a Message Definition File."""
         xmessage = ET.Element('Message')
@@ -161,11 +223,40 @@ class MessageCodec(BaseCodec):
 
 
 class Messages(CodecList):
-    """The list of Messages (Forward or Return) within a Service."""
+    """The list of Messages (Forward or Return) within a Service.
+
+    Messages are also indexed by MIN for dispatch of received payloads.
+
+    """
+    _INDEXES = ('_names', '_by_min')
+
     def __init__(self, sin: int, is_forward: bool):
         super().__init__(codec_cls=MessageCodec)
         self.sin = sin
         self.is_forward = is_forward
+        self._by_min: 'dict[int, MessageCodec]' = {}
+
+    def _reindex(self) -> None:
+        super()._reindex()
+        self._by_min = {m.min: m for m in reversed(self)}
+
+    def _index_append(self, message: MessageCodec, position: int) -> None:
+        super()._index_append(message, position)
+        self._by_min.setdefault(message.min, message)
+
+    def by_min(self, min: int) -> 'MessageCodec|None':
+        """Returns the message with the given MIN, or None if not defined."""
+        if not self._indexed:
+            self._reindex()
+        return self._by_min.get(min)
+
+    def _validate(self, message: MessageCodec) -> None:
+        """Raises ValueError if a message does not belong in the list."""
+        if not isinstance(message, MessageCodec):
+            raise ValueError('Invalid message definition')
+        if message.sin != self.sin:
+            raise ValueError(f'Message SIN {message.sin} does not match'
+                             f' service {self.sin}')
     
     def add(self, message: MessageCodec) -> None:
         """Add a message to the list if it matches the parent SIN.
@@ -180,15 +271,17 @@ class Messages(CodecList):
                 invalid value_range or unsupported data_type
 
         """
-        if not isinstance(message, MessageCodec):
-            raise ValueError('Invalid message definition')
-        if message.sin != self.sin:
-            raise ValueError(f'Message SIN {message.sin} does not match'
-                             f' service {self.sin}')
-        for m in self:
-            assert isinstance(m, MessageCodec)
-            if m.name == message.name:
-                raise ValueError(f'Duplicate message name {message.name} found')
-            if m.min == message.min:
-                raise ValueError(f'Duplicate message MIN {message.min} found')
-        self.append(message)
+        self._validate(message)
+        if message.name in self:
+            raise ValueError(f'Duplicate message name {message.name} found')
+        if self.by_min(message.min) is not None:
+            raise ValueError(f'Duplicate message MIN {message.min} found')
+        super().add(message)
+
+    def __setitem__(self, n: 'str|int', value):
+        if isinstance(n, int):
+            self._validate(value)
+            existing = self.by_min(value.min)
+            if existing is not None and existing is not self[n]:
+                raise ValueError(f'Duplicate message MIN {value.min} found')
+        super().__setitem__(n, value)
@@ -16,6 +16,8 @@ class ServiceCodec(BaseCodec):
         messages_return (list): A list of mobile-originated Message definitions
 
     """
+    __slots__ = ('_sin', '_messages_forward', '_messages_return')
+
     def __init__(self,
                  name: str,
                  sin: int,
@@ -74,8 +76,74 @@ class ServiceCodec(BaseCodec):
                 raise ValueError(f'Message {message.name} is_forward is True')
         self._messages_return = messages
         
-    def xml(self) -> ET.Element:
-        """Returns the Service XML definition for a Message Definition File."""
+    def message(self, min: int, is_forward: bool) -> 'MessageCodec|None':
+        """Returns the message definition for a MIN, or None if not defined.
+
+        Args:
+            min: The Message Identification Number.
+            is_forward: Indicates a mobile-terminated message.
+
+        """
+        messages = self.messages_forward if is_forward else self.messages_return
+        return messages.by_min(min)
+
+    def _find_message(self, is_forward: bool, message: dict) -> MessageCodec:
+        """Returns the message definition matching a `min` or `name`."""
+        if 'min' in message:
+            codec = self.message(message['min'], is_forward)
+        else:
+            messages = (self.messages_forward if is_forward
+                        else self.messages_return)
+            codec = next((m for m in messages if m.name == message.get('name')),
+                         None)
+        if codec is None:
+            raise ValueError(f'Message not defined for service {self.name}')
+        return codec
+
+    def decode_dict(self, databytes: bytes, is_forward: bool) -> dict:
+        """Returns a message dictionary parsed from raw data including SIN/MIN.
+
+        The service and message definitions are not modified.
+
+        Args:
+            databytes: A bytes array starting with SIN and MIN.
+            is_forward: Indicates a mobile-terminated message.
+
+        Returns:
+            Dictionary with `name`, `sin`, `min` and `fields` (field values).
+
+        """
+        if len(databytes) < 2 or databytes[0] != self.sin:
+            raise ValueError(f'Payload SIN does not match service {self.sin}')
+        message = self._find_message(is_forward, {'min': databytes[1]})
+        return {
+            'name': message.name,
+            'sin': message.sin,
+            'min': message.min,
+            'fields': message.decode_dict(databytes),
+        }
+
+    def encode_dict(self, message: dict, is_forward: bool) -> bytes:
+        """Returns raw data including SIN/MIN encoded from a message dictionary.
+
+        The service and message definitions are not modified.
+
+        Args:
+            message: A dictionary with `min` or `name`, and `fields` values,
+                as returned by `decode_dict`.
+            is_forward: Indicates a mobile-terminated message.
+
+        """
+        codec = self._find_message(is_forward, message)
+        return codec.encode_dict(message.get('fields', {}))
+
+    def xml(self, include_description: bool = True) -> ET.Element:
+        """Returns the Service XML definition for a Message Definition File.
+
+        Args:
+            include_description: If False omits the Description.
+
+        """
         if len(self.messages_forward) == 0 and len(self.messages_return) == 0:
             raise ValueError(f'No messages defined for service {self.sin}')
         xservice = ET.Element('Service')
@@ -83,7 +151,7 @@ class ServiceCodec(BaseCodec):
         name.text = str(self.name)
         sin = ET.SubElement(xservice, 'SIN')
         sin.text = str(self.sin)
-        if self.description:
+        if include_description and self.description:
             desc = ET.SubElement(xservice, 'Description')
             desc.text = str(self.description)
         if len(self.messages_forward) > 0:
@@ -98,9 +166,16 @@ class ServiceCodec(BaseCodec):
 
 
 class Services(CodecList):
-    """The list of Service(s) within a MessageDefinitions."""
+    """The list of Service(s) within a MessageDefinitions.
+
+    Services are also indexed by SIN for dispatch of received payloads.
+
+    """
+    _INDEXES = ('_names', '_by_sin')
+
     def __init__(self, services: 'list[ServiceCodec]' = None):
         super().__init__(codec_cls=ServiceCodec)
+        self._by_sin: 'dict[int, ServiceCodec]' = {}
         if services is not None:
             for service in services:
                 if not isinstance(service, ServiceCodec):
@@ -113,7 +188,29 @@ class Services(CodecList):
             raise ValueError(f'{service} is not a valid Service')
         if service.name in self:
             raise ValueError(f'Duplicate Service {service.name}')
-        for existing_service in self:
-            if existing_service.sin == service.sin:
-                raise ValueError(f'Duplicate SIN {service.sin}')
-        self.append(service)
+        if self.by_sin(service.sin) is not None:
+            raise ValueError(f'Duplicate SIN {service.sin}')
+        super().add(service)
+
+    def __setitem__(self, n: 'str|int', value):
+        if isinstance(n, int):
+            if not isinstance(value, ServiceCodec):
+                raise ValueError(f'{value} is not a valid Service')
+            existing = self.by_sin(value.sin)
+            if existing is not None and existing is not self[n]:
+                raise ValueError(f'Duplicate SIN {value.sin}')
+        super().__setitem__(n, value)
+
+    def _reindex(self) -> None:
+        super()._reindex()
+        self._by_sin = {s.sin: s for s in reversed(self)}
+
+    def _index_append(self, service: ServiceCodec, position: int) -> None:
+        super()._index_append(service, position)
+        self._by_sin.setdefault(service.sin, service)
+
+    def by_sin(self, sin: int) -> 'ServiceCodec|None':
+        """Returns the service with the given SIN, or None if not defined."""
+        if not self._indexed:
+            self._reindex()
+        return self._by_sin.get(sin)
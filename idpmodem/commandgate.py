@@ -0,0 +1,97 @@
+"""Synchronization gate serializing AT commands from multiple threads.
+
+Waiting threads sleep on a condition variable rather than spinning, are
+admitted in the order they arrived, and may time out or be cancelled.
+A holdoff (e.g. following a modem reboot) delays admission of any waiting
+thread until it expires.
+
+"""
+import threading
+from collections import deque
+from time import monotonic
+
+
+class CommandGate:
+    """A fair (FIFO) gate that admits one AT command at a time.
+
+    Attributes:
+        holdoff_remaining (float): Seconds until the holdoff expires.
+
+    """
+    def __init__(self) -> None:
+        self._condition = threading.Condition()
+        self._waiting = deque()
+        self._busy = False
+        self._holdoff_until = 0.0
+        self._generation = 0
+
+    def full(self) -> bool:
+        """Indicates if a command is in progress or queued."""
+        with self._condition:
+            return self._busy or len(self._waiting) > 0
+
+    @property
+    def holdoff_remaining(self) -> float:
+        with self._condition:
+            return max(0.0, self._holdoff_until - monotonic())
+
+    def hold_off(self, seconds: float) -> None:
+        """Delays admission of waiting commands for a number of seconds."""
+        with self._condition:
+            self._holdoff_until = max(self._holdoff_until,
+                                      monotonic() + seconds)
+            self._condition.notify_all()
+
+    def acquire(self, blocking: bool = True, timeout: float = None) -> bool:
+        """Waits for this thread's turn to send a command.
+
+        Args:
+            blocking: If False, returns immediately if the gate is not free.
+            timeout: Maximum seconds to wait (None waits indefinitely).
+
+        Returns:
+            True if admitted, False if timed out, busy or cancelled.
+
+        """
+        with self._condition:
+            if not blocking and (self._busy or self._waiting or
+                                 self._holdoff_until > monotonic()):
+                return False
+            ticket = object()
+            generation = self._generation
+            self._waiting.append(ticket)
+            deadline = None if timeout is None else monotonic() + timeout
+            try:
+                while generation == self._generation:
+                    now = monotonic()
+                    wait = None
+                    if not self._busy and self._waiting[0] is ticket:
+                        if self._holdoff_until <= now:
+                            self._waiting.popleft()
+                            self._busy = True
+                            return True
+                        wait = self._holdoff_until - now
+                    if deadline is not None:
+                        if deadline <= now:
+                            return False
+                        wait = min(wait or deadline - now, deadline - now)
+                    self._condition.wait(wait)
+                return False
+            finally:
+                if ticket in self._waiting:
+                    self._waiting.remove(ticket)
+                self._condition.notify_all()
+
+    def release(self) -> None:
+        """Frees the gate for the next waiting command."""
+        with self._condition:
+            self._busy = False
+            self._condition.notify_all()
+
+    def cancel(self) -> None:
+        """Aborts all waiting (not in progress) commands and any holdoff."""
+        with self._condition:
+            self._generation += 1
+            self._waiting.clear()
+            self._holdoff_until = 0.0
+            self._condition.notify_all()
@@ -5,13 +5,20 @@ Intended for use with SkyWave/ORBCOMM IDP modem.
 
 Thanks to: https://stackoverflow.com/questions/25239423/crc-ccitt-16-bit-python-manual-calculation.
 
+Operates on whole `bytes`/`memoryview` buffers using a lookup table, or the
+C implementation `binascii.crc_hqx` (same polynomial) when available.
+The backend is selected automatically and can be forced with the environment
+variable `CRC_BACKEND` (`binascii` or `table`) or `set_backend`.
+
 """
+import binascii
 import logging
 import os
 
 from idpmodem.helpers import printable_crlf
 
 VERBOSE_DEBUG = str(os.getenv('VERBOSE_DEBUG', False)).lower() == 'true'
+CRC_BACKEND = os.getenv('CRC_BACKEND')
 
 _log = logging.getLogger(__name__)
 __version__ = "1.1.0"
@@ -34,6 +41,7 @@ def _initial(c: int) -> int:
 
 
 _tab = [_initial(i) for i in range(256)]
+_tab16 = [t & 0xffff for t in _tab]
 
 
 def _update_crc(_crc: int, c: int) -> int:
@@ -45,37 +53,113 @@ def _update_crc(_crc: int, c: int) -> int:
     return _crc
 
 
+def _crc_table(data: 'bytes|bytearray|memoryview', initial: int) -> int:
+    """Table-driven CRC over a buffer (pure Python backend)."""
+    _crc = initial
+    tab = _tab16
+    for b in data:
+        _crc = ((_crc << 8) & 0xff00) ^ tab[(_crc >> 8) ^ b]
+    return _crc
+
+
+_BACKENDS = {'table': _crc_table}
+if hasattr(binascii, 'crc_hqx'):
+    _BACKENDS['binascii'] = binascii.crc_hqx
+
+
+def _select_backend(name: str = None) -> str:
+    """Returns the requested backend name, or the fastest verified backend."""
+    if name is not None:
+        if name not in _BACKENDS:
+            raise ValueError(f'Invalid CRC backend {name}'
+                             f' must be one of {list(_BACKENDS)}')
+        return name
+    if 'binascii' in _BACKENDS:
+        check = b'123456789'
+        if binascii.crc_hqx(check, 0xffff) == _crc_table(check, 0xffff):
+            return 'binascii'
+    return 'table'
+
+
+_backend_name = _select_backend(CRC_BACKEND)
+_crc_buffer = _BACKENDS[_backend_name]
+
+
+def get_backend() -> str:
+    """Returns the name of the CRC backend in use."""
+    return _backend_name
+
+
+def set_backend(name: str = None) -> None:
+    """Sets the CRC backend.
+
+    Args:
+        name: `binascii` or `table`. If None selects automatically.
+
+    Raises:
+        ValueError if the backend is not available.
+
+    """
+    global _backend_name, _crc_buffer
+    _backend_name = _select_backend(name)
+    _crc_buffer = _BACKENDS[_backend_name]
+
+
+def crc_bytes(buf: 'bytes|bytearray|memoryview', initial: int = 0xffff) -> int:
+    """Returns the CRC value of a buffer.
+
+    Args:
+        buf: The bytes to calculate CRC on.
+        initial: The start value of CRC (0xFFFF for IDP modem)
+
+    Returns:
+        The CRC-16-CCITT value
+
+    """
+    return _crc_buffer(buf, initial)
+
+
 def crc(string: str, initial: int = 0xffff) -> int:
     """Returns the CRC value.
 
     Args:
-        string: the text to have CRC calculated on
+        string: the text to have CRC calculated on (as UTF-8 bytes)
         initial: the start value of CRC (0xFFFF for IDP modem)
     
     Returns:
         The CRC-16-CCITT value
     """
-    _crc = initial
-    for c in string:
-        _crc = _update_crc(_crc, ord(c))
-    return _crc
+    return _crc_buffer(string.encode('utf-8'), initial)
 
 
-''' Unused
-def crc_bytes(*i) -> int:
-    """Returns the CRC value of a byte stream.
+class CrcAccumulator:
+    """Incrementally calculates CRC as data arrives.
+
+    Attributes:
+        initial (int): The start value of CRC (0xFFFF for IDP modem)
+        value (int): The CRC of all data since initialization or reset.
 
-    Args:
-        i: byte stream
-    
-    Returns:
-        crc value
     """
-    _crc = PRESET
-    for b in i:
-        _crc = _update_crc(_crc, b)
-    return _crc
-'''
+    def __init__(self, initial: int = 0xffff) -> None:
+        self.initial = initial
+        self.value = initial
+
+    def update(self, data: 'bytes|bytearray|memoryview') -> 'CrcAccumulator':
+        """Adds data to the running CRC."""
+        self.value = _crc_buffer(data, self.value)
+        return self
+
+    def reset(self) -> None:
+        """Restarts the running CRC from the initial value."""
+        self.value = self.initial
+
+    def hexdigest(self) -> str:
+        """The running CRC as 4 uppercase hex characters."""
+        return f'{self.value:04X}'
+
+    def matches(self, candidate: str) -> bool:
+        """Indicates if a candidate (e.g. `*1A2B`) matches the running CRC."""
+        return candidate.strip().replace('*', '').upper() == self.hexdigest()
 
 
 def get_crc(command: str) -> str:
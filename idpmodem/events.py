@@ -0,0 +1,315 @@
+"""Notification-driven dispatch of modem events.
+
+Rather than polling the receive queue, transmit queue and satellite status
+on timers, a `ModemEventLoop` sleeps until woken by the modem notification
+output and then reads the active event notifications (`S89`) once, issuing
+only the queries needed for the asserted events:
+
+- `MESSAGE_MT_RECEIVED` queries the receive queue (`AT%MGFN`)
+- `MESSAGE_MO_COMPLETE` queries the transmit queue (`AT%MGRS`)
+- any other event is dispatched without a further query
+
+The loop is woken by `notify()` e.g. from the interrupt handler of the
+GPIO wired to the modem notification pin, which is asserted for the events
+in `S88`, and by any unsolicited data the `AtProtocol` routes to its
+`event_callback`. If neither is available, `poll_interval` sets how often
+`S89` is read anyway.
+
+Reading `S89` clears the notifications, so the loop must be its only
+reader. Other consumers subscribe to the loop's events instead, e.g. a
+`MoQueue` is attached with `MoQueue.attach(loop)` rather than reading `S89`
+in its `service` method.
+
+Example::
+
+    loop = ModemEventLoop(modem)
+    loop.subscribe(on_message, MessageMtReceived)
+    gpio.on_rising(notify_pin, loop.notify)
+    loop.run()
+
+"""
+import asyncio
+import inspect
+import logging
+import os
+import threading
+from time import monotonic
+from typing import Callable
+
+from idpmodem.constants import EventNotification, MessageState
+
+EVENT_LOOP_POLL_INTERVAL = float(os.getenv('EVENT_LOOP_POLL_INTERVAL', 60))
+DEFAULT_MONITOR = (EventNotification.MESSAGE_MT_RECEIVED,
+                   EventNotification.MESSAGE_MO_COMPLETE)
+MO_FINAL_STATES = (MessageState.TX_COMPLETE,
+                   MessageState.TX_FAILED,
+                   MessageState.TX_CANCELLED)
+
+_log = logging.getLogger(__name__)
+
+
+class ModemEvent:
+    """An event notification asserted by the modem.
+
+    Attributes:
+        notification (EventNotification): The notification bit, or None for
+            unsolicited data.
+        timestamp (float): The monotonic time the event was detected.
+
+    """
+    __slots__ = ('notification', 'timestamp')
+
+    def __init__(self, notification: 'EventNotification|None') -> None:
+        self.notification = notification
+        self.timestamp = monotonic()
+
+    def __repr__(self) -> str:
+        name = self.notification.name if self.notification else None
+        return f'<{self.__class__.__name__} {name}>'
+
+
+class MessageMtReceived(ModemEvent):
+    """Mobile-terminated messages were received.
+
+    Attributes:
+        messages (list): The newly complete messages as returned by
+            `message_mt_waiting`.
+
+    """
+    __slots__ = ('messages',)
+
+    def __init__(self, messages: 'list[dict]') -> None:
+        super().__init__(EventNotification.MESSAGE_MT_RECEIVED)
+        self.messages = messages
+
+
+class MessageMoComplete(ModemEvent):
+    """Mobile-originated messages reached a final state.
+
+    Attributes:
+        messages (list): The newly completed, failed or cancelled messages
+            as returned by `message_mo_state`.
+
+    """
+    __slots__ = ('messages',)
+
+    def __init__(self, messages: 'list[dict]') -> None:
+        super().__init__(EventNotification.MESSAGE_MO_COMPLETE)
+        self.messages = messages
+
+
+class ModemUnsolicited(ModemEvent):
+    """Unsolicited data was output by the modem.
+
+    Attributes:
+        data (str): The unsolicited line.
+
+    """
+    __slots__ = ('data',)
+
+    def __init__(self, data: str) -> None:
+        super().__init__(None)
+        self.data = data
+
+
+class ModemEventLoop:
+    """Dispatches typed modem events to subscribers when notified.
+
+    `run` drives a threaded `IdpModem` and `run_async` an asyncio
+    `IdpModem`. Handlers are called in the loop thread or task, and for
+    `run_async` may be coroutine functions.
+
+    Attributes:
+        modem: The `IdpModem` whose events are dispatched.
+        monitor (list): Events added to `S88` when the loop starts.
+        poll_interval (float): Maximum seconds between reads of `S89`, or
+            None to read only when notified.
+
+    """
+    def __init__(self,
+                 modem,
+                 monitor: 'list[EventNotification]' = DEFAULT_MONITOR,
+                 poll_interval: 'float|None' = EVENT_LOOP_POLL_INTERVAL,
+                 ) -> None:
+        self.modem = modem
+        self.monitor = list(monitor)
+        self.poll_interval = poll_interval
+        self._subscribers: 'list[tuple[Callable, type]]' = []
+        self._unsolicited: 'list[str]' = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = False
+        self._async_loop: asyncio.AbstractEventLoop = None
+        self._async_wake: asyncio.Event = None
+        self._callback: Callable = None
+        self._mt_reported: 'set[str]' = set()
+        self._mo_reported: 'set[str]' = set()
+
+    def subscribe(self, handler: Callable, event_type: type = ModemEvent):
+        """Registers a handler for events of a type (default all).
+
+        Args:
+            handler: Called with each `ModemEvent` instance of `event_type`.
+            event_type: A `ModemEvent` subclass to filter events.
+
+        """
+        if not issubclass(event_type, ModemEvent):
+            raise ValueError('Event type must be a ModemEvent')
+        self._subscribers.append((handler, event_type))
+
+    def unsubscribe(self, handler: Callable) -> None:
+        """Removes all subscriptions of a handler."""
+        self._subscribers = [s for s in self._subscribers if s[0] != handler]
+
+    def notify(self) -> None:
+        """Wakes the loop to read the event notifications (thread-safe)."""
+        self._wake.set()
+        loop, wake = self._async_loop, self._async_wake
+        if loop is None or wake is None:
+            return
+        try:
+            loop.call_soon_threadsafe(wake.set)
+        except RuntimeError:   # the loop closed since run_async ended
+            pass
+
+    def stop(self) -> None:
+        """Stops a running loop (thread-safe)."""
+        self._stopping = True
+        self.notify()
+
+    def _on_unsolicited(self, previous: 'Callable|None', data: str) -> None:
+        """Queues unsolicited data and wakes the loop."""
+        with self._lock:
+            self._unsolicited.append(data)
+        self.notify()
+        if previous is not None:
+            previous(data)
+
+    def _attach(self) -> None:
+        protocol = self.modem.protocol
+        if protocol is None:
+            raise ConnectionError('Modem is not connected')
+        if (self._callback is not None and
+            protocol.event_callback is self._callback):
+            return
+        previous = protocol.event_callback
+        self._callback = lambda data: self._on_unsolicited(previous, data)
+        protocol.event_callback = self._callback
+
+    def _missing_monitor(self, monitored: 'list[EventNotification]',
+                         ) -> 'list[EventNotification]|None':
+        """Returns the `S88` events to set, or None if already monitored."""
+        if all(event in monitored for event in self.monitor):
+            return None
+        return list(set(monitored) | set(self.monitor))
+
+    def check(self) -> 'list[ModemEvent]':
+        """Reads the active notifications of a threaded modem and dispatches.
+
+        Returns:
+            The events dispatched.
+
+        """
+        events: 'list[ModemEvent]' = self._take_unsolicited()
+        active = self.modem.event_notifications
+        for notification in active:
+            if notification == EventNotification.MESSAGE_MT_RECEIVED:
+                event = self._mt_event(self.modem.message_mt_waiting())
+            elif notification == EventNotification.MESSAGE_MO_COMPLETE:
+                event = self._mo_event(self.modem.message_mo_state())
+            else:
+                event = ModemEvent(notification)
+            if event is not None:
+                events.append(event)
+        for event in events:
+            for handler in self._handlers(event):
+                try:
+                    handler(event)
+                except Exception as err:
+                    _log.exception(f'Event handler error: {err}')
+        return events
+
+    async def check_async(self) -> 'list[ModemEvent]':
+        """Reads the active notifications of an asyncio modem and dispatches.
+
+        See `check`.
+
+        """
+        events: 'list[ModemEvent]' = self._take_unsolicited()
+        active = await self.modem.event_notifications_get()
+        for notification in active:
+            if notification == EventNotification.MESSAGE_MT_RECEIVED:
+                event = self._mt_event(await self.modem.message_mt_waiting())
+            elif notification == EventNotification.MESSAGE_MO_COMPLETE:
+                event = self._mo_event(await self.modem.message_mo_state())
+            else:
+                event = ModemEvent(notification)
+            if event is not None:
+                events.append(event)
+        for event in events:
+            for handler in self._handlers(event):
+                try:
+                    result = handler(event)
+                    if inspect.isawaitable(result):
+                        await result
+                except Exception as err:
+                    _log.exception(f'Event handler error: {err}')
+        return events
+
+    def run(self) -> None:
+        """Dispatches events from a threaded modem until `stop` is called."""
+        self._stopping = False
+        self._attach()
+        monitored = self.modem.event_notification_monitor
+        if (monitor := self._missing_monitor(monitored)) is not None:
+            self.modem.event_notification_monitor = monitor
+        while not self._stopping:
+            self._wake.clear()
+            self.check()
+            self._wake.wait(self.poll_interval)
+
+    async def run_async(self) -> None:
+        """Dispatches events from an asyncio modem until stopped/cancelled."""
+        self._stopping = False
+        self._async_loop = asyncio.get_running_loop()
+        self._async_wake = asyncio.Event()
+        self._attach()
+        try:
+            monitored = await self.modem.event_notification_monitor_get()
+            if (monitor := self._missing_monitor(monitored)) is not None:
+                await self.modem.event_notification_monitor_set(monitor)
+            while not self._stopping:
+                self._async_wake.clear()
+                await self.check_async()
+                try:
+                    await asyncio.wait_for(self._async_wake.wait(),
+                                           self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._async_loop = None
+            self._async_wake = None
+
+    def _take_unsolicited(self) -> 'list[ModemEvent]':
+        with self._lock:
+            unsolicited, self._unsolicited = self._unsolicited, []
+        return [ModemUnsolicited(data) for data in unsolicited]
+
+    def _handlers(self, event: ModemEvent) -> 'list[Callable]':
+        return [handler for handler, event_type in list(self._subscribers)
+                if isinstance(event, event_type)]
+
+    def _mt_event(self, waiting: 'list[dict]') -> 'MessageMtReceived|None':
+        """Returns an event for complete messages not already reported."""
+        complete = [m for m in waiting
+                    if m['state'] == MessageState.RX_COMPLETE]
+        new = [m for m in complete if m['name'] not in self._mt_reported]
+        self._mt_reported = set(m['name'] for m in complete)
+        return MessageMtReceived(new) if new else None
+
+    def _mo_event(self, states: 'list[dict]') -> 'MessageMoComplete|None':
+        """Returns an event for final message states not already reported."""
+        final = [m for m in states if m['state'] in MO_FINAL_STATES]
+        new = [m for m in final if m['name'] not in self._mo_reported]
+        self._mo_reported = set(m['name'] for m in final)
+        return MessageMoComplete(new) if new else None
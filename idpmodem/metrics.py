@@ -0,0 +1,268 @@
+"""Read-through caching of modem metrics with a lifetime per metric.
+
+Metrics such as satellite status are read from trace data with a single
+command line for any number of values. A `MetricsCache` holds each value
+with its own time-to-live, so that fast-changing values (e.g. SNR) are
+refreshed more often than slow ones (e.g. the geo beam). A read of stale
+values queries only those values, and concurrent reads of the same values
+share one query in flight (single-flight) rather than each sending it.
+
+"""
+import asyncio
+import os
+import threading
+from time import monotonic
+from typing import Callable
+
+from idpmodem.constants import BeamSearchState, GeoBeam, SatlliteControlState
+
+SAT_STATUS_TTL = float(os.getenv('SAT_STATUS_TTL', 5))
+SAT_BEAM_TTL = float(os.getenv('SAT_BEAM_TTL', 60))
+#: Satellite status metric time-to-live in seconds
+SAT_STATUS_TTLS = {
+    'snr': SAT_STATUS_TTL,
+    'control_state': SAT_STATUS_TTL,
+    'beamsearch_state': SAT_STATUS_TTL,
+    'geo_beam_id': SAT_BEAM_TTL,
+}
+#: Satellite status metric trace (class, subclass, data index)
+SAT_STATUS_TRACES = {
+    'snr': (3, 1, 16),
+    'control_state': (3, 1, 22),
+    'beamsearch_state': (3, 1, 23),
+    'geo_beam_id': (3, 5, 2),
+}
+
+
+def trace_groups(traces: 'dict[str, tuple[int, int, int]]',
+                 names: 'list[str]',
+                 ) -> 'dict[tuple[int, int], list[str]]':
+    """Groups metric names by trace class and subclass.
+
+    Args:
+        traces: The trace (class, subclass, data index) of each metric.
+        names: The metrics to group.
+
+    Returns:
+        A dictionary of metric names keyed by (class, subclass), in the
+            order of `traces`.
+
+    """
+    groups = {}
+    for name, (trace_class, subclass, _) in traces.items():
+        if name in names:
+            groups.setdefault((trace_class, subclass), []).append(name)
+    return groups
+
+
+def geo_beam_satellite(geo_beam_id: 'int|None') -> 'str|None':
+    """Returns the satellite name of a geo beam ID."""
+    if geo_beam_id is None:
+        return None
+    if GeoBeam.is_valid(geo_beam_id):
+        return GeoBeam(geo_beam_id).satellite()
+    return f'UNDEFINED {geo_beam_id}'
+
+
+def geo_beam_name(geo_beam_id: 'int|None') -> 'str|None':
+    """Returns the regional beam ID of a geo beam ID."""
+    if geo_beam_id is None:
+        return None
+    if GeoBeam.is_valid(geo_beam_id):
+        return GeoBeam(geo_beam_id).id()
+    return f'GEO{geo_beam_id}'
+
+
+def satellite_status(metrics: dict) -> dict:
+    """Returns the satellite status report of the satellite metric values.
+
+    Args:
+        metrics: The values of the `SAT_STATUS_TTLS` metrics.
+
+    """
+    ctrl_state = metrics.get('control_state')
+    beamsearch_state = metrics.get('beamsearch_state')
+    return {
+        'satellite': geo_beam_satellite(metrics.get('geo_beam_id')),
+        'beam_id': geo_beam_name(metrics.get('geo_beam_id')),
+        'network_status': (SatlliteControlState(ctrl_state).name
+                           if ctrl_state is not None else None),
+        'control_state': ctrl_state,
+        'beamsearch': (BeamSearchState(beamsearch_state).name
+                       if beamsearch_state is not None else None),
+        'beamsearch_state': beamsearch_state,
+        'snr': metrics.get('snr'),
+    }
+
+
+class _Flight:
+    """A refresh in progress that concurrent readers wait on."""
+    __slots__ = ('done', 'refreshed')
+
+    def __init__(self, done: 'threading.Event|asyncio.Event') -> None:
+        self.done = done
+        self.refreshed: 'set[str]' = set()
+
+
+class MetricsCache:
+    """A read-through cache of named metrics each with a time-to-live.
+
+    Values are fetched by a function called with the list of stale names
+    that returns a dictionary of their values. Use `get`/`get_many`/
+    `refresh` with a function, or `get_async`/`get_many_async`/
+    `refresh_async` with a coroutine function.
+
+    Attributes:
+        ttls (dict): Seconds each metric is valid, keyed by name.
+
+    """
+    def __init__(self,
+                 ttls: 'dict[str, float]',
+                 fetch: Callable) -> None:
+        """Create a cache.
+
+        Args:
+            ttls: Seconds each metric is valid, keyed by name.
+            fetch: Called with a list of names to return their values in a
+                dictionary e.g. from a single batch of trace queries.
+
+        """
+        self.ttls = dict(ttls)
+        self._fetch = fetch
+        self._values: dict = {}
+        self._updated: 'dict[str, float]' = {}
+        self._expiry: 'dict[str, float]' = {}
+        self._overrides: 'dict[str, float]' = {}
+        self._lock = threading.Lock()
+        self._flight: '_Flight|None' = None
+
+    def age(self, name: str) -> 'float|None':
+        """Seconds since a metric was fetched, or None if never."""
+        if name not in self._updated:
+            return None
+        return monotonic() - self._updated[name]
+
+    def invalidate(self, names: 'list[str]' = None) -> None:
+        """Marks metrics (default all) stale so the next read fetches them."""
+        with self._lock:
+            for name in self._names(names):
+                self._updated.pop(name, None)
+
+    def expire_after(self, name: str, seconds: float) -> None:
+        """Keeps the value being fetched for `seconds` instead of its ttl.
+
+        Called from the fetch function e.g. when it returns a placeholder
+        for a value the modem cannot provide yet, so that the next read
+        retries sooner than the metric's time-to-live.
+
+        """
+        with self._lock:
+            self._overrides[name] = seconds
+
+    def get(self, name: str):
+        """Gets a metric, fetching it if stale. None if unavailable."""
+        return self.refresh([name], force=False)[name]
+
+    def get_many(self, names: 'list[str]' = None) -> dict:
+        """Gets metrics (default all) with one fetch of any stale values."""
+        return self.refresh(names, force=False)
+
+    def refresh(self, names: 'list[str]' = None, force: bool = True) -> dict:
+        """Fetches metrics (default all) and returns their values.
+
+        If another thread is fetching the same metrics this waits for and
+        shares its result rather than sending another query.
+
+        Args:
+            names: The metrics to refresh, default all.
+            force: If False only fetches metrics whose time-to-live expired.
+
+        Returns:
+            The values keyed by name.
+
+        """
+        names = self._names(names)
+        pending = self._pending(names, force)
+        while pending:
+            with self._lock:
+                flight = self._flight
+                owner = flight is None
+                if owner:
+                    flight = self._flight = _Flight(threading.Event())
+            if owner:
+                values = {}
+                try:
+                    values = self._fetch(pending)
+                finally:
+                    self._land(flight, values)
+                break
+            flight.done.wait()
+            pending = [n for n in pending if n not in flight.refreshed]
+        return self._read(names)
+
+    async def get_async(self, name: str):
+        """Gets a metric using a coroutine fetch (see `get`)."""
+        return (await self.refresh_async([name], force=False))[name]
+
+    async def get_many_async(self, names: 'list[str]' = None) -> dict:
+        """Gets metrics using a coroutine fetch (see `get_many`)."""
+        return await self.refresh_async(names, force=False)
+
+    async def refresh_async(self,
+                            names: 'list[str]' = None,
+                            force: bool = True,
+                            ) -> dict:
+        """Fetches metrics using a coroutine fetch (see `refresh`)."""
+        names = self._names(names)
+        pending = self._pending(names, force)
+        while pending:
+            flight = self._flight
+            if flight is None:
+                flight = self._flight = _Flight(asyncio.Event())
+                values = {}
+                try:
+                    values = await self._fetch(pending)
+                finally:
+                    self._land(flight, values)
+                break
+            await flight.done.wait()
+            pending = [n for n in pending if n not in flight.refreshed]
+        return self._read(names)
+
+    def _names(self, names: 'list[str]|None') -> 'list[str]':
+        if names is None:
+            return list(self.ttls)
+        unknown = [n for n in names if n not in self.ttls]
+        if unknown:
+            raise ValueError(f'Unknown metrics {unknown}')
+        return list(names)
+
+    def _pending(self, names: 'list[str]', force: bool) -> 'list[str]':
+        """Returns the names to fetch."""
+        if force:
+            return names
+        now = monotonic()
+        with self._lock:
+            return [n for n in names if n not in self._updated or
+                    now - self._updated[n] >= self._ttl(n)]
+
+    def _ttl(self, name: str) -> float:
+        return self._expiry.get(name, self.ttls[name])
+
+    def _land(self, flight: _Flight, values: dict) -> None:
+        """Stores fetched values and releases readers of the flight."""
+        now = monotonic()
+        with self._lock:
+            for name, value in values.items():
+                self._values[name] = value
+                self._updated[name] = now
+                self._expiry[name] = self._overrides.get(name,
+                                                         self.ttls[name])
+            self._overrides.clear()
+            flight.refreshed = set(values)
+            self._flight = None
+        flight.done.set()
+
+    def _read(self, names: 'list[str]') -> dict:
+        with self._lock:
+            return {name: self._values.get(name) for name in names}
@@ -0,0 +1,440 @@
+"""Flow-controlled queueing of mobile-originated messages.
+
+The modem transmit queue holds only a few messages, while a device may
+accumulate hundreds of records while blocked. A `MoQueue` holds a local
+backlog in priority order and submits to the modem only when the
+transmitter is available and the modem queue has space.
+
+Message states are not polled each cycle. The modem states (`AT%MGRS`) are
+only queried when the `MESSAGE_MO_COMPLETE` event notification (`S89`) is
+asserted, or after `poll_interval` without one in case a notification was
+missed. `MESSAGE_MO_COMPLETE` should be included in the modem
+`event_notification_monitor` (`S88`).
+
+Reading `S89` clears the notifications, so only one reader may own it. If
+the application runs a `ModemEventLoop`, `attach` the queue to the loop so
+that it consumes the loop's `MessageMoComplete` events instead of reading
+`S89` in `service`.
+
+Message names are a per-queue prefix and a counter seeded from the time the
+queue is created, so that a restarted application does not reuse the names
+of messages still held by the modem.
+
+Example::
+
+    queue = MoQueue()
+    queue.enqueue(record_bytes)
+    while True:
+        queue.service(modem)
+        sleep(5)
+
+"""
+import logging
+import os
+import threading
+from collections import deque
+from time import monotonic, time
+from typing import Callable
+
+from idpmodem.aterror import AtCrcError, AtException, AtTimeout
+from idpmodem.constants import (AtErrorCode, EventNotification,
+                                MessagePriority, MessageState,
+                                TransmitterStatus)
+from idpmodem.events import MessageMoComplete, ModemEventLoop
+
+MO_QUEUE_MODEM_CAPACITY = int(os.getenv('MO_QUEUE_MODEM_CAPACITY', 10))
+MO_QUEUE_MAX_BACKLOG = int(os.getenv('MO_QUEUE_MAX_BACKLOG', 1000))
+MO_QUEUE_POLL_INTERVAL = int(os.getenv('MO_QUEUE_POLL_INTERVAL', 900))
+MO_NAME_PREFIX = 'Q'
+MO_NAME_DIGITS = 7
+FINAL_STATES = (MessageState.TX_COMPLETE,
+                MessageState.TX_FAILED,
+                MessageState.TX_CANCELLED,
+                MessageState.UNAVAILABLE)
+
+_log = logging.getLogger(__name__)
+
+
+def _error_code(detail: str) -> 'int|None':
+    """Returns the code of an error detail e.g. `NAME (106)`, or None."""
+    if detail.endswith(')') and '(' in detail:
+        code = detail[detail.rindex('(') + 1:-1]
+        if code.isdigit():
+            return int(code)
+    return None
+
+
+def _uncertain(err: AtException) -> bool:
+    """Indicates if the modem may have accepted a failed submission."""
+    return isinstance(err, (AtTimeout, AtCrcError))
+
+
+class QueuedMessage:
+    """A mobile-originated message managed by a `MoQueue`.
+
+    Attributes:
+        name (str): The unique name used in the modem transmit queue.
+        data (bytes): The payload including the SIN byte.
+        priority (MessagePriority): The transmit priority.
+        state (MessageState): The modem state, or None while in the backlog.
+        enqueued (float): The monotonic time added to the backlog.
+        submitted (float): The monotonic time submitted to the modem.
+        completed (float): The monotonic time a final state was observed.
+
+    """
+    __slots__ = ('name', 'data', 'priority', 'state',
+                 'enqueued', 'submitted', 'completed')
+
+    def __init__(self,
+                 name: str,
+                 data: bytes,
+                 priority: MessagePriority,
+                 enqueued: float) -> None:
+        self.name = name
+        self.data = data
+        self.priority = priority
+        self.state: 'MessageState|None' = None
+        self.enqueued = enqueued
+        self.submitted: 'float|None' = None
+        self.completed: 'float|None' = None
+
+    def __repr__(self) -> str:
+        state = self.state.name if self.state is not None else 'QUEUED'
+        return f'<QueuedMessage {self.name} {state}>'
+
+
+class MoQueue:
+    """A local backlog of mobile-originated messages with flow control.
+
+    Messages are submitted highest priority first, and in the order queued
+    within a priority. If the backlog is full the oldest lowest priority
+    message is dropped.
+
+    Attributes:
+        modem_capacity (int): Maximum messages pending in the modem queue.
+        max_backlog (int): Maximum messages held in the local backlog.
+        poll_interval (float): Seconds without a `MESSAGE_MO_COMPLETE`
+            notification before message states are queried anyway.
+        on_state (Callable): Optional function called with each
+            `QueuedMessage` whose state changed.
+        name_prefix (str): The first character(s) of each message name.
+        statistics (dict): Counts and latencies (seconds). `delivery` is
+            from submission to completion, `total` from enqueue.
+
+    """
+    def __init__(self,
+                 modem_capacity: int = MO_QUEUE_MODEM_CAPACITY,
+                 max_backlog: int = MO_QUEUE_MAX_BACKLOG,
+                 poll_interval: float = MO_QUEUE_POLL_INTERVAL,
+                 on_state: Callable = None,
+                 name_prefix: str = MO_NAME_PREFIX) -> None:
+        if not name_prefix or len(name_prefix) > 8 - MO_NAME_DIGITS:
+            raise ValueError('Invalid name prefix must be 1 character')
+        self.modem_capacity = modem_capacity
+        self.max_backlog = max_backlog
+        self.poll_interval = poll_interval
+        self.on_state = on_state
+        self.name_prefix = name_prefix
+        self._lock = threading.Lock()
+        self._backlog: 'dict[int, deque[QueuedMessage]]' = {
+            p: deque() for p in sorted(MessagePriority) if p != 0
+        }
+        self._inflight: 'dict[str, QueuedMessage]' = {}
+        self._sequence = int(time()) % 10**MO_NAME_DIGITS
+        self._unconfirmed: 'set[str]' = set()
+        self._attached = False
+        self._last_update = 0.0
+        self.statistics = {
+            'queued': 0,
+            'submitted': 0,
+            'completed': 0,
+            'failed': 0,
+            'dropped': 0,
+            'delivery_mean': 0.0,
+            'delivery_max': 0.0,
+            'total_mean': 0.0,
+            'total_max': 0.0,
+        }
+
+    def __len__(self) -> int:
+        """The number of messages in the backlog or in the modem queue."""
+        with self._lock:
+            return (sum(len(q) for q in self._backlog.values()) +
+                    len(self._inflight))
+
+    @property
+    def backlog(self) -> int:
+        """The number of messages waiting to be submitted to the modem."""
+        with self._lock:
+            return sum(len(q) for q in self._backlog.values())
+
+    @property
+    def inflight(self) -> 'list[QueuedMessage]':
+        """The messages submitted to the modem not yet in a final state."""
+        with self._lock:
+            return list(self._inflight.values())
+
+    def enqueue(self,
+                data: 'bytes|bytearray',
+                priority: MessagePriority = MessagePriority.LOW,
+                ) -> QueuedMessage:
+        """Adds a message to the backlog.
+
+        Args:
+            data: The payload including the SIN byte (16..255).
+            priority: 1=high, 4=low (default)
+
+        Returns:
+            The `QueuedMessage` whose state is tracked.
+
+        Raises:
+            ValueError if the SIN or priority is invalid.
+
+        """
+        if not data or data[0] < 16:
+            raise ValueError('Invalid SIN must be 16..255')
+        if priority not in self._backlog:
+            raise ValueError(f'Invalid priority {priority}')
+        with self._lock:
+            self._sequence = (self._sequence + 1) % 10**MO_NAME_DIGITS
+            name = f'{self.name_prefix}{self._sequence:0{MO_NAME_DIGITS}d}'
+            message = QueuedMessage(name, bytes(data),
+                                    MessagePriority(priority), monotonic())
+            self._backlog[priority].append(message)
+            self.statistics['queued'] += 1
+            if sum(len(q) for q in self._backlog.values()) > self.max_backlog:
+                for p in reversed(self._backlog):
+                    if self._backlog[p]:
+                        dropped = self._backlog[p].popleft()
+                        self._unconfirmed.discard(dropped.name)
+                        _log.warning(f'Backlog full - dropped {dropped.name}')
+                        self.statistics['dropped'] += 1
+                        break
+        return message
+
+    def attach(self, loop: ModemEventLoop) -> None:
+        """Consumes the message states of a `ModemEventLoop`.
+
+        The loop then owns the event notifications (`S89`) and `service`
+        no longer reads them. Message states are applied from each
+        `MessageMoComplete` event, and only queried by `service` after
+        `poll_interval` in case an event was missed.
+
+        Args:
+            loop: The `ModemEventLoop` of the modem this queue submits to.
+
+        """
+        loop.subscribe(self._on_mo_complete, MessageMoComplete)
+        self._attached = True
+
+    def _on_mo_complete(self, event: MessageMoComplete) -> None:
+        """Applies the final states of a `MessageMoComplete` event."""
+        now = monotonic()
+        for reported in event.messages:
+            with self._lock:
+                message = self._inflight.pop(reported['name'], None)
+            if message is None:
+                continue
+            message.completed = now
+            self._state_change(message, MessageState(reported['state']))
+
+    def service(self,
+                modem,
+                events: 'list[EventNotification]' = None,
+                ) -> int:
+        """Updates message states and submits messages to a threaded modem.
+
+        Args:
+            modem: A threaded `IdpModem`.
+            events: Optional active event notifications if the application
+                reads `S89` itself (reading it clears the events), otherwise
+                `S89` is read while messages are pending in the modem unless
+                the queue is attached to a `ModemEventLoop`.
+
+        Returns:
+            The number of messages submitted.
+
+        Raises:
+            AtException if an update or status query fails.
+
+        """
+        if self._inflight:
+            if events is None and not self._attached:
+                events = modem.event_notifications
+            if self._update_due(events):
+                self._update(modem.message_mo_state())
+        if not self._submit_ready():
+            return 0
+        status = modem.transmitter_status
+        if status != TransmitterStatus.OK:
+            _log.debug(f'Transmitter {status.name} - holding backlog')
+            return 0
+        submitted = 0
+        while (message := self._next()) is not None:
+            try:
+                if not (message.name in self._unconfirmed and
+                        modem.message_mo_state(message.name)):
+                    modem.message_mo_send(message.data,
+                                          name=message.name,
+                                          priority=int(message.priority))
+            except AtException as err:
+                detail = str(err)
+                if not _uncertain(err) and _error_code(detail) is None:
+                    try:
+                        detail = modem.at_error_detail(['ERROR'])
+                    except AtException as detail_err:
+                        _log.warning(f'Error detail unavailable: {detail_err}')
+                if self._rejected(message, err, _error_code(detail)):
+                    break
+                continue
+            self._submitted(message)
+            submitted += 1
+        return submitted
+
+    async def service_async(self,
+                            modem,
+                            events: 'list[EventNotification]' = None,
+                            ) -> int:
+        """Updates states and submits messages to an asyncio modem.
+
+        See `service`.
+
+        """
+        if self._inflight:
+            if events is None and not self._attached:
+                events = await modem.event_notifications_get()
+            if self._update_due(events):
+                self._update(await modem.message_mo_state())
+        if not self._submit_ready():
+            return 0
+        status = await modem.transmitter_status_get()
+        if status != TransmitterStatus.OK:
+            _log.debug(f'Transmitter {status.name} - holding backlog')
+            return 0
+        submitted = 0
+        while (message := self._next()) is not None:
+            try:
+                if not (message.name in self._unconfirmed and
+                        await modem.message_mo_state(message.name)):
+                    await modem.message_mo_send(message.data,
+                                                name=message.name,
+                                                priority=int(message.priority))
+            except AtException as err:
+                detail = str(err)
+                if not _uncertain(err) and _error_code(detail) is None:
+                    try:
+                        detail = await modem.at_error_detail(['ERROR'])
+                    except AtException as detail_err:
+                        _log.warning(f'Error detail unavailable: {detail_err}')
+                if self._rejected(message, err, _error_code(detail)):
+                    break
+                continue
+            self._submitted(message)
+            submitted += 1
+        return submitted
+
+    def _update_due(self, events: 'list[EventNotification]|None') -> bool:
+        """Indicates if the modem message states should be queried."""
+        if events and EventNotification.MESSAGE_MO_COMPLETE in events:
+            return True
+        return monotonic() - self._last_update >= self.poll_interval
+
+    def _submit_ready(self) -> bool:
+        with self._lock:
+            return (len(self._inflight) < self.modem_capacity and
+                    any(self._backlog.values()))
+
+    def _next(self) -> 'QueuedMessage|None':
+        """Removes the next message to submit if the modem has space."""
+        with self._lock:
+            if len(self._inflight) >= self.modem_capacity:
+                return None
+            for queue in self._backlog.values():
+                if queue:
+                    return queue.popleft()
+        return None
+
+    def _rejected(self,
+                  message: QueuedMessage,
+                  err: AtException,
+                  code: 'int|None') -> bool:
+        """Handles a failed submission and indicates if submitting stops.
+
+        A full modem queue returns the message to the front of the backlog,
+        while any other error code fails the message. After a timeout or
+        CRC error the modem may have accepted the message, so it is held
+        and its modem state (`AT%MGRS`) is checked before it is resubmitted.
+
+        Args:
+            message: The message that failed.
+            err: The exception raised by the submission.
+            code: The `AtErrorCode` value of the error, if known.
+
+        """
+        uncertain = _uncertain(err)
+        if uncertain or code == AtErrorCode.QUEUE_INSUFFICIENT_RESOURCES:
+            _log.warning(f'Modem queue unavailable ({err}) -'
+                         f' holding {message.name}')
+            with self._lock:
+                if uncertain:
+                    self._unconfirmed.add(message.name)
+                self._backlog[message.priority].appendleft(message)
+            return True
+        _log.error(f'Failed to submit {message.name}: {err}')
+        with self._lock:
+            self._unconfirmed.discard(message.name)
+        message.completed = monotonic()
+        self._state_change(message, MessageState.TX_FAILED)
+        return False
+
+    def _submitted(self, message: QueuedMessage) -> None:
+        message.submitted = monotonic()
+        with self._lock:
+            self._unconfirmed.discard(message.name)
+            if not self._inflight:
+                self._last_update = message.submitted
+            self._inflight[message.name] = message
+        self.statistics['submitted'] += 1
+        self._state_change(message, MessageState.TX_READY)
+
+    def _update(self, states: 'list[dict]') -> None:
+        """Applies the modem message states to the pending messages."""
+        now = monotonic()
+        self._last_update = now
+        reported = {s['name']: MessageState(s['state']) for s in states}
+        for message in self.inflight:
+            state = reported.get(message.name, MessageState.UNAVAILABLE)
+            with self._lock:
+                # may be completed meanwhile by a `MessageMoComplete` event
+                if state in FINAL_STATES:
+                    if self._inflight.pop(message.name, None) is None:
+                        continue
+                elif message.name not in self._inflight:
+                    continue
+            if state in FINAL_STATES:
+                message.completed = now
+            if state != message.state:
+                self._state_change(message, state)
+
+    def _state_change(self,
+                      message: QueuedMessage,
+                      state: MessageState) -> None:
+        _log.debug(f'{message.name} state {state.name}')
+        message.state = state
+        if state == MessageState.TX_COMPLETE:
+            stats = self.statistics
+            stats['completed'] += 1
+            count = stats['completed']
+            for key, start in (('delivery', message.submitted),
+                               ('total', message.enqueued)):
+                latency = message.completed - start
+                mean = stats[f'{key}_mean']
+                stats[f'{key}_mean'] = mean + (latency - mean) / count
+                stats[f'{key}_max'] = max(stats[f'{key}_max'], latency)
+        elif state in FINAL_STATES:
+            self.statistics['failed'] += 1
+        if self.on_state is not None:
+            try:
+                self.on_state(message)
+            except Exception as err:
+                _log.exception(f'State handler error: {err}')
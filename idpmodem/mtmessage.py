@@ -0,0 +1,140 @@
+"""Parsing of mobile-terminated message responses from raw response frames.
+
+A `%MGFG` response carries up to 10 kB of base64 payload. Rather than
+decoding the frame to a string, stripping, splitting and decoding it again,
+the header fields are located in the raw frame and the base64 data is
+decoded in chunks directly into a buffer that reserves the SIN byte at
+offset 0, so the payload is never copied whole after decoding.
+
+Draining the receive queue orders the complete messages by priority and
+combines the deletion of each consumed message with retrieval of the next
+on one command line.
+
+"""
+from binascii import a2b_base64
+
+from idpmodem.constants import DataFormat, MessagePriority, MessageState
+
+MGFG_PREFIX = b'%MGFG:'
+MGFG_HEADER_FIELDS = 7   #: name, number, priority, sin, state, length, format
+B64_CHUNK = 4096   #: Base64 characters decoded per chunk (multiple of 4)
+
+
+def mgfg_command(name: str, delete: 'list[str]' = None) -> str:
+    """Returns the command line to get a message in base64 format.
+
+    Args:
+        name: The unique name in the modem queue e.g. FM01.01
+        delete: Optional names of messages to delete before the get.
+
+    """
+    commands = [f'%MGFM="{d}"' for d in delete or []]
+    commands.append(f'%MGFG="{name}",{DataFormat.BASE64}')
+    return 'AT' + ';'.join(commands)
+
+
+def mt_drain_order(waiting: 'list[dict]',
+                   max_bytes: int = None,
+                   priority_order: bool = True,
+                   ) -> 'list[dict]':
+    """Selects the complete messages to retrieve from `message_mt_waiting`.
+
+    Messages still being received (`RX_PENDING`) are skipped. Messages of
+    equal priority keep the modem queue order, and a priority of `NONE`
+    is retrieved after `LOW`.
+
+    Args:
+        waiting: The list returned by `message_mt_waiting`.
+        max_bytes: Optional limit of the total message size. The first
+            message is always selected so the queue cannot stall.
+        priority_order: If False uses the modem queue order.
+
+    Returns:
+        The metadata of the messages to retrieve in order.
+
+    """
+    complete = [m for m in waiting
+                if m['state'] in (MessageState.RX_COMPLETE,
+                                  MessageState.RX_RETRIEVED)]
+    if priority_order:
+        complete.sort(key=lambda m: m['priority'] or MessagePriority.LOW + 1)
+    if max_bytes is None:
+        return complete
+    selected = []
+    total = 0
+    for message in complete:
+        total += message['size']
+        if selected and total > max_bytes:
+            break
+        selected.append(message)
+    return selected
+
+
+def mgfg_response_frame(frames: 'list[bytes]') -> 'bytes|None':
+    """Returns the `%MGFG` frame from a raw response, or None if absent."""
+    for frame in frames:
+        if frame.find(MGFG_PREFIX, 0, len(MGFG_PREFIX) + 4) != -1:
+            return frame
+    return None
+
+
+def mgfg_parse(frame: 'bytes|bytearray') -> 'tuple[dict, memoryview]':
+    """Parses a base64 `%MGFG` response frame without intermediate strings.
+
+    Args:
+        frame: The raw response line e.g.
+            `\\r\\n%MGFG: "FM01.01",1.0,0,255,2,3,3,AQID\\r\\n`
+
+    Returns:
+        A tuple with the message metadata dictionary (`name`,
+            `system_message_number`, `system_message_sequence`, `priority`,
+            `sin`, `state`, `state_name`, `size`) and a memoryview of the
+            payload including the SIN byte.
+
+    Raises:
+        ValueError if the frame is not a base64 `%MGFG` response.
+
+    """
+    start = frame.find(MGFG_PREFIX)
+    if start == -1:
+        raise ValueError('Missing %MGFG response')
+    position = start + len(MGFG_PREFIX)
+    header = []
+    for _ in range(MGFG_HEADER_FIELDS):
+        comma = frame.find(b',', position)
+        if comma == -1:
+            raise ValueError('Incomplete %MGFG header')
+        header.append(frame[position:comma])
+        position = comma + 1
+    if int(header[6]) != DataFormat.BASE64:
+        raise ValueError(f'Unsupported data format {int(header[6])}')
+    end = len(frame)
+    while end > position and frame[end - 1] in b'\r\n ':
+        end -= 1
+    sys_msg_num, sys_msg_seq = header[1].split(b'.')
+    sin = int(header[3])
+    state = int(header[4])
+    meta = {
+        'name': header[0].strip().strip(b'"').decode('ascii'),
+        'system_message_number': int(sys_msg_num),
+        'system_message_sequence': int(sys_msg_seq),
+        'priority': int(header[2]),
+        'sin': sin,
+        'state': state,
+        'state_name': MessageState(state).name,
+        'size': int(header[5]),
+    }
+    encoded = memoryview(frame)[position:end]
+    padding = 0
+    if end - position >= 2:
+        padding = (frame[end - 1] == 0x3D) + (frame[end - 2] == 0x3D)
+    payload = bytearray(1 + len(encoded) // 4 * 3 - padding)
+    payload[0] = sin
+    offset = 1
+    for i in range(0, len(encoded), B64_CHUNK):
+        chunk = a2b_base64(encoded[i:i + B64_CHUNK])
+        payload[offset:offset + len(chunk)] = chunk
+        offset += len(chunk)
+    if offset != len(payload):
+        raise ValueError('Invalid base64 length in %MGFG response')
+    return meta, memoryview(payload)
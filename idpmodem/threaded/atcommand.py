@@ -10,18 +10,21 @@ import logging
 import os
 import queue
 import threading
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeout
 from time import sleep, time
 from typing import Callable
 
 from idpmodem.aterror import AtCrcError, AtTimeout
-from idpmodem.crcxmodem import apply_crc, validate_crc
+from idpmodem.atframer import AtFrame, AtFramer, AtFrameType
+from idpmodem.crcxmodem import apply_crc
 from idpmodem.helpers import printable_crlf
 from serial import Serial, SerialException
 from serial.threaded import LineReader, Protocol, ReaderThread
 
-BUFFER_CLEAR_WAIT = float(os.getenv('BUFFER_CLEAR_WAIT', 0.1))
 BYTE_READER_WAIT = float(os.getenv('BYTE_READER_WAIT', 0.001))
-SERIAL_QUEUE_WAIT = float(os.getenv('SERIAL_QUEUE_WAIT', 0.1))
+CRC_ERROR_WAIT = float(os.getenv('CRC_ERROR_WAIT', 0.1))
+CHUNKED_READ = str(os.getenv('CHUNKED_READ', True)).lower() == 'true'
 VERBOSE_DEBUG = str(os.getenv('VERBOSE_DEBUG', False)).lower() == 'true'
 
 
@@ -31,8 +34,10 @@ _log = logging.getLogger(__name__)
 class AtProtocol(LineReader):
     """Threaded protocol factory for the IDP Modem.
     
-    Maintains queues for requests, responses and unsolicited reports using
-    task objects with callbacks.
+    Each command gets a future that the reader thread resolves as soon as
+    the final result code (or CRC) is framed, so the calling thread blocks
+    without polling. Unsolicited reports are queued to a separate thread
+    with callbacks.
 
     Accepts only one AT command at a time.  Handles command echo 
     terminated with <cr>, verbose response framed with <cr><lf>, 
@@ -42,8 +47,8 @@ class AtProtocol(LineReader):
         alive (bool): True while the factory is running.
         crc (bool): Indicates if CRC error checking is enabled.
         pending_command (str): The AT command being processed.
-        responses (Queue): Queued responses to be processed as a line.
-        unsolicited (Queue): Unexpected data received if no pending command.
+        framer (AtFramer): Splits received bytes into lines.
+        events (Queue): Unexpected data received if no pending command.
         event_callback (Callable): optional callback function for 
         unexpected data
     """
@@ -66,13 +71,17 @@ class AtProtocol(LineReader):
         super().__init__()
         # self.buffer = bytearray()   #: inherited from LineReader/Packetizer
         # self.transport = None   #: inherited from LineReader/Packetizer
+        self.framer = AtFramer()
+        self._framer_lock = threading.RLock()
+        self._pending_command = None
+        self._response: Future = None
+        self._response_frames: 'list[bytes]' = []
+        self._crc_wait_until = 0
         self.crc = False   #: This will be inferred from communications
         self.alive = True
         self.at_timeout = at_timeout
-        self.pending_command = None
         self.command_time = None
         self.response_time = None
-        self.responses = queue.Queue()
         self.events = queue.Queue()
         self._event_thread = threading.Thread(target=self._run_event,
                                               name='at_unsolicited',
@@ -81,6 +90,17 @@ class AtProtocol(LineReader):
         self._lock = threading.Lock()
         self.event_callback = event_callback
 
+    @property
+    def pending_command(self) -> 'str|None':
+        """The AT command awaiting a response, if any."""
+        return self._pending_command
+
+    @pending_command.setter
+    def pending_command(self, command: 'str|None'):
+        with self._framer_lock:
+            self._pending_command = command
+            self.framer.expect(command)
+
     # def connection_made(self, transport):
     #     """Store transport - inherited from LineReader/Packetizer."""
     #     self.transport = transport
@@ -94,52 +114,100 @@ class AtProtocol(LineReader):
     def data_received(self, data: bytearray):
         """Buffer received data and create packets for handlers.
 
-        handle_packet() is inherited from LineReader.
+        Accepts any number of bytes so it may be fed one byte at a time or
+        whole chunks read from the serial port, framed by `AtFramer`.
+        Response frames complete the pending command, anything else is
+        passed to handle_packet() (inherited from LineReader).
 
         Args:
-            data: a data byte received from the serial device
+            data: data bytes received from the serial device
 
         """
-        self.buffer.extend(data)
-        if self.pending_command is not None:
-            if data == b'\r':
-                #: Echo case
-                if self.buffer == self.pending_command.encode() + b'\r':
-                    echo = self.buffer
-                    #: reset buffer for response
-                    self.buffer = bytearray(b'')
-                    self.handle_packet(echo)
-            elif data == b'\n':
-                if (self.buffer != bytearray(b'\r\n')
-                    and self.buffer != bytearray(b'\n')):
-                    #: Framed/multiline response, error code or CRC
-                    packet = self.buffer
-                    self.buffer = bytearray(b'')
-                    self.handle_packet(packet)
-                elif self.buffer == bytearray(b'\n'):
-                    #: (Unexpected) drop any empty lines
-                    self.buffer = bytearray(b'')
-        else:   # no pending command
-            if data == b'\n':
-                unsolicited = self.buffer
-                self.buffer = bytearray(b'')
-                self.handle_packet(unsolicited)
+        with self._framer_lock:
+            frames = self.framer.feed(data)
+        for frame in frames:
+            if (frame.frame_type == AtFrameType.UNSOLICITED or
+                not self._handle_response(frame)):
+                self.handle_packet(frame.data)
 
     # def handle_packet(self, packet: bytearray):
     #     """Decodes packet(s) - inherited from LineReader."""
     #     self.handle_line(packet.decode(self.ENCODING, self.UNICODE_HANDLING))
 
+    def _handle_response(self, frame: AtFrame) -> bool:
+        """Adds a frame to the pending response and completes it when done.
+
+        Args:
+            frame: A non-unsolicited frame from the framer.
+
+        Returns:
+            False if no command was waiting for the frame.
+
+        """
+        future = self._response
+        if future is None:
+            if frame.frame_type == AtFrameType.CRC:
+                if not self.crc:
+                    _log.debug('Now using CRC detected after response')
+                    self.crc = True
+                return True
+            return False
+        if frame.frame_type == AtFrameType.ECHO:
+            if VERBOSE_DEBUG:
+                _log.debug('Echo detected - continuing')
+            return True
+        if self.response_time is None:
+            self.response_time = time()
+            if VERBOSE_DEBUG:
+                _log.debug(f'Response received starting {self.response_time}')
+        if frame.frame_type == AtFrameType.CRC:
+            if not self.crc:
+                _log.debug('Now using CRC detected in response')
+                self.crc = True
+            if not frame.crc_valid:
+                self._complete(AtCrcError(f'INVALID_CRC_RESPONSE'))
+            else:
+                self._complete()
+            return True
+        if VERBOSE_DEBUG:
+            line = frame.data.decode(self.ENCODING, self.UNICODE_HANDLING)
+            _log.debug(f'Read: {printable_crlf(line)}')
+        self._response_frames.append(frame.data)
+        if frame.frame_type == AtFrameType.RESULT:
+            if frame.content == b'OK':
+                command = self.pending_command
+                if self.crc and '%CRC=0' in command:
+                    _log.debug('CRC disabled by command')
+                    self.crc = False
+                elif not self.crc and '%CRC=1' in command:
+                    _log.debug('CRC enabled for next command')
+                    self.crc = True
+                if not self.crc:
+                    self._complete()
+            elif not self.crc:   #: ERROR may still be followed by CRC
+                self._crc_wait_until = time() + CRC_ERROR_WAIT
+                self._complete()
+        return True
+
+    def _complete(self, exc: Exception = None):
+        """Resolves the pending command future with the response or error."""
+        future = self._response
+        self._response = None
+        if future is None or future.done():
+            return
+        if exc is not None:
+            future.set_exception(exc)
+        else:
+            future.set_result(self._response_frames)
+
     def handle_line(self, line: str):
-        """Enqueues lines for parsing by command handler.
+        """Enqueues unsolicited lines for the event handler.
 
         Args:
             line: The unicode string received from the serial port.
         """
-        if self.pending_command is not None:
-            self.responses.put(line)
-        else:
-            if line != '\n':
-                self.events.put(line)
+        if line != '\n':
+            self.events.put(line)
 
     def write_line(self, text):
         """Appends a terminator, encodes and writes text to the transport."""
@@ -155,7 +223,7 @@ class AtProtocol(LineReader):
         """Stop the event processing thread and abort pending commands."""
         self.alive = False
         self.events.put(None)
-        self.responses.put('<exit>')
+        self._complete(ConnectionError('AT protocol stopped'))
 
     def _run_event(self):
         """Process events (unsolicited messages) in a separate thread.
@@ -223,7 +291,8 @@ class AtProtocol(LineReader):
                 command: str,
                 filter: 'list[str]' = [],
                 timeout: int = 5,
-                ) -> 'list[str]':
+                raw: bool = False,
+                ) -> 'list[str]|list[bytes]':
         """Send an AT command and wait for the response.
 
         Returns the response as a list.  If an error response code was
@@ -235,6 +304,8 @@ class AtProtocol(LineReader):
             command: The AT command
             filter: Optional list of strings/substrings to filter from response.
             timeout: Time to wait for response in seconds (default 5)
+            raw: If True returns the received response frames as bytes
+                without decoding, stripping or filtering.
         
         Returns:
             A list of strings. The list will be ['ERROR'] in case of a problem.
@@ -245,86 +316,60 @@ class AtProtocol(LineReader):
 
         """
         with self._lock:  # ensure that just one thread is sending commands at once
-            try:
-                oldbuffer: str = self.responses.get(timeout=BUFFER_CLEAR_WAIT)
-                oldbuffer = oldbuffer.replace('\r', '\\r').replace('\n', '\\n')
-                _log.warning(f'Cleared old buffer: {oldbuffer}')
-            except queue.Empty:
+            crc_wait = self._crc_wait_until - time()
+            if crc_wait > 0:
                 if VERBOSE_DEBUG:
-                    _log.debug('Buffer clear - ready to transmit command')
-                pass
+                    _log.debug(f'Waiting {crc_wait:.3f}s for possible CRC')
+                sleep(crc_wait)
             timeout = 1 if timeout < 1 else timeout
             command = apply_crc(command) if self.crc else command
-            self.pending_command = command
+            with self._framer_lock:
+                stale = self.framer.clear()
+                if stale:
+                    stale = stale.decode(self.ENCODING, self.UNICODE_HANDLING)
+                    _log.warning(f'Cleared old buffer: {printable_crlf(stale)}')
+                self.pending_command = command
+            future = Future()
+            self._response_frames = []
+            self._response = future
             self.response_time = None
             self.command_time = time()
             if VERBOSE_DEBUG:
                 _log.debug(f'Sending {command} at {self.command_time}')
-            self.write_line(command)
-            lines = []
-            while self.pending_command is not None:
-                try:
-                    line: str = self.responses.get(timeout=timeout)
-                    content = line.strip()
-                    if VERBOSE_DEBUG:
-                        _log.debug(f'Read: {printable_crlf(line)}')
-                    if self.response_time is None:
-                        self.response_time = time()
-                        if VERBOSE_DEBUG:
-                            _log.debug('Response received starting'
-                                       f' {self.response_time}')
-                    if content == command:
-                        if VERBOSE_DEBUG:
-                            _log.debug('Echo detected - continuing')
-                        pass   # ignore echo
-                    elif content in ['OK', 'ERROR']:
-                        lines.append(line)
-                        if content == 'OK':
-                            if self.crc and '%CRC=0' in self.pending_command:
-                                _log.debug('CRC disabled by command')
-                                self.crc = False
-                            elif (not self.crc and
-                                  '%CRC=1' in self.pending_command):
-                                _log.debug('CRC enabled for next command')
-                                self.crc = True
-                            if not self.crc:
-                                return self._clean_response(lines, filter)
-                        else:   #: content == 'ERROR'
-                            timeout += 0.1
-                            if VERBOSE_DEBUG:
-                                _log.debug(f'Wait after ERROR for possible CRC')
-                    elif content.startswith('*'):
-                        if not self.crc:
-                            _log.debug('Now using CRC detected in response')
-                            self.crc = True
-                        crc = content.replace('*', '')
-                        if not validate_crc(''.join(lines), crc):
-                            raise AtCrcError(f'INVALID_CRC_RESPONSE')
-                        return self._clean_response(lines, filter)
-                    else:   #: including 'ERROR'
-                        lines.append(line)
-                        # keep parsing in case CRC follows
-                except queue.Empty:
-                    if time() - self.command_time >= timeout:
-                        raise AtTimeout(f'TIMEOUT ({int(timeout)}s)')
-                    if VERBOSE_DEBUG:
-                        _log.debug(f'Serial queue empty - retry until timeout')
-                    sleep(SERIAL_QUEUE_WAIT)
+            try:
+                self.write_line(command)
+                frames = future.result(timeout=timeout)
+                if raw:
+                    return frames
+                lines = [frame.decode(self.ENCODING, self.UNICODE_HANDLING)
+                         for frame in frames]
+                return self._clean_response(lines, filter)
+            except FutureTimeout:
+                raise AtTimeout(f'TIMEOUT ({int(timeout)}s)')
+            finally:
+                self._response = None
+                if self._crc_wait_until < time():
+                    self.pending_command = None
 
 
 class ByteReaderThread(ReaderThread):
-    """Modifies the ReaderThread class to process bytes individually.
+    """Modifies the ReaderThread class to read in chunks or individual bytes.
     
-    This is required due to complexities of optional checksum use 
-    for long serial lines.
+    By default blocks on the serial port and passes whatever is available to
+    the protocol, which frames the stream incrementally.
+    The legacy byte-by-byte polling loop remains available with
+    `chunked=False` (or environment variable `CHUNKED_READ=false`) as a
+    fallback for serial drivers that misbehave with blocking reads.
 
     """
     def __init__(self,
                  serial_instance: Serial,
                  protocol_factory: Protocol,
+                 chunked: bool = CHUNKED_READ,
                  **kwargs):
         super().__init__(serial_instance, protocol_factory)
         self.name = None
+        self.chunked = chunked
         self.kwargs = kwargs
 
     def run(self):
@@ -345,11 +390,16 @@ class ByteReaderThread(ReaderThread):
         data = bytearray()
         while self.alive and self.serial.is_open:
             try:
-                # read all that is there or wait for one byte (blocking)
-                if self.serial.in_waiting > 0:
-                    data = self.serial.read()
-                    self.protocol.data_received(data)
-                sleep(BYTE_READER_WAIT)
+                if self.chunked:
+                    # read all that is there or wait for one byte (blocking)
+                    data = self.serial.read(self.serial.in_waiting or 1)
+                    if data:
+                        self.protocol.data_received(data)
+                else:
+                    if self.serial.in_waiting > 0:
+                        data = self.serial.read()
+                        self.protocol.data_received(data)
+                    sleep(BYTE_READER_WAIT)
             except SerialException as err:
                 # probably some I/O problem such as disconnected USB serial
                 # adapters -> exit
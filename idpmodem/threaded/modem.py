@@ -1,27 +1,35 @@
 """A threaded IDP modem client with abstracted properties."""
 import logging
 import os
-import queue
-from base64 import b64decode, b64encode
+from base64 import b64encode
+from binascii import b2a_base64
 from datetime import datetime, timezone
 from math import ceil
 from time import time
 
+from idpmodem.atbatch import AtBatch
 from idpmodem.aterror import AtCrcError, AtException, AtGnssTimeout, AtTimeout
+from idpmodem.commandgate import CommandGate
 from idpmodem.constants import (EVENT_TRACES, AtErrorCode, BeamSearchState,
-                                DataFormat, EventNotification, GeoBeam,
-                                GnssMode, MessagePriority, MessageState,
-                                PowerMode, SatlliteControlState,
-                                SignalLevelRegional, SignalQuality,
-                                TransmitterStatus, WakeupPeriod)
+                                DataFormat, EventNotification, GnssMode,
+                                MessagePriority, MessageState, PowerMode,
+                                SatlliteControlState, SignalLevelRegional,
+                                SignalQuality, TransmitterStatus,
+                                WakeupPeriod)
 from idpmodem.helpers import printable_crlf
 from idpmodem.location import Location, location_from_nmea
+from idpmodem.metrics import (SAT_STATUS_TRACES, SAT_STATUS_TTL,
+                              SAT_STATUS_TTLS, MetricsCache, geo_beam_name,
+                              geo_beam_satellite, satellite_status,
+                              trace_groups)
+from idpmodem.mtmessage import (mgfg_command, mgfg_parse,
+                               mgfg_response_frame, mt_drain_order)
 from idpmodem.s_registers import SRegisters
-from idpmodem.threaded.atcommand import AtProtocol, ByteReaderThread, Serial
+from idpmodem.threaded.atcommand import (CHUNKED_READ, AtProtocol,
+                                        ByteReaderThread, Serial)
 
 GNSS_STALE_SECS = int(os.getenv('GNSS_STALE_SECS', 1))
 GNSS_WAIT_SECS = int(os.getenv('GNSS_WAIT_SECS', 35))
-SAT_STATUS_HOLDOFF = 5
 MODEM_REBOOT_HOLDOFF = os.getenv('MODEM_REBOOT_HOLDOFF')
 VERBOSE_DEBUG = str(os.getenv('VERBOSE_DEBUG', False)).lower() == 'true'
 
@@ -56,6 +64,9 @@ class IdpModem:
         connected (bool): Indicates if connected to a modem on serial.
         baudrate (int): The baudrate of the modem.
         crc (bool): Indicates if CRC error checking is enabled.
+        error_detail (bool|str): If True the error code (`S80`) is queried
+            after any `ERROR` and appended to the response. If `'lazy'` it is
+            queried only when read using `at_error_detail`.
         mobile_id (str): The unique modem ID.
         versions (dict): The versions reported by the modem.
         manufacturer (str): The modem manufacturer.
@@ -75,7 +86,7 @@ class IdpModem:
     SERIAL_KWARGS = ['baudrate', 'timeout', 'write_timeout']
     BAUD_RATES = [1200, 2400, 4800, 9600, 19200]
     PROTOCOL_KWARGS = ['event_callback', 'at_timeout']
-    OTHER_KWARGS = ['error_detail', 'stale_secs', 'wait_secs']
+    OTHER_KWARGS = ['error_detail', 'stale_secs', 'wait_secs', 'chunked_read']
     
     def __init__(self, serial_port: str, **kwargs):
         self.serial_kwargs = {
@@ -83,7 +94,10 @@ class IdpModem:
             'baudrate': int(kwargs.pop('baudrate', 9600)),
         }
         self.protocol_kwargs = {}
-        self.error_detail = bool(kwargs.pop('error_detail', True))
+        error_detail = kwargs.pop('error_detail', True)
+        self.error_detail = ('lazy' if str(error_detail).lower() == 'lazy'
+                             else bool(error_detail))
+        self.chunked_read = bool(kwargs.pop('chunked_read', CHUNKED_READ))
         for kwarg in kwargs:
             if kwarg in self.SERIAL_KWARGS:
                 self.serial_kwargs[kwarg] = kwargs[kwarg]
@@ -97,7 +111,7 @@ class IdpModem:
             self._reboot_holdoff = int(MODEM_REBOOT_HOLDOFF)
         except:
             self._reboot_holdoff = None
-        self.commands = queue.Queue(1)
+        self.commands = CommandGate()
         self._at_config = AtConfiguration()
         self._mobile_id: str = None
         self._versions: dict = None
@@ -105,23 +119,21 @@ class IdpModem:
         self._model: str = None
         self._power_mode: int = None
         self._wakeup_period: int = None
-        self._ctrl_state: int = None
-        self._snr: float = None
-        self._geo_beam_id: int = None
-        self._beamsearch_state: int = None
         self._loc_query: dict = {
             'stale_secs': int(kwargs.pop('stale_secs', GNSS_STALE_SECS)),
             'wait_secs': int(kwargs.pop('wait_secs', GNSS_WAIT_SECS)),
         }
-        self._holdoffs: dict = {}   # used to ignore frequent repeat commands
         self._statistics: dict = {}
         self.s_registers = SRegisters()
+        self.satellite_metrics = MetricsCache(SAT_STATUS_TTLS,
+                                              self._satellite_status_fetch)
     
     def connect(self):
         """Connects to a modem using a serial and protocol instance."""
         self.serial_port = Serial(**self.serial_kwargs)
         self.main_thread = ByteReaderThread(self.serial_port,
                                             AtProtocol,
+                                            chunked=self.chunked_read,
                                             **self.protocol_kwargs)
         self.main_thread.start()
         self.transport, self.protocol = self.main_thread.connect()
@@ -133,8 +145,7 @@ class IdpModem:
 
     def disconnect(self):
         """Disconnects from the modem."""
-        with self.commands.mutex:
-            self.commands.queue.clear()
+        self.commands.cancel()
         if self.main_thread:
             self.main_thread.close()
         if self.serial_port:
@@ -191,16 +202,20 @@ class IdpModem:
             if any(indicator in data for indicator in BOOT_INDICATORS):
                 _log.warning('Reboot indicator found - holding off commands'
                             f' {self._reboot_holdoff}s')
-                self._holdoffs['reboot'] = int(time())
+                self.commands.hold_off(self._reboot_holdoff)
 
     def atcommand(self,
                   command: str,
                   filter: 'list[str]' = [],
                   timeout: int = 5,
                   await_previous: bool = True,
-                  ) -> 'list[str]':
+                  await_timeout: float = None,
+                  raw: bool = False,
+                  ) -> 'list[str]|list[bytes]':
         """Sends an AT command to the modem and returns the response.
         
+        Commands from multiple threads are sent in the order submitted.
+        
         Args:
             command: The AT command
             filter: (optional) list of sub/strings to remove from response.
@@ -208,53 +223,112 @@ class IdpModem:
                 (not including messages queued by other threads)
             await_previous: If True, this will block if a prior command was
                 submitted by another thread
+            await_timeout: (optional) Maximum seconds to wait for prior
+                commands or a reboot holdoff (default waits indefinitely)
+            raw: If True returns the response frames as bytes without
+                decoding or filtering, and without error detail.
         
         Returns:
             list of filtered and stripped response(s) to the command(s)
         
         Raises:
-            ModemBusy if await_previous is False and a prior command is queued.
+            ModemBusy if a prior command is queued and await_previous is False
+                or await_timeout expires.
+            ConnectionError if disconnected while waiting.
             AtException if an error occurred that is unrecognized.
 
         """
         if not self.transport or not self.protocol:
             raise ConnectionError('No serial or protocol instance.')
-        while self.commands.full():
-            if not await_previous:
-                raise ModemBusy
-            pass
-        if 'reboot' in self._holdoffs and isinstance(self._reboot_holdoff, int):
-            while int(time()) - self._holdoffs['reboot'] < self._reboot_holdoff:
-                pass
-        self.commands.put(command)
+        if not self.commands.acquire(blocking=await_previous,
+                                     timeout=await_timeout):
+            if not self.transport or not self.protocol:
+                raise ConnectionError('Disconnected awaiting prior command')
+            raise ModemBusy
         try:
             res: list = self.protocol.command(command,
                                               filter=filter,
-                                              timeout=timeout)
+                                              timeout=timeout,
+                                              raw=raw)
             if VERBOSE_DEBUG:
                 _log.debug(f'Response: {res}')
-            if self.error_detail and res and res[0] == 'ERROR':
+            if (self.error_detail is True and not raw and res and
+                res[0] == 'ERROR'):
                 _log.debug(f'Querying error code response to {command}')
-                err_res = self.protocol.command('ATS80?')
-                if not err_res or err_res[0] == 'ERROR':
-                    raise AtException('Unhandled error getting last error code'
-                                      f' ({err_res})')
-                last_err_code = err_res[0]
-                detail = 'UNDEFINED'
-                if AtErrorCode.is_valid(int(last_err_code)):
-                    detail = AtErrorCode(int(last_err_code)).name
-                res.append(f'{detail} ({last_err_code})')
+                detail = self._error_code_query()
+                res.append(detail)
                 _log.warning(f'AT error: {detail} for command {command}')
             return res
         except AtException as err:
             _log.error(f'{err} on command {command}')
             raise err
         finally:
-            self.commands.get()
-            self.commands.task_done()
+            self.commands.release()
     
+    def _error_code_query(self) -> str:
+        """Queries the last error code (`S80`) and returns its description."""
+        err_res = self.protocol.command('ATS80?')
+        if not err_res or err_res[0] == 'ERROR':
+            raise AtException('Unhandled error getting last error code'
+                              f' ({err_res})')
+        last_err_code = err_res[0]
+        detail = 'UNDEFINED'
+        if AtErrorCode.is_valid(int(last_err_code)):
+            detail = AtErrorCode(int(last_err_code)).name
+        return f'{detail} ({last_err_code})'
+
+    def at_error_detail(self, response: 'list[str]') -> str:
+        """Gets the error detail of an `ERROR` response.
+
+        If the detail was not already queried (`error_detail='lazy'`) the
+        last error code is queried now and appended to the response.
+        The modem only holds the most recent error code, so this should be
+        called before sending another command that may fail.
+
+        Args:
+            response: The response list returned by `atcommand`.
+
+        Returns:
+            The error name and code e.g. `NO_MESSAGES (109)`
+
+        Raises:
+            ValueError if the response is not an error.
+
+        """
+        if not response or response[0] != 'ERROR':
+            raise ValueError('Response is not an error')
+        if len(response) > 1:
+            return response[1]
+        if not self.commands.acquire():
+            raise ConnectionError('Disconnected awaiting prior command')
+        try:
+            detail = self._error_code_query()
+        finally:
+            self.commands.release()
+        response.append(detail)
+        return detail
+
+    def batch(self) -> AtBatch:
+        """Returns a builder to combine S-register operations.
+
+        Queries, settings and trace captures added to the batch are sent in
+        as few command lines as possible by `AtBatch.execute()`.
+
+        Example::
+
+            batch = modem.batch()
+            mode = batch.query('S39')
+            temperature = batch.query('S85')
+            results = batch.execute()
+            print(results[mode], results[temperature])
+
+        """
+        return AtBatch(self.atcommand)
+
     def _handle_at_error(self, response: 'list[str]') -> None:
-        err = response[1] if self.error_detail else response[0]
+        err = response[0]
+        if self.error_detail:
+            err = self.at_error_detail(response)
         _log.error(f'AT Error: {err}')
         raise AtException(err)
 
@@ -349,18 +423,13 @@ class IdpModem:
             'S57',   #: GNSS Jamming Indicator
         ]
         _log.debug(f'Querying volatile S-register set: {register_list}')
-        command = 'AT'
+        batch = self.batch()
         for reg in register_list:
-            command += f'{reg if command == "AT" else " " + reg}?'
-        response = self.atcommand(command)
-        if response[0] == 'ERROR':
+            batch.query(reg)
+        results = batch.execute()
+        if batch.errors:
             return None
-        #: else
-        response.remove('OK')
-        volatile_regs = {}
-        for r in range(len(response)):
-            volatile_regs[register_list[r]] = int(response[r])
-        return volatile_regs
+        return dict(zip(register_list, results))
 
     def config_nvm_save(self) -> bool:
         """Sends the AT&W command and returns True if successful."""
@@ -576,8 +645,9 @@ class IdpModem:
                                         filter=['%GPS:'])
         if response[0] == 'ERROR':
             if self.error_detail:
-                if 'TIMEOUT' in response[1]:
-                    raise AtGnssTimeout(response[1])
+                detail = self.at_error_detail(response)
+                if 'TIMEOUT' in detail:
+                    raise AtGnssTimeout(detail)
             self._handle_at_error(response)
         response.remove('OK')
         time_to_fix = round(time() - request_time, 3)
@@ -816,6 +886,17 @@ class IdpModem:
         """
         if not meta and data_format != DataFormat.BASE64:
             data_format = DataFormat.BASE64
+        if data_format == DataFormat.BASE64:
+            try:
+                detail, payload = self.message_mt_get_buffer(name, timeout)
+            except ValueError as err:
+                _log.exception(err)
+                return None
+            if not meta:
+                return bytes(payload)
+            detail['data_format'] = data_format
+            detail['data'] = b2a_base64(payload, newline=False).decode('ascii')
+            return detail
         max_timeout = timeout or ceil(10000 / (self.baudrate / 8)) * 3
         _log.debug(f'Retrieving waiting MT message {name}')
         response = self.atcommand(f'AT%MGFG="{name}",{data_format}',
@@ -832,12 +913,6 @@ class IdpModem:
             data_str_no_sin = detail[7]
             if data_format == DataFormat.HEX:
                 data = hex(msg_sin) + data_str_no_sin.lower()
-            elif data_format == DataFormat.BASE64:
-                # add SIN byte to base64 blob
-                databytes = bytes([msg_sin]) + b64decode(data_str_no_sin)
-                if not meta:
-                    return databytes
-                data = b64encode(databytes).decode('ascii')
             elif data_format == DataFormat.TEXT:
                 data = f'\\{msg_sin:02x}' + data_str_no_sin
             return {
@@ -855,6 +930,139 @@ class IdpModem:
         except Exception as err:
             _log.exception(err)
 
+    def message_mt_get_buffer(self,
+                             name: str,
+                             timeout: int = None,
+                             ) -> 'tuple[dict, memoryview]':
+        """Gets a mobile-terminated message payload without extra copies.
+
+        The base64 `%MGFG` response frame is parsed in place and decoded
+        into a buffer with the SIN byte at offset 0.
+
+        Args:
+            name: The unique name in the modem queue e.g. FM01.01
+            timeout: Optional timeout. If not specified, will be calculated
+                based on the baudrate for the maximum message size, *3
+
+        Returns:
+            A tuple with the message metadata (as `message_mt_get` with
+                `meta=True`, without `data_format` or `data`) and a
+                memoryview of the payload including the SIN byte.
+
+        Raises:
+            AtException if the modem returned an error.
+
+        """
+        max_timeout = timeout or ceil(10000 / (self.baudrate / 8)) * 3
+        _log.debug(f'Retrieving waiting MT message {name}')
+        frames = self.atcommand(mgfg_command(name),
+                                timeout=max_timeout,
+                                raw=True)
+        frame = mgfg_response_frame(frames)
+        if frame is None:
+            _log.error(f'Error retrieving message {name}')
+            response = [line for line in (f.decode('ascii', 'replace').strip()
+                                          for f in frames) if line]
+            self._handle_at_error(response or ['ERROR'])
+        return mgfg_parse(frame)
+
+    def message_mt_drain(self,
+                         max_bytes: int = None,
+                         priority_order: bool = True,
+                         timeout: int = None,
+                         delete_on_close: bool = True,
+                         ) -> 'Iterator[tuple[dict, memoryview]]':
+        """Retrieves and deletes the complete mobile-terminated messages.
+
+        The receive queue is queried once, then each message is retrieved in
+        priority order (see `message_mt_waiting`) skipping any still
+        `RX_PENDING`. A yielded message is deleted on the same command line
+        as retrieval of the next message, or when the generator finishes.
+
+        Delivery is at-most-once: by default the last yielded message is
+        also deleted when the generator is closed early, whether by `break`
+        or by garbage collection after an exception in the loop body. Use
+        `delete_on_close=False` to leave it in the receive queue instead,
+        to be retrieved again.
+
+        Example::
+
+            for meta, payload in modem.message_mt_drain():
+                decode(payload)
+
+        Args:
+            max_bytes: Optional limit of the total size retrieved. At least
+                one message is retrieved if any are complete.
+            priority_order: If False retrieves in modem queue order.
+            timeout: Optional timeout per message (see `message_mt_get`).
+            delete_on_close: If False the last yielded message is not deleted
+                when the generator is closed before it finishes.
+
+        Yields:
+            Tuples of metadata and payload as `message_mt_get_buffer`.
+
+        """
+        waiting = self.message_mt_waiting()
+        pending = [m['name'] for m in waiting
+                   if m['state'] == MessageState.RX_PENDING]
+        if pending:
+            _log.debug(f'Skipping MT messages still receiving: {pending}')
+        consumed = None
+        try:
+            for message in mt_drain_order(waiting, max_bytes, priority_order):
+                name = message['name']
+                try:
+                    frame = None
+                    if consumed is not None:
+                        frame = self._message_mt_get_deleting(
+                            name, consumed, timeout)
+                        if frame is None:
+                            self.message_mt_delete(consumed)
+                        consumed = None
+                    if frame is None:
+                        result = self.message_mt_get_buffer(name, timeout)
+                    else:
+                        result = mgfg_parse(frame)
+                except (AtException, ValueError) as err:
+                    _log.warning(f'Skipping MT message {name}: {err}')
+                    if consumed is not None:
+                        delete, consumed = consumed, None
+                        self.message_mt_delete(delete)
+                    continue
+                consumed = name
+                yield result
+        except GeneratorExit:
+            if not delete_on_close:
+                consumed = None
+            raise
+        finally:
+            if consumed is not None:
+                self.message_mt_delete(consumed)
+
+    def _message_mt_get_deleting(self,
+                                 name: str,
+                                 delete: str,
+                                 timeout: int = None,
+                                 ) -> 'bytes|None':
+        """Deletes a message and gets another on the same command line.
+
+        Returns:
+            The `%MGFG` response frame, or None if the line returned an
+                error, which aborts the rest of the line so the deletion may
+                not have completed.
+
+        Raises:
+            AtException if no response was received, in which case the
+                deletion may not have completed.
+
+        """
+        max_timeout = timeout or ceil(10000 / (self.baudrate / 8)) * 3
+        _log.debug(f'Deleting MT message {delete} and retrieving {name}')
+        frames = self.atcommand(mgfg_command(name, [delete]),
+                                timeout=max_timeout,
+                                raw=True)
+        return mgfg_response_frame(frames)
+
     def message_mt_delete(self, name: str) -> bool:
         """Marks a Return message for deletion by the modem.
         
@@ -868,7 +1076,8 @@ class IdpModem:
         _log.debug(f'Attempting to delete MT message {name}')
         response = self.atcommand(f'AT%MGFM="{name}"')
         if response[0] == 'ERROR':
-            err = f' ({response[1]})' if self.error_detail else ''
+            err = (f' ({self.at_error_detail(response)})'
+                   if self.error_detail else '')
             _log.error(f'Error deleting message {name}{err}')
         return response[0] == 'OK'
 
@@ -1066,17 +1275,16 @@ class IdpModem:
         
         Trace Class 3, Subclass 1, Data 22
         """
-        self._satellite_status_get()
-        if self._ctrl_state is not None:
-            return SatlliteControlState(self._ctrl_state)
+        ctrl_state = self.satellite_metrics.get('control_state')
+        if ctrl_state is not None:
+            return SatlliteControlState(ctrl_state)
     
     @property
     def network_status(self) -> 'str|None':
         """The network status derived from control state."""
-        if self._ctrl_state is None:
-            self._satellite_status_get()
-        if self._ctrl_state is not None:
-            return SatlliteControlState(self._ctrl_state).name
+        control_state = self.control_state
+        if control_state is not None:
+            return control_state.name
 
     @property
     def registered(self) -> bool:
@@ -1086,23 +1294,21 @@ class IdpModem:
     @property
     def beamsearch_state(self) -> 'BeamSearchState|None':
         """The beam search state (Trace Class 3, Subclass 1, Data 23)"""
-        self._satellite_status_get()
-        if self._beamsearch_state is not None:
-            return BeamSearchState(self._beamsearch_state)
+        beamsearch_state = self.satellite_metrics.get('beamsearch_state')
+        if beamsearch_state is not None:
+            return BeamSearchState(beamsearch_state)
     
     @property
     def beamsearch(self) -> 'str|None':
         """The beam search state description."""
-        if self._beamsearch_state is None:
-            self._satellite_status_get()
-        if self._beamsearch_state is None:
-            return BeamSearchState(self._beamsearch_state).name
+        beamsearch_state = self.beamsearch_state
+        if beamsearch_state is not None:
+            return beamsearch_state.name
 
     @property
     def snr(self) -> 'float|None':
         """The average main beam Carrier-to-Noise (C/N0)."""
-        self._satellite_status_get()
-        return self._snr
+        return self.satellite_metrics.get('snr')
             
     @property
     def signal_quality(self) -> SignalQuality:
@@ -1127,52 +1333,57 @@ class IdpModem:
     @property
     def satellite(self) -> 'str|None':
         """The current active satellite name."""
-        if self._geo_beam_id is None:
-            self._satellite_status_get()
-        if self._geo_beam_id is not None:
-            if GeoBeam.is_valid(self._geo_beam_id):
-                return GeoBeam(self._geo_beam_id).satellite()
-            return f'UNDEFINED {self._geo_beam_id}'
+        return geo_beam_satellite(self.satellite_metrics.get('geo_beam_id'))
     
     @property
     def beam_id(self) -> 'str|None':
         """The current active regional beam ID of the active satellite."""
-        if self._geo_beam_id is None:
-            self._satellite_status_get()
-        if self._geo_beam_id is not None:
-            if GeoBeam.is_valid(self._geo_beam_id):
-                return GeoBeam(self._geo_beam_id).id()
-            return f'GEO{self._geo_beam_id}'
+        return geo_beam_name(self.satellite_metrics.get('geo_beam_id'))
         
-    def _satellite_status_get(self) -> None:
-        if 'sat_status' in self._holdoffs:
-            sat_status_age = int(time()) - self._holdoffs['sat_status']
-            if sat_status_age < SAT_STATUS_HOLDOFF:
-                _log.debug(f'Using cached status ({sat_status_age} s)')
-                return
-        else:
-            sat_status_age = None
-        _log.debug(f'Querying satellite status (cache {sat_status_age} s)')
-        self._holdoffs['sat_status'] = int(time())
-        # Trace events:
-        #   Class 3 Subclass 1 C/N, Satellite Control State, Beam Search State
-        #   Class 3 Subclass 5 Geo Beam ID
-        command = ('ATS90=3 S91=1 S92=1 S116? S122? S123?'
-                   ' S90=3 S91=5 S92=1 S102?')
-        response = self.atcommand(command)
-        if response[0] == 'ERROR':
-            self._handle_at_error(response)
-        self._snr = round(int(response[0]) / 100.0, 2)
-        self._ctrl_state = int(response[1])
-        self._beamsearch_state = int(response[2])
-        try:   #: returns ERROR if no satellite has been acquired
-            self._geo_beam_id = int(response[3])
-        except:
-            self._geo_beam_id = 0
+    def _satellite_status_fetch(self, names: 'list[str]') -> dict:
+        """Queries the trace data of satellite status metrics.
+
+        Called by `satellite_metrics` with the names of the stale metrics,
+        which are read on a single command line.
+
+        """
+        _log.debug(f'Querying satellite status {names}')
+        batch = self.batch()
+        requests = []
+        for (trace_class, subclass), group in trace_groups(SAT_STATUS_TRACES,
+                                                           names).items():
+            indices = [SAT_STATUS_TRACES[name][2] for name in group]
+            requests.append((batch.trace(trace_class, subclass, indices),
+                             group))
+        results = batch.execute()
+        values = {}
+        for index, group in requests:
+            if results[index] is not None:
+                values.update(zip(group, results[index]))
+        if 'snr' in values:
+            values['snr'] = round(values['snr'] / 100.0, 2)
+        missing = [name for name in names if name not in values]
+        if 'geo_beam_id' in missing:
+            #: S102 returns ERROR until a satellite is acquired
+            _log.debug('Geo beam ID unavailable - querying other metrics')
+            values['geo_beam_id'] = 0
+            self.satellite_metrics.expire_after('geo_beam_id', SAT_STATUS_TTL)
+            missing.remove('geo_beam_id')
+            if missing:
+                values.update(self._satellite_status_fetch(missing))
+        elif missing:
+            error = batch.errors[0]
+            if error and error[0] == 'ERROR':
+                self._handle_at_error(error)
+            raise AtException(f'Unexpected satellite status response {error}')
+        return values
 
     def satellite_status_get(self) -> dict:
         """Gets various satellite acquisition metrics.
         
+        Stale metrics are refreshed with a single query. Use
+        `satellite_metrics.refresh()` to force a refresh.
+
         Returns:
             Dictionary including:
             - `satellite` (str)
@@ -1184,15 +1395,7 @@ class IdpModem:
             - `snr` (float)
         
         """
-        return {
-            'satellite': self.satellite,
-            'beam_id': self.beam_id,
-            'network_status': self.network_status,
-            'control_state': self._ctrl_state,
-            'beamsearch': self.beamsearch,
-            'beamsearch_state': self._beamsearch_state,
-            'snr': self._snr,
-        }
+        return satellite_status(self.satellite_metrics.get_many())
 
     def shutdown(self) -> bool:
         """Tell the modem to prepare for power-down."""
@@ -1233,20 +1436,16 @@ class IdpModem:
 
     def _s_registers_read(self) -> None:
         """Reads all defined S-registers."""
-        command = 'AT'
+        batch = self.batch()
         for reg in self.s_registers:
-            if command != 'AT':
-                command += ' '
-            command += f'{reg}?'
+            batch.query(reg)
         _log.debug('Querying all S-register values')
-        response = self.atcommand(command)
-        if response[0] == 'ERROR':
+        results = batch.execute()
+        if batch.errors:
             _log.error('Could not read S-registers')
-            raise
-        index = 0
-        for name, register in self.s_registers.items():
-            register.value = response[index]
-            index += 1
+            self._handle_at_error(batch.errors[0])
+        for register, value in zip(self.s_registers.values(), results):
+            register.value = value
 
     def s_register_get_definitions(self) -> list:
         """(Future) Gets a list of S-register definitions.
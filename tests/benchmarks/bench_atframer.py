@@ -0,0 +1,37 @@
+"""Microbenchmark of AtFramer throughput in bytes/second framed.
+
+Run from the repository root: `python -m tests.benchmarks.bench_atframer`
+
+"""
+from time import perf_counter
+
+from idpmodem.atframer import AtFramer
+
+COMMAND = 'AT%MGFN'
+RESPONSE = (b'AT%MGFN\r\r\n%MGFN: "FM22.03",22.3,0,255,2,2,2\r\n' +
+            b'"FM23.03",23.3,0,255,2,2,2\r\n' * 20 +
+            b'\r\nOK\r\n')
+ITERATIONS = 2000
+
+
+def bench(chunk_size: int) -> float:
+    framer = AtFramer()
+    chunks = [RESPONSE[i:i + chunk_size]
+              for i in range(0, len(RESPONSE), chunk_size)]
+    start = perf_counter()
+    for _ in range(ITERATIONS):
+        framer.expect(COMMAND)
+        for chunk in chunks:
+            framer.feed(chunk)
+    elapsed = perf_counter() - start
+    return len(RESPONSE) * ITERATIONS / elapsed
+
+
+def main():
+    for chunk_size in [1, 16, 64, 4096]:
+        rate = bench(chunk_size)
+        print(f'chunk {chunk_size:>5} bytes: {rate / 1e6:.2f} MB/s framed')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+"""Microbenchmark of MessageCodec encode/decode throughput.
+
+Builds a return (mobile-originated) message of about 6 kB and a forward
+(mobile-terminated) message of about 10 kB from a mix of field types, and a
+small fixed-layout telemetry message, each interpreted and compiled, and
+batches of telemetry decoded per message and with `decode_many`.
+
+Run from the repository root: `python -m tests.benchmarks.bench_codec`
+
+"""
+from time import perf_counter
+
+from idpmodem.codecs.common_message_format import (BooleanField, DataField,
+                                                   EnumField, MessageCodec,
+                                                   SignedIntField, StringField,
+                                                   UnsignedIntField)
+from idpmodem.constants import DataFormat
+
+ITERATIONS = 20
+SMALL_ITERATIONS = 20000
+BATCH_SIZE = 10000
+
+
+def large_message(size: int, is_forward: bool) -> MessageCodec:
+    """Returns a populated message of roughly `size` bytes."""
+    message = MessageCodec(name='large', sin=255, min=1, is_forward=is_forward)
+    fields = message.fields
+    i = 0
+    while message.ota_size < size - 1200:
+        fields.add(UnsignedIntField(f'u{i}', size=17, data_type='uint_32',
+                                    value=i))
+        fields.add(SignedIntField(f's{i}', size=23, data_type='int_32',
+                                  value=-i))
+        fields.add(BooleanField(f'b{i}', value=bool(i % 2)))
+        fields.add(EnumField(f'e{i}', items=['A', 'B', 'C'], size=3))
+        fields[f'e{i}'].value = 'B'
+        fields.add(StringField(f't{i}', size=20, optional=True,
+                               value=f'text {i}'))
+        i += 1
+    fields.add(DataField('blob', size=1000, value=bytes(range(256)) * 3))
+    return message
+
+
+def telemetry_message() -> MessageCodec:
+    """Returns a populated small message of fixed-width fields."""
+    message = MessageCodec(name='telemetry', sin=255, min=2)
+    message.fields.add(UnsignedIntField('timestamp', size=31,
+                                        data_type='uint_32', value=1671797954))
+    message.fields.add(SignedIntField('latitude', size=24, data_type='int_32',
+                                      value=2720190))
+    message.fields.add(SignedIntField('longitude', size=25, data_type='int_32',
+                                      value=-4554233))
+    message.fields.add(UnsignedIntField('speed', size=8, value=42))
+    message.fields.add(UnsignedIntField('heading', size=9, value=270))
+    message.fields.add(BooleanField('ignition', value=True))
+    message.fields.add(EnumField('state', items=['IDLE', 'MOVING'], size=2))
+    message.fields['state'].value = 'MOVING'
+    message.fields.add(StringField('note', size=20, optional=True))
+    return message
+
+
+def bench(message: MessageCodec,
+          iterations: int,
+          ) -> 'tuple[float, float, float, float, int]':
+    encoded = message.encode(data_format=DataFormat.HEX)
+    payload = bytes([message.sin, message.min]) + bytes.fromhex(encoded['data'])
+    rates = []
+    for codec in [message, message.compile()]:
+        start = perf_counter()
+        for _ in range(iterations):
+            codec.encode(data_format=DataFormat.HEX)
+        rates.append(iterations / (perf_counter() - start))
+        start = perf_counter()
+        for _ in range(iterations):
+            codec.decode(payload)
+        rates.append(iterations / (perf_counter() - start))
+    return (*rates, len(payload))
+
+
+def bench_many(message: MessageCodec, count: int) -> 'tuple[float, float]':
+    payloads = []
+    for i in range(count):
+        message.fields['timestamp'].value = 1671797954 + i
+        message.fields['speed'].value = i % 256
+        encoded = message.encode(data_format=DataFormat.HEX)
+        payloads.append(bytes([message.sin, message.min]) +
+                        bytes.fromhex(encoded['data']))
+    compiled = message.compile()
+    start = perf_counter()
+    for payload in payloads:
+        compiled.decode_dict(payload)
+    single = count / (perf_counter() - start)
+    start = perf_counter()
+    message.decode_many(payloads)
+    batch = count / (perf_counter() - start)
+    return single, batch
+
+
+def main():
+    for label, size, is_forward in [('return', 6000, False),
+                                    ('forward', 10000, True)]:
+        message = large_message(size, is_forward)
+        enc, dec, c_enc, c_dec, length = bench(message, ITERATIONS)
+        print(f'{label:>9} {length:>5} bytes: encode {enc * length / 1e3:.0f}'
+              f' kB/s (compiled {c_enc * length / 1e3:.0f}),'
+              f' decode {dec * length / 1e3:.0f} kB/s'
+              f' (compiled {c_dec * length / 1e3:.0f})')
+    enc, dec, c_enc, c_dec, length = bench(telemetry_message(),
+                                           SMALL_ITERATIONS)
+    print(f'telemetry {length:>5} bytes: encode {enc:.0f} msg/s'
+          f' (compiled {c_enc:.0f}), decode {dec:.0f} msg/s'
+          f' (compiled {c_dec:.0f})')
+    single, batch = bench_many(telemetry_message(), BATCH_SIZE)
+    print(f'telemetry x{BATCH_SIZE}: decode_dict {single:.0f} msg/s,'
+          f' decode_many {batch:.0f} msg/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,37 @@
+"""Compares CRC backends on a 10 kB payload.
+
+Run from the repository root: `python -m tests.benchmarks.bench_crc`
+
+"""
+import os
+from timeit import timeit
+
+from idpmodem import crcxmodem
+
+PAYLOAD = os.urandom(10000)
+ITERATIONS = 200
+
+
+def legacy_crc(data: str) -> int:
+    """The original per-character implementation."""
+    _crc = 0xffff
+    for c in data:
+        _crc = crcxmodem._update_crc(_crc, ord(c))
+    return _crc
+
+
+def main():
+    text = PAYLOAD.decode('latin-1')
+    elapsed = timeit(lambda: legacy_crc(text), number=ITERATIONS)
+    print(f'{"legacy str":>10}: {elapsed / ITERATIONS * 1e6:10.1f} us/10kB')
+    default = crcxmodem.get_backend()
+    for backend in ['table', 'binascii']:
+        crcxmodem.set_backend(backend)
+        elapsed = timeit(lambda: crcxmodem.crc_bytes(PAYLOAD),
+                         number=ITERATIONS)
+        print(f'{backend:>10}: {elapsed / ITERATIONS * 1e6:10.1f} us/10kB')
+    crcxmodem.set_backend(default)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""Benchmark of loading a large Message Definition File.
+
+Exports a synthetic MDF of 100 services each with 50 forward and 50 return
+messages of mixed field types, then times `MessageDefinitions.mdf_import`
+and reports the peak traced memory during import, and times a cold and warm
+`MessageDefinitions.mdf_import_cached`.
+
+Run from the repository root: `python -m tests.benchmarks.bench_mdf_import`
+
+"""
+import os
+import tempfile
+import tracemalloc
+from time import perf_counter
+
+from idpmodem.codecs.common_message_format import (ArrayField, BooleanField,
+                                                   DataField, EnumField,
+                                                   Fields, MessageCodec,
+                                                   MessageDefinitions,
+                                                   ServiceCodec,
+                                                   SignedIntField, StringField,
+                                                   UnsignedIntField)
+
+SERVICES = 100
+MESSAGES = 50
+
+
+def synthetic_message(sin: int, min: int, is_forward: bool) -> MessageCodec:
+    message = MessageCodec(name=f'message{min}', sin=sin, min=min,
+                           is_forward=is_forward)
+    fields = message.fields
+    fields.add(UnsignedIntField('timestamp', size=31, data_type='uint_32'))
+    fields.add(SignedIntField('latitude', size=24, data_type='int_32'))
+    fields.add(BooleanField('flag', default=True))
+    fields.add(EnumField('state', items=['A', 'B', 'C'], size=2))
+    fields.add(StringField('note', size=100, optional=True))
+    fields.add(DataField('blob', size=64, optional=True))
+    element = Fields([UnsignedIntField('id', size=8),
+                      SignedIntField('reading', size=16, data_type='int_16')])
+    fields.add(ArrayField('readings', size=20, fields=element))
+    return message
+
+
+def synthetic_definitions() -> MessageDefinitions:
+    definitions = MessageDefinitions()
+    for sin in range(16, 16 + SERVICES):
+        service = ServiceCodec(name=f'service{sin}', sin=sin)
+        for min in range(1, MESSAGES + 1):
+            service.messages_forward.add(synthetic_message(sin, min, True))
+            service.messages_return.add(synthetic_message(sin, min, False))
+        definitions.services.add(service)
+    return definitions
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        filename = os.path.join(tmpdir, 'synthetic.idpmsg')
+        synthetic_definitions().mdf_export(filename)
+        size = os.path.getsize(filename)
+        start = perf_counter()
+        MessageDefinitions.mdf_import(filename)
+        elapsed = perf_counter() - start
+        tracemalloc.start()
+        MessageDefinitions.mdf_import(filename)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        start = perf_counter()
+        MessageDefinitions.mdf_import_cached(filename)
+        cold = perf_counter() - start
+        start = perf_counter()
+        MessageDefinitions.mdf_import_cached(filename)
+        warm = perf_counter() - start
+        cache_size = os.path.getsize(f'{filename}.cache')
+    print(f'{SERVICES} services x {MESSAGES * 2} messages'
+          f' ({size / 1e6:.1f} MB): import {elapsed:.2f} s,'
+          f' peak traced {peak / 1e6:.1f} MB')
+    print(f'cached ({cache_size / 1e6:.1f} MB): cold {cold:.2f} s,'
+          f' warm {warm:.2f} s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""Memory benchmark of decoded array elements.
+
+Decodes a message with a 1,000-element array of mixed field types and
+reports the traced memory allocated per decoded field, and per field of a
+large set of message definitions.
+
+Run from the repository root: `python -m tests.benchmarks.bench_memory`
+
+"""
+import gc
+import tracemalloc
+
+from idpmodem.codecs.common_message_format import (ArrayField, BooleanField,
+                                                   EnumField, Fields,
+                                                   MessageCodec,
+                                                   SignedIntField, StringField,
+                                                   UnsignedIntField)
+
+ELEMENTS = 1000
+MESSAGES = 1000
+
+
+def element_fields() -> Fields:
+    return Fields([
+        UnsignedIntField('id', size=16),
+        SignedIntField('reading', size=24, data_type='int_32'),
+        BooleanField('valid'),
+        EnumField('unit', items=['C', 'F', 'K'], size=2),
+        StringField('label', size=20),
+    ])
+
+
+def array_message() -> MessageCodec:
+    message = MessageCodec(name='readings', sin=255, min=1, is_forward=True)
+    message.fields.add(ArrayField('readings', size=ELEMENTS,
+                                  fields=element_fields()))
+    return message
+
+
+def traced(build) -> 'tuple[object, int]':
+    """Returns the result of `build()` and the bytes it retained."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def main():
+    message = array_message()
+    values = {'readings': [
+        {'id': i, 'reading': -i, 'valid': i % 2 == 0, 'unit': 'CFK'[i % 3],
+         'label': f'{i % 100}'}
+        for i in range(ELEMENTS)
+    ]}
+    payload = message.encode_dict(values)
+    _, used = traced(lambda: message.decode(payload))
+    field_count = ELEMENTS * len(element_fields())
+    print(f'decode {ELEMENTS} elements: {used / field_count:.0f}'
+          f' bytes per decoded field')
+    def definitions() -> 'list[MessageCodec]':
+        messages = []
+        for min in range(MESSAGES):
+            m = MessageCodec(name=f'm{min}', sin=255, min=min % 256)
+            m.fields.extend(element_fields())
+            messages.append(m)
+        return messages
+    _, used = traced(definitions)
+    field_count = MESSAGES * len(element_fields())
+    print(f'define {MESSAGES} messages: {used / field_count:.0f}'
+          f' bytes per field definition')
+
+
+if __name__ == '__main__':
+    main()
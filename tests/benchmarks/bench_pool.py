@@ -0,0 +1,79 @@
+"""Benchmark of ModemPool thread count and CPU cost as modems are added.
+
+Each simulated modem is a pseudo-terminal answered from the same event loop
+with the responses of the socat simulator (`tests/simulator`), so the process
+thread count reflects only the pool.
+
+Run from the repository root: `python -m tests.benchmarks.bench_pool`
+
+"""
+import asyncio
+import os
+import threading
+from time import perf_counter, process_time
+
+from idpmodem.asyncio.pool import ModemPool
+from tests.simulator.sim_responses import RESPONSES_STATIC
+
+RESPONSES = {**RESPONSES_STATIC, 'ATS85?': '\r\n00220\r\n'}
+MODEM_COUNTS = [1, 10, 50, 100]
+ROUNDS = 20
+
+
+class PtyModem:
+    """A simulated modem echoing and answering commands on a pty."""
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.master, self.slave = os.openpty()
+        self.port = os.ttyname(self.slave)
+        self.buffer = b''
+        self.loop = loop
+        os.set_blocking(self.master, False)
+        loop.add_reader(self.master, self._read)
+
+    def _read(self):
+        self.buffer += os.read(self.master, 1024)
+        while b'\r' in self.buffer:
+            line, _, self.buffer = self.buffer.partition(b'\r')
+            command = line.decode().strip()
+            reply = RESPONSES.get(command, '') + '\r\nOK\r\n'
+            os.write(self.master, f'{command}\r{reply}'.encode())
+
+    def close(self):
+        self.loop.remove_reader(self.master)
+        os.close(self.master)
+        os.close(self.slave)
+
+
+async def bench(count: int) -> 'tuple[int, float, float]':
+    loop = asyncio.get_running_loop()
+    sims = [PtyModem(loop) for _ in range(count)]
+    pool = ModemPool(baudrate=115200)
+    for i, sim in enumerate(sims):
+        pool.add(f'modem{i}', sim.port)
+    failed = await pool.connect()
+    assert not failed, f'Failed to connect {failed}'
+    cpu_start = process_time()
+    wall_start = perf_counter()
+    for _ in range(ROUNDS):
+        results = await pool.broadcast('temperature_get')
+        assert all(r == 22 for r in results.values()), results
+    cpu = process_time() - cpu_start
+    wall = perf_counter() - wall_start
+    threads = pool.statistics()['threads']
+    await pool.disconnect()
+    for sim in sims:
+        sim.close()
+    commands = count * ROUNDS
+    return threads, cpu / commands, commands / wall
+
+
+def main():
+    print(f'baseline threads: {threading.active_count()}')
+    for count in MODEM_COUNTS:
+        threads, cpu, rate = asyncio.run(bench(count))
+        print(f'{count:>4} modems: {threads} threads,'
+              f' {cpu * 1e6:.0f} us CPU/command, {rate:.0f} commands/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,244 @@
+import asyncio
+from time import monotonic
+
+import pytest
+
+from idpmodem.asyncio.atcommand import AtProtocol
+from idpmodem.asyncio.modem import IdpModem, ModemBusy
+
+
+class LoopbackTransport:
+    """Replies to each write with a canned response in fixed size chunks."""
+    def __init__(self, protocol: AtProtocol, chunk_size: int = 1) -> None:
+        self.protocol = protocol
+        self.chunk_size = chunk_size
+        self.replies = {}
+
+    def write(self, data: bytes):
+        reply = self.replies.get(data, b'')
+        loop = asyncio.get_running_loop()
+        for i in range(0, len(reply), self.chunk_size):
+            loop.call_soon(self.protocol.data_received,
+                           reply[i:i + self.chunk_size])
+
+    def close(self):
+        pass
+
+
+def loopback_modem(chunk_size: int = 3) -> 'tuple[IdpModem, LoopbackTransport]':
+    modem = IdpModem('loop://')
+    modem.protocol = AtProtocol()
+    modem.transport = LoopbackTransport(modem.protocol, chunk_size)
+    modem.protocol.connection_made(modem.transport)
+    return modem, modem.transport
+
+
+def test_protocol_command():
+    async def run():
+        protocol = AtProtocol()
+        transport = LoopbackTransport(protocol, 2)
+        transport.replies[b'ATS85?\r'] = b'ATS85?\r\r\n00220\r\n\r\nOK\r\n'
+        protocol.connection_made(transport)
+        return await protocol.command('ATS85?')
+    assert asyncio.run(run()) == ['00220', 'OK']
+
+
+def test_concurrent_commands():
+    async def run():
+        modem, transport = loopback_modem()
+        transport.replies[b'ATS85?\r'] = b'ATS85?\r\r\n00220\r\n\r\nOK\r\n'
+        transport.replies[b'AT+GSN\r'] = (b'AT+GSN\r\r\n+GSN: 01234567SKYABCD'
+                                          b'\r\n\r\nOK\r\n')
+        return await asyncio.gather(modem.temperature_get(),
+                                    modem.mobile_id_get())
+    assert asyncio.run(run()) == [22, '01234567SKYABCD']
+
+
+def test_await_timeout_releases_lock():
+    async def run():
+        modem, transport = loopback_modem()
+        transport.replies[b'ATS85?\r'] = b'ATS85?\r\r\n00220\r\n\r\nOK\r\n'
+        await modem._acquire()
+        with pytest.raises(ModemBusy):
+            await modem.atcommand('ATS85?', await_timeout=0.01)
+        waiting = asyncio.ensure_future(modem.atcommand('ATS85?'))
+        await asyncio.sleep(0)
+        waiting.cancel()
+        modem._lock.release()
+        await asyncio.sleep(0)
+        return await modem.atcommand('ATS85?', await_timeout=1)
+    assert asyncio.run(run()) == ['00220', 'OK']
+
+
+def test_constructed_outside_loop():
+    modem = IdpModem('loop://')
+    async def run():
+        modem.protocol = AtProtocol()
+        modem.transport = LoopbackTransport(modem.protocol, 3)
+        modem.protocol.connection_made(modem.transport)
+        modem.transport.replies[b'ATS85?\r'] = (b'ATS85?\r\r\n00220\r\n'
+                                               b'\r\nOK\r\n')
+        return await asyncio.gather(modem.temperature_get(),
+                                    modem.temperature_get())
+    assert asyncio.run(run()) == [22, 22]
+
+
+def test_error_detail_holdoff():
+    async def run():
+        modem, transport = loopback_modem()
+        transport.replies[b'ATS80?\r'] = b'ATS80?\r\r\n106\r\n\r\nOK\r\n'
+        modem._holdoff_until = monotonic() + 0.1
+        start = monotonic()
+        detail = await modem.at_error_detail(['ERROR'])
+        return detail, monotonic() - start, modem._lock.locked()
+    detail, elapsed, locked = asyncio.run(run())
+    assert detail == 'QUEUE_INSUFFICIENT_RESOURCES (106)'
+    assert elapsed >= 0.1 and not locked
+
+
+def test_batch_execute_async():
+    async def run():
+        modem, transport = loopback_modem()
+        transport.replies[b'ATS39? S41?\r'] = (b'ATS39? S41?\r\r\n3\r\n\r\n'
+                                               b'180\r\n\r\nOK\r\n')
+        batch = modem.batch()
+        batch.query('S39')
+        batch.query('S41')
+        return await batch.execute_async()
+    assert asyncio.run(run()) == [3, 180]
+
+
+def test_lazy_error_detail():
+    async def run():
+        modem, transport = loopback_modem()
+        modem.error_detail = 'lazy'
+        transport.replies[b'AT%MGFM="FM01.01"\r'] = (b'AT%MGFM="FM01.01"\r'
+                                                     b'\r\nERROR\r\n')
+        transport.replies[b'ATS80?\r'] = b'ATS80?\r\r\n109\r\n\r\nOK\r\n'
+        response = await modem.atcommand('AT%MGFM="FM01.01"')
+        assert response == ['ERROR']
+        detail = await modem.at_error_detail(response)
+        return response, detail
+    response, detail = asyncio.run(run())
+    assert detail == 'MESSAGE_UNAVAILABLE (109)'
+    assert response == ['ERROR', detail]
+
+
+def test_message_mt_get_buffer():
+    async def run():
+        modem, transport = loopback_modem()
+        transport.replies[b'AT%MGFG="FM01.01",3\r'] = (
+            b'AT%MGFG="FM01.01",3\r\r\n%MGFG: "FM01.01",1.0,0,255,2,4,3,AQID'
+            b'\r\n\r\nOK\r\n')
+        meta, payload = await modem.message_mt_get_buffer('FM01.01', timeout=5)
+        data = await modem.message_mt_get('FM01.01', timeout=5)
+        detail = await modem.message_mt_get('FM01.01', meta=True, timeout=5)
+        return meta, payload, data, detail
+    meta, payload, data, detail = asyncio.run(run())
+    assert meta['sin'] == 255 and meta['size'] == 4
+    assert bytes(payload) == data == b'\xff\x01\x02\x03'
+    assert detail['data'] == '/wECAw=='
+
+
+def test_message_mt_drain():
+    async def run():
+        modem, transport = loopback_modem()
+        transport.replies[b'AT%MGFN\r'] = (
+            b'AT%MGFN\r\r\n%MGFN: "FM01.01",1.0,4,255,2,4,4\r\n'
+            b'"FM02.01",2.0,1,255,2,3,3\r\n'
+            b'"FM03.01",3.0,1,255,1,9000,100\r\n\r\nOK\r\n')
+        transport.replies[b'AT%MGFG="FM02.01",3\r'] = (
+            b'AT%MGFG="FM02.01",3\r\r\n%MGFG: "FM02.01",2.0,1,255,2,3,3,'
+            b'BAU=\r\n\r\nOK\r\n')
+        get_01 = b'AT%MGFM="FM02.01";%MGFG="FM01.01",3\r'
+        transport.replies[get_01] = (
+            get_01 + b'\r\n%MGFG: "FM01.01",1.0,4,255,2,4,3,AQID\r\n'
+            b'\r\nOK\r\n')
+        transport.replies[b'AT%MGFM="FM01.01"\r'] = (
+            b'AT%MGFM="FM01.01"\r\r\nOK\r\n')
+        sent = []
+        write = transport.write
+        def record(data: bytes):
+            sent.append(data)
+            write(data)
+        transport.write = record
+        drained = [(meta['name'], bytes(payload)) async for meta, payload
+                   in modem.message_mt_drain(timeout=5)]
+        return drained, sent
+    drained, sent = asyncio.run(run())
+    assert drained == [('FM02.01', b'\xff\x04\x05'),
+                       ('FM01.01', b'\xff\x01\x02\x03')]
+    assert sent == [b'AT%MGFN\r', b'AT%MGFG="FM02.01",3\r',
+                    b'AT%MGFM="FM02.01";%MGFG="FM01.01",3\r',
+                    b'AT%MGFM="FM01.01"\r']
+
+
+def test_satellite_status_single_query():
+    async def run():
+        modem, transport = loopback_modem()
+        command = (b'ATS90=3 S91=1 S92=1 S116? S122? S123?'
+                   b' S90=3 S91=5 S92=1 S102?')
+        transport.replies[command + b'\r'] = (
+            command + b'\r\r\n4510\r\n\r\n10\r\n\r\n0\r\n\r\n999\r\n'
+            b'\r\nOK\r\n')
+        sent = []
+        write = transport.write
+        def record(data: bytes):
+            sent.append(data)
+            write(data)
+        transport.write = record
+        status = await asyncio.gather(modem.satellite_status_get(),
+                                      modem.snr_get(),
+                                      modem.beam_id_get())
+        await modem.satellite_status_get()
+        return status, sent
+    (status, snr, beam_id), sent = asyncio.run(run())
+    assert len(sent) == 1
+    assert status['snr'] == snr == 45.1
+    assert status['network_status'] == 'ACTIVE'
+    assert beam_id == 'GEO999'
+
+
+def test_satellite_status_no_geo_beam():
+    async def run():
+        modem, transport = loopback_modem()
+        command = b'ATS90=3 S91=1 S92=1 S116? S122? S123?'
+        transport.replies[command + b' S90=3 S91=5 S92=1 S102?\r'] = (
+            command + b' S90=3 S91=5 S92=1 S102?\r\r\nERROR\r\n')
+        transport.replies[command + b'\r'] = (
+            command + b'\r\r\n4510\r\n\r\n10\r\n\r\n0\r\n\r\nOK\r\n')
+        modem.error_detail = False
+        status = await modem.satellite_status_get()
+        return status, await modem.satellite_metrics.get_async('geo_beam_id')
+    status, geo_beam_id = asyncio.run(run())
+    assert status['snr'] == 45.1 and geo_beam_id == 0
+
+
+@pytest.mark.parametrize('delete_on_close', [True, False])
+def test_message_mt_drain_closed(delete_on_close: bool):
+    async def run():
+        modem, transport = loopback_modem()
+        transport.replies[b'AT%MGFN\r'] = (
+            b'AT%MGFN\r\r\n%MGFN: "FM01.01",1.0,4,255,2,4,4\r\n'
+            b'"FM02.01",2.0,1,255,2,3,3\r\n\r\nOK\r\n')
+        transport.replies[b'AT%MGFG="FM02.01",3\r'] = (
+            b'AT%MGFG="FM02.01",3\r\r\n%MGFG: "FM02.01",2.0,1,255,2,3,3,'
+            b'BAU=\r\n\r\nOK\r\n')
+        transport.replies[b'AT%MGFM="FM02.01"\r'] = (
+            b'AT%MGFM="FM02.01"\r\r\nOK\r\n')
+        sent = []
+        write = transport.write
+        def record(data: bytes):
+            sent.append(data)
+            write(data)
+        transport.write = record
+        drain = modem.message_mt_drain(timeout=5,
+                                       delete_on_close=delete_on_close)
+        async for meta, _ in drain:
+            break
+        await drain.aclose()
+        return meta, sent
+    meta, sent = asyncio.run(run())
+    assert meta['name'] == 'FM02.01'
+    deleted = [b'AT%MGFM="FM02.01"\r'] if delete_on_close else []
+    assert sent == [b'AT%MGFN\r', b'AT%MGFG="FM02.01",3\r'] + deleted
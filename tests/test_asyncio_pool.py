@@ -0,0 +1,69 @@
+import asyncio
+
+from idpmodem.asyncio.atcommand import AtProtocol
+from idpmodem.asyncio.pool import ModemPool
+from tests.test_asyncio_modem import LoopbackTransport
+
+TEMPERATURE = b'ATS85?\r\r\n00220\r\n\r\nOK\r\n'
+
+
+def loopback_pool(count: int) -> 'tuple[ModemPool, list[LoopbackTransport]]':
+    pool = ModemPool()
+    transports = []
+    for i in range(count):
+        modem = pool.add(f'modem{i}', 'loop://')
+        modem.protocol = AtProtocol()
+        modem.transport = LoopbackTransport(modem.protocol, 4)
+        modem.protocol.connection_made(modem.transport)
+        modem.transport.replies[b'ATS85?\r'] = TEMPERATURE
+        transports.append(modem.transport)
+    return pool, transports
+
+
+def test_broadcast_and_statistics():
+    async def run():
+        pool, _ = loopback_pool(3)
+        assert await pool.connect() == []
+        results = await pool.broadcast('temperature_get')
+        pending = [pool.submit('modem0', 'temperature_get') for _ in range(4)]
+        assert await asyncio.gather(*pending) == [22] * 4
+        stats = pool.statistics()
+        await pool.disconnect()
+        return results, stats
+    results, stats = asyncio.run(run())
+    assert results == {'modem0': 22, 'modem1': 22, 'modem2': 22}
+    assert stats['commands'] == 7
+    assert stats['errors'] == 0
+    assert stats['queue_peak'] >= 3
+    assert stats['connected'] == 3
+
+
+def test_shared_event_dispatch():
+    async def run():
+        pool, _ = loopback_pool(2)
+        events = []
+        pool.add_event_handler(lambda name, data: events.append((name, data)))
+        await pool.connect()
+        pool['modem1'].protocol.data_received(b'RING\n')
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        await pool.disconnect()
+        return events
+    assert ('modem1', 'RING\n') in asyncio.run(run())
+
+
+def test_event_callback_chained():
+    async def run():
+        pool, _ = loopback_pool(1)
+        prior = []
+        pool['modem0'].protocol.event_callback = prior.append
+        events = []
+        pool.add_event_handler(lambda name, data: events.append((name, data)))
+        await pool.connect()
+        pool['modem0'].protocol.data_received(b'RING\n')
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        await pool.disconnect()
+        return prior, events
+    prior, events = asyncio.run(run())
+    assert prior == ['RING\n'] and events == [('modem0', 'RING\n')]
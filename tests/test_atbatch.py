@@ -0,0 +1,55 @@
+import pytest
+
+from idpmodem.atbatch import AtBatch
+
+
+class FakeModem:
+    """Answers S-register queries with the register number."""
+    def __init__(self, fail: str = None) -> None:
+        self.sent = []
+        self.fail = fail
+
+    def atcommand(self, command: str) -> 'list[str]':
+        self.sent.append(command)
+        if self.fail and self.fail in command:
+            return ['ERROR']
+        response = []
+        for part in command[2:].split(' '):
+            if part.endswith('?'):
+                response.append(part[1:-1])
+        return response + ['OK']
+
+
+def test_merge_and_map():
+    modem = FakeModem()
+    batch = AtBatch(modem.atcommand)
+    mode = batch.query('S39')
+    setting = batch.set(88, 2)
+    trace = batch.trace(3, 1, [16, 22])
+    same = batch.trace(3, 1, [23])
+    beam = batch.trace(3, 5, [2])
+    assert batch.commands() == [
+        'ATS39? S88=2 S90=3 S91=1 S92=1 S116? S122? S123?'
+        ' S90=3 S91=5 S92=1 S102?']
+    results = batch.execute()
+    assert len(modem.sent) == 1
+    assert results[mode] == 39
+    assert results[setting] is True
+    assert results[trace] == [116, 122]
+    assert results[same] == [123]
+    assert results[beam] == [102]
+
+
+def test_max_length_split():
+    modem = FakeModem(fail='S41?')
+    batch = AtBatch(modem.atcommand, max_length=16)
+    for reg in ['S39', 'S41', 'S51', 'S55', 'S56']:
+        batch.query(reg)
+    lines = batch.commands()
+    assert all(len(line) <= 16 for line in lines)
+    assert lines == ['ATS39? S41? S51?', 'ATS55? S56?']
+    results = batch.execute()
+    assert results == [None, None, None, 55, 56]
+    assert batch.errors == [['ERROR']]
+    with pytest.raises(ValueError):
+        batch.trace(3, 1, list(range(10)))
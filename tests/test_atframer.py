@@ -0,0 +1,66 @@
+from idpmodem.atframer import AtFrame, AtFramer, AtFrameType
+
+RESPONSE = b'AT+GSN\r\r\n+GSN: 00000000MFREE3D\r\n\r\nOK\r\n'
+
+
+def feed_chunks(framer: AtFramer, data: bytes, size: int) -> 'list[AtFrame]':
+    frames = []
+    for i in range(0, len(data), size):
+        frames.extend(framer.feed(data[i:i + size]))
+    return frames
+
+
+def test_echo_response_result():
+    for size in [1, 3, 7, len(RESPONSE)]:
+        framer = AtFramer()
+        framer.expect('AT+GSN')
+        frames = feed_chunks(framer, RESPONSE, size)
+        assert [f.frame_type for f in frames] == [
+            AtFrameType.ECHO, AtFrameType.RESPONSE, AtFrameType.RESULT]
+        assert frames[0].data == b'AT+GSN\r'
+        assert frames[1].data == b'\r\n+GSN: 00000000MFREE3D\r\n'
+        assert frames[2].content == b'OK'
+        assert len(framer.buffer) == 0
+
+
+def test_crc_frame():
+    framer = AtFramer()
+    framer.expect('AT*1234')
+    frames = framer.feed(b'AT*1234\r\r\nERROR\r\n*ABCD\r\n')
+    assert frames[1].frame_type == AtFrameType.RESULT
+    assert frames[2].frame_type == AtFrameType.CRC
+    assert frames[2].content == b'*ABCD'
+
+
+def test_no_echo():
+    framer = AtFramer()
+    framer.expect('ATS85?')
+    frames = framer.feed(b'\r\n00220\r\n\r\nOK\r\n')
+    assert [f.frame_type for f in frames] == [
+        AtFrameType.RESPONSE, AtFrameType.RESULT]
+
+
+def test_unsolicited_and_partial():
+    framer = AtFramer()
+    frames = framer.feed(b'boot loader\r\nstarting ap')
+    assert len(frames) == 1
+    assert frames[0].frame_type == AtFrameType.UNSOLICITED
+    assert framer.clear() == b'starting ap'
+    assert framer.feed(b'') == []
+
+
+def test_streaming_crc():
+    from idpmodem.crcxmodem import apply_crc, crc
+    command = apply_crc('ATS85?')
+    body = '\r\n00220\r\n\r\nOK\r\n'
+    valid = f'{command}\r{body}*{crc(body):04X}\r\n'.encode()
+    for size in [1, 5, len(valid)]:
+        framer = AtFramer()
+        framer.expect(command)
+        frames = feed_chunks(framer, valid, size)
+        assert frames[-1].frame_type == AtFrameType.CRC
+        assert frames[-1].crc_valid is True
+    framer = AtFramer()
+    framer.expect(command)
+    frames = framer.feed(valid.replace(b'00220', b'00221'))
+    assert frames[-1].crc_valid is False
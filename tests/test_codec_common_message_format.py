@@ -721,3 +721,293 @@ def test_optional_location():
         comp_msg = TextMo()
         comp_msg.decode(encoded)
         assert comp_msg == test_msg
+
+
+def test_bit_reader_writer():
+    writer = BitWriter()
+    writer.write_bool(True)
+    writer.write(-3, 5)
+    writer.write_bytes(b'\xa5\x0f')
+    writer.write(0x1234, 13)
+    assert writer.bit_length == 1 + 5 + 16 + 13
+    assert writer.to_binary_str() == ('1' + '11101' + '1010010100001111' +
+                                      '1001000110100')
+    reader = BitReader(writer.to_bytes())
+    assert reader.read_bool() is True
+    assert reader.read_signed(5) == -3
+    assert reader.read_bytes(2) == b'\xa5\x0f'
+    assert reader.read(13) == 0x1234
+    assert reader.remaining == 5
+    with pytest.raises(ValueError):
+        reader.read(6)
+
+
+def test_array_decode_distinct_elements(array_field,
+                                        array_element_fields_example):
+    test_field: ArrayField = array_field(size=3,
+                                         fields=array_element_fields_example)
+    for i in range(3):
+        element = test_field.new_element()
+        element['propertyName'] = f'testProp{i}'
+        element['propertyValue'] = i
+    enc = test_field.encode()
+    decoded: ArrayField = array_field(size=3,
+                                      fields=array_element_fields_example)
+    assert decoded.decode(enc) == len(enc)
+    assert [e['propertyValue'].value for e in decoded.elements] == [0, 1, 2]
+
+
+def test_compiled_message():
+    msg = MessageCodec(name='compiled', sin=255, min=2)
+    msg.fields.add(UnsignedIntField('count', size=11, value=1234))
+    msg.fields.add(SignedIntField('offset', size=9, data_type='int_16',
+                                  value=-200))
+    msg.fields.add(BooleanField('flag', value=True))
+    msg.fields.add(EnumField('mode', items=['A', 'B', 'C'], size=2))
+    msg.fields['mode'].value = 'C'
+    msg.fields.add(StringField('text', size=20, optional=True, value='hi'))
+    msg.fields.add(UnsignedIntField('tail', size=5, value=17))
+    compiled = msg.compile()
+    assert compiled.prefix_bits == 11 + 9 + 1 + 2
+    for exclude in [None, ['text']]:
+        encoded = compiled.encode(DataFormat.HEX, exclude)
+        assert encoded == msg.encode(DataFormat.HEX, exclude)
+    encoded = compiled.encode(DataFormat.HEX)
+    ref = deepcopy(msg)
+    for field in msg.fields:
+        field._value = None
+    compiled.decode(bytes.fromhex(f'FF02{encoded["data"]}'))
+    assert msg == ref
+
+
+def test_dict_codec_stateless(message_definitions: MessageDefinitions):
+    values = {
+        'testBool': False,
+        'testUint': 7,
+        'latitude': -1234567,
+        'nonOptionalString': 'stateless',
+        'arrayExample': [
+            {'propertyName': 'one', 'propertyValue': 1},
+            {'propertyName': 'two', 'propertyValue': 2},
+        ],
+        'testData': 1.5,
+    }
+    ref = deepcopy(message_definitions)
+    databytes = message_definitions.encode_dict({'sin': 255, 'min': 1,
+                                                 'fields': values},
+                                                is_forward=False)
+    decoded = message_definitions.decode_dict(databytes, is_forward=False)
+    assert decoded == {'name': 'returnMessageFixture', 'sin': 255, 'min': 1,
+                       'fields': values}
+    message: MessageCodec = message_definitions.services[0].messages_return[0]
+    ref_message: MessageCodec = ref.services[0].messages_return[0]
+    assert message == ref_message
+    compiled = message.compile()
+    assert compiled.encode_dict(values) == databytes
+    assert compiled.decode_dict(databytes) == values
+    assert message == ref_message
+    with pytest.raises(ValueError):
+        message.encode_dict({**values, 'testUint': 2**16})
+    with pytest.raises(ValueError):
+        compiled.encode_dict({**values, 'testUint': 2**16})
+
+
+def test_compiled_invalid_enum_index():
+    msg = MessageCodec(name='enums', sin=128, min=1)
+    msg.fields.add(EnumField('mode', items=['A', 'B', 'C'], size=2))
+    payload = bytes([128, 1, 0b11000000, 0])
+    with pytest.raises(ValueError, match='Invalid enum index 3'):
+        msg.decode_dict(payload)
+    with pytest.raises(ValueError, match='Invalid enum index 3'):
+        msg.compile().decode_dict(payload)
+    with pytest.raises(ValueError, match='Invalid enum index 3'):
+        msg.decode_many([bytes([128, 1, 0b01000000, 0]), payload])
+
+
+def test_decode_many():
+    msg = MessageCodec(name='report', sin=255, min=3)
+    msg.fields.add(UnsignedIntField('timestamp', size=31, data_type='uint_32'))
+    msg.fields.add(SignedIntField('latitude', size=24, data_type='int_32'))
+    msg.fields.add(BooleanField('flag'))
+    msg.fields.add(EnumField('mode', items=['A', 'B', 'C'], size=2))
+    msg.fields.add(StringField('note', size=20, optional=True))
+    msg.fields.add(UnsignedIntField('tail', size=5))
+    records = [
+        {'timestamp': 1671797954 + i, 'latitude': -2720190 + i * 1000,
+         'flag': i % 2 == 0, 'mode': 'ABC'[i % 3], 'tail': i}
+        for i in range(10)
+    ]
+    records[4]['note'] = 'four'
+    payloads = [msg.encode_dict(record) for record in records]
+    columns = msg.decode_many(payloads)
+    assert list(columns['timestamp']) == [r['timestamp'] for r in records]
+    assert list(columns['latitude']) == [r['latitude'] for r in records]
+    assert list(columns['flag']) == [int(r['flag']) for r in records]
+    assert list(columns['mode']) == [i % 3 for i in range(10)]
+    assert columns['note'] == [None] * 4 + ['four'] + [None] * 5
+    assert list(columns['tail']) == list(range(10))
+    assert columns['latitude'].typecode == 'i'
+    assert columns['mode'].typecode == 'B'
+    signed = MessageCodec(name='signed', sin=255, min=4)
+    signed.fields.add(SignedIntField('small', size=8, data_type='int_8'))
+    small = signed.decode_many([signed.encode_dict({'small': -128})])['small']
+    assert small.typecode == 'b' and list(small) == [-128]
+    with pytest.raises(ValueError):
+        msg.decode_many([b'\xff\x01' + payloads[0][2:]])
+
+
+def test_message_definitions_dispatch(message_definitions: MessageDefinitions,
+                                      return_message: MessageCodec):
+    service: ServiceCodec = message_definitions.services[0]
+    forward = MessageCodec(name='forwardMessage', sin=255, min=1,
+                           is_forward=True)
+    forward.fields.add(UnsignedIntField('interval', size=16, value=60))
+    service.messages_forward.add(forward)
+    assert message_definitions.message(255, 1, False) is return_message
+    assert message_definitions.message(255, 1, True) is forward
+    assert message_definitions.message(255, 2, True) is None
+    assert message_definitions.message(254, 1, True) is None
+    databytes = forward.encode_dict({'interval': 3600})
+    assert message_definitions.decode(databytes, True) is forward
+    assert forward.fields['interval'].value == 3600
+    with pytest.raises(ValueError):
+        service.messages_forward.add(MessageCodec(name='other', sin=255,
+                                                  min=1, is_forward=True))
+    assert service.messages_forward.delete('forwardMessage')
+    assert message_definitions.message(255, 1, True) is None
+    with pytest.raises(ValueError):
+        message_definitions.decode(databytes, True)
+    assert message_definitions.services.delete('testService')
+    assert message_definitions.message(255, 1, False) is None
+
+
+def test_codec_list_name_index():
+    fields = Fields([UnsignedIntField(f'f{i}', size=8, value=i)
+                     for i in range(5)])
+    assert 'f3' in fields and 'f9' not in fields
+    assert fields['f3'] is fields[3]
+    with pytest.raises(ValueError):
+        fields.add(UnsignedIntField('f3', size=8))
+    assert fields.delete('f1')
+    assert not fields.delete('f1')
+    assert [f.name for f in fields] == ['f0', 'f2', 'f3', 'f4']
+    assert fields['f3'] is fields[2]
+    fields[0] = UnsignedIntField('g0', size=8, value=9)
+    assert 'f0' not in fields and fields['g0'].value == 9
+    with pytest.raises(ValueError):
+        fields[0] = UnsignedIntField('f4', size=8)
+    fields['f4'] = 44
+    assert fields[3].value == 44
+    fields.insert(0, UnsignedIntField('h', size=8))
+    assert fields['f4'] is fields[4]
+    fields.append(UnsignedIntField('appended', size=8))
+    assert fields['appended'] is fields[-1]
+    copied = deepcopy(fields)
+    assert copied['f4'] is copied[4] and copied['f4'] is not fields['f4']
+    fields.extend([UnsignedIntField('f4', size=8)])
+    fields += [UnsignedIntField('extended', size=8)]
+    reindex = fields._reindex
+    fields._reindex = None
+    assert fields['f4'] is fields[4] and fields['extended'] is fields[-1]
+    fields._reindex = reindex
+
+
+def test_messages_min_index():
+    messages = Messages(sin=255, is_forward=False)
+    messages.add(MessageCodec(name='first', sin=255, min=1))
+    messages.append(MessageCodec(name='second', sin=255, min=2))
+    assert messages.by_min(2) is messages[1]
+    with pytest.raises(ValueError):
+        messages[1] = MessageCodec(name='other', sin=255, min=1)
+    with pytest.raises(ValueError):
+        messages[1] = MessageCodec(name='other', sin=254, min=3)
+    messages[1] = MessageCodec(name='second', sin=255, min=3)
+    assert messages.by_min(2) is None and messages.by_min(3) is messages[1]
+
+
+def test_mdf_import(message_definitions: MessageDefinitions, tmp_path):
+    filename = str(tmp_path / 'roundtrip.idpmsg')
+    message_definitions.mdf_export(filename, include_service_description=True)
+    imported = MessageDefinitions.mdf_import(filename)
+    assert ET.tostring(imported.xml()) == ET.tostring(message_definitions.xml())
+    example = os.path.join(os.path.dirname(__file__), '..', 'examples',
+                           'message_definitions', 'messageExample.idpmsg')
+    imported = MessageDefinitions.mdf_import(example)
+    message = imported.message(128, 1, is_forward=False)
+    assert message.name == 'allTypes'
+    assert isinstance(message.fields['arrayOfTypes'], ArrayField)
+    assert imported.message(128, 2, is_forward=True).fields[
+        'confirmChanges'].default is True
+
+
+def test_mdf_import_cached(message_definitions: MessageDefinitions, tmp_path):
+    filename = str(tmp_path / 'cached.idpmsg')
+    message_definitions.mdf_export(filename)
+    first = MessageDefinitions.mdf_import_cached(filename)
+    assert os.path.isfile(f'{filename}.cache')
+    cached = MessageDefinitions.mdf_import_cached(filename)
+    assert ET.tostring(cached.xml()) == ET.tostring(first.xml())
+    assert cached.services._names == {}
+    assert cached.message(255, 1, False).name == 'returnMessageFixture'
+    service = message_definitions.services[0]
+    service.messages_return.delete('returnMessageFixture')
+    service.messages_return.add(MessageCodec(name='changed', sin=255, min=2))
+    message_definitions.mdf_export(filename)
+    changed = MessageDefinitions.mdf_import_cached(filename)
+    assert changed.message(255, 1, False) is None
+    assert changed.message(255, 2, False).name == 'changed'
+    with open(f'{filename}.cache', 'wb') as f:
+        f.write(b'corrupt')
+    assert MessageDefinitions.mdf_import_cached(filename).message(255, 2, False)
+
+
+def test_array_new_element_shares_definition(array_field,
+                                             array_element_fields_example):
+    test_field: ArrayField = array_field(size=3,
+                                         fields=array_element_fields_example)
+    first = test_field.new_element()
+    second = test_field.new_element()
+    first['propertyValue'] = 1
+    second['propertyValue'] = 2
+    assert first['propertyValue'] is not second['propertyValue']
+    assert [e['propertyValue'].value for e in test_field.elements] == [1, 2]
+    assert test_field.fields['propertyValue'].value is None
+    assert first['propertyName'].data_type == 'string'
+
+
+def test_array_elements_store_values(array_field,
+                                     array_element_fields_example):
+    test_field: ArrayField = array_field(size=2,
+                                         fields=array_element_fields_example)
+    element = test_field.new_element()
+    element['propertyName'] = 'temperature'
+    element['propertyValue'].value = 2**32
+    assert element['propertyValue'].value == 2**32 - 1
+    assert element['propertyValue'].bits == 32
+    with pytest.raises(ValueError):
+        element['propertyValue'] = -1
+    decoded: ArrayField = array_field(size=2,
+                                      fields=array_element_fields_example)
+    decoded.decode(test_field.encode())
+    assert isinstance(decoded.elements[0], ArrayElement)
+    assert decoded.elements[0].fields is decoded.fields
+    assert decoded.elements == test_field.elements
+    assert [f.value for f in decoded.elements[0]] == ['temperature', 2**32 - 1]
+
+
+def test_xml_without_service_description(message_definitions):
+    assert message_definitions.services[0].description is not None
+    xml = message_definitions.xml(include_service_description=False)
+    assert xml.find('Services/Service/Description') is None
+    xml = message_definitions.xml()
+    assert xml.find('Services/Service/Description') is not None
+
+
+def test_codec_slots(return_message: MessageCodec):
+    for field in return_message.fields:
+        assert not hasattr(field, '__dict__')
+    assert not hasattr(return_message, '__dict__')
+    copied = deepcopy(return_message)
+    assert copied == return_message
+    copied.fields['testUint'].value = 43
+    assert copied != return_message
@@ -0,0 +1,64 @@
+import threading
+from time import monotonic, sleep
+
+from idpmodem.commandgate import CommandGate
+
+
+def test_fifo_order():
+    gate = CommandGate()
+    assert gate.acquire()
+    order = []
+
+    def worker(i: int):
+        if gate.acquire(timeout=2):
+            order.append(i)
+            gate.release()
+
+    threads = []
+    for i in range(5):
+        t = threading.Thread(target=worker, args=(i,))
+        t.start()
+        threads.append(t)
+        sleep(0.01)   # ensure arrival order
+    assert gate.full()
+    gate.release()
+    for t in threads:
+        t.join()
+    assert order == list(range(5))
+    assert not gate.full()
+
+
+def test_timeout_and_nonblocking():
+    gate = CommandGate()
+    assert gate.acquire()
+    assert not gate.acquire(blocking=False)
+    start = monotonic()
+    assert not gate.acquire(timeout=0.1)
+    assert 0.1 <= monotonic() - start < 0.5
+    gate.release()
+    assert gate.acquire(blocking=False)
+    gate.release()
+
+
+def test_cancel():
+    gate = CommandGate()
+    gate.acquire()
+    result = []
+    t = threading.Thread(target=lambda: result.append(gate.acquire()))
+    t.start()
+    sleep(0.05)
+    gate.cancel()
+    t.join(timeout=1)
+    assert result == [False]
+    gate.release()
+    assert not gate.full()
+
+
+def test_holdoff():
+    gate = CommandGate()
+    gate.hold_off(0.2)
+    assert gate.holdoff_remaining > 0
+    start = monotonic()
+    assert gate.acquire(timeout=1)
+    assert monotonic() - start >= 0.19
+    gate.release()
@@ -1,4 +1,6 @@
-from idpmodem.crcxmodem import get_crc, validate_crc
+import pytest
+from idpmodem.crcxmodem import (CrcAccumulator, crc, crc_bytes, get_backend,
+                                get_crc, set_backend, validate_crc)
 
 
 def test_crc():
@@ -7,3 +9,29 @@ def test_crc():
     crc = command_with_crc.split('*')[1]
     valid = validate_crc(f'{command}', f'*{crc}')
     assert valid
+
+
+def test_crc_backends():
+    data = bytes(range(256)) * 40
+    default = get_backend()
+    results = []
+    for backend in ['table', 'binascii']:
+        set_backend(backend)
+        results.append(crc_bytes(data))
+        results.append(crc_bytes(memoryview(data)))
+    set_backend(default)
+    assert all(r == results[0] for r in results)
+    assert crc_bytes(b'ATS80?') == crc('ATS80?')
+    with pytest.raises(ValueError):
+        set_backend('invalid')
+
+
+def test_crc_accumulator():
+    response = b'\r\n00220\r\n\r\nOK\r\n'
+    accumulator = CrcAccumulator()
+    for i in range(0, len(response), 3):
+        accumulator.update(response[i:i + 3])
+    assert accumulator.value == crc_bytes(response)
+    assert accumulator.matches(f'*{crc_bytes(response):04X}\r\n')
+    accumulator.reset()
+    assert accumulator.value == 0xffff
@@ -0,0 +1,138 @@
+import asyncio
+
+from idpmodem.constants import EventNotification, MessageState
+from idpmodem.events import (MessageMoComplete, MessageMtReceived,
+                             ModemEvent, ModemEventLoop, ModemUnsolicited)
+
+
+class FakeProtocol:
+    event_callback = None
+
+
+class FakeModem:
+    """Records the queries a `ModemEventLoop` makes on a threaded modem."""
+    def __init__(self) -> None:
+        self.protocol = FakeProtocol()
+        self.calls = []
+        self.active = []
+        self.monitored = []
+        self.waiting = []
+        self.states = []
+
+    @property
+    def event_notifications(self):
+        self.calls.append('S89')
+        active, self.active = self.active, []
+        return active
+
+    @property
+    def event_notification_monitor(self):
+        self.calls.append('S88?')
+        return self.monitored
+
+    @event_notification_monitor.setter
+    def event_notification_monitor(self, events):
+        self.calls.append('S88=')
+        self.monitored = events
+
+    def message_mt_waiting(self):
+        self.calls.append('MGFN')
+        return self.waiting
+
+    def message_mo_state(self):
+        self.calls.append('MGRS')
+        return self.states
+
+
+class FakeAsyncModem(FakeModem):
+    async def event_notifications_get(self):
+        return self.event_notifications
+
+    async def event_notification_monitor_get(self):
+        return self.event_notification_monitor
+
+    async def event_notification_monitor_set(self, events):
+        self.event_notification_monitor = events
+
+    async def message_mt_waiting(self):
+        return super().message_mt_waiting()
+
+    async def message_mo_state(self):
+        return super().message_mo_state()
+
+
+def test_check_queries_asserted_only():
+    modem = FakeModem()
+    loop = ModemEventLoop(modem)
+    received = []
+    loop.subscribe(received.append, MessageMtReceived)
+    everything = []
+    loop.subscribe(everything.append)
+    assert loop.check() == [] and modem.calls == ['S89']
+    modem.calls = []
+    modem.active = [EventNotification.MESSAGE_MT_RECEIVED,
+                    EventNotification.NETWORK_REGISTERED]
+    modem.waiting = [
+        {'name': 'FM01.01', 'state': MessageState.RX_COMPLETE},
+        {'name': 'FM02.01', 'state': MessageState.RX_PENDING},
+    ]
+    events = loop.check()
+    assert modem.calls == ['S89', 'MGFN']
+    assert len(received) == 1
+    assert [m['name'] for m in received[0].messages] == ['FM01.01']
+    assert [e.notification for e in everything] == [
+        EventNotification.MESSAGE_MT_RECEIVED,
+        EventNotification.NETWORK_REGISTERED]
+    assert events == everything
+    modem.active = [EventNotification.MESSAGE_MT_RECEIVED]
+    loop.check()
+    assert len(received) == 1
+
+
+def test_mo_complete_reported_once():
+    modem = FakeModem()
+    loop = ModemEventLoop(modem)
+    completed = []
+    loop.subscribe(completed.append, MessageMoComplete)
+    modem.states = [{'name': 'A', 'state': MessageState.TX_COMPLETE},
+                    {'name': 'B', 'state': MessageState.TX_SENDING}]
+    modem.active = [EventNotification.MESSAGE_MO_COMPLETE]
+    loop.check()
+    modem.states[1]['state'] = MessageState.TX_FAILED
+    modem.active = [EventNotification.MESSAGE_MO_COMPLETE]
+    loop.check()
+    assert [[m['name'] for m in e.messages] for e in completed] == [['A'],
+                                                                   ['B']]
+
+
+def test_run_async_unsolicited():
+    async def run():
+        modem = FakeAsyncModem()
+        loop = ModemEventLoop(modem, poll_interval=None)
+        events = []
+        async def handler(event: ModemEvent):
+            events.append(event)
+            loop.stop()
+        loop.subscribe(handler, ModemUnsolicited)
+        task = asyncio.create_task(loop.run_async())
+        await asyncio.sleep(0)
+        modem.protocol.event_callback('%UNSOLICITED\r\n')
+        await asyncio.wait_for(task, 1)
+        return modem, events
+    modem, events = asyncio.run(run())
+    assert [e.data for e in events] == ['%UNSOLICITED\r\n']
+    assert modem.calls[:2] == ['S88?', 'S88=']
+    assert set(modem.monitored) == {EventNotification.MESSAGE_MT_RECEIVED,
+                                    EventNotification.MESSAGE_MO_COMPLETE}
+    assert modem.calls[2:] == ['S89', 'S89']
+
+
+def test_notify_after_loop_closed():
+    loop = ModemEventLoop(FakeAsyncModem())
+    async_loop = asyncio.new_event_loop()
+    loop._async_loop = async_loop
+    loop._async_wake = asyncio.Event()
+    async_loop.close()
+    loop.notify()
+    loop._async_wake = None
+    loop.notify()
@@ -0,0 +1,91 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from idpmodem.metrics import (SAT_STATUS_TRACES, MetricsCache,
+                              satellite_status, trace_groups)
+
+
+def test_ttl_per_metric():
+    fetched = []
+    def fetch(names):
+        fetched.append(names)
+        return {name: len(fetched) for name in names}
+    cache = MetricsCache({'fast': 0, 'slow': 60}, fetch)
+    assert cache.get_many() == {'fast': 1, 'slow': 1}
+    assert cache.get('slow') == 1
+    assert cache.get('fast') == 2
+    assert cache.refresh(['slow']) == {'slow': 3}
+    assert fetched == [['fast', 'slow'], ['fast'], ['slow']]
+    cache.invalidate()
+    assert cache.age('slow') is None
+    with pytest.raises(ValueError):
+        cache.get('unknown')
+
+
+def test_expire_after():
+    fetched = []
+    def fetch(names):
+        fetched.append(names)
+        if len(fetched) == 1:
+            cache.expire_after('slow', 0)   # placeholder until available
+        return {name: len(fetched) for name in names}
+    cache = MetricsCache({'fast': 60, 'slow': 60}, fetch)
+    assert cache.get_many() == {'fast': 1, 'slow': 1}
+    assert cache.get_many() == {'fast': 1, 'slow': 2}
+    assert cache.get_many() == {'fast': 1, 'slow': 2}
+    assert fetched == [['fast', 'slow'], ['slow']]
+
+
+def test_single_flight_threads():
+    started = threading.Event()
+    release = threading.Event()
+    fetched = []
+    def fetch(names):
+        fetched.append(names)
+        started.set()
+        release.wait(1)
+        return {name: 42 for name in names}
+    cache = MetricsCache({'a': 60, 'b': 60}, fetch)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get('a')))
+               for _ in range(5)]
+    threads[0].start()
+    started.wait(1)
+    for thread in threads[1:]:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join(1)
+    assert results == [42] * 5
+    assert fetched == [['a']]
+
+
+def test_single_flight_async():
+    fetched = []
+    async def fetch(names):
+        fetched.append(names)
+        await asyncio.sleep(0.01)
+        return {name: 7 for name in names}
+    async def run():
+        cache = MetricsCache({'a': 60, 'b': 60}, fetch)
+        return await asyncio.gather(cache.get_async('a'),
+                                    cache.get_many_async(),
+                                    cache.refresh_async(['a']))
+    results = asyncio.run(run())
+    assert results == [7, {'a': 7, 'b': 7}, {'a': 7}]
+    assert fetched == [['a'], ['b']]
+
+
+def test_satellite_status():
+    assert list(trace_groups(SAT_STATUS_TRACES, ['geo_beam_id', 'snr'])) == [
+        (3, 1), (3, 5)]
+    status = satellite_status({'snr': 45.1, 'control_state': 10,
+                               'beamsearch_state': 0, 'geo_beam_id': 999})
+    assert status['network_status'] == 'ACTIVE'
+    assert status['satellite'] == 'UNDEFINED 999'
+    assert status['beamsearch'] == 'IDLE'
+    assert satellite_status({})['network_status'] is None
@@ -0,0 +1,234 @@
+import asyncio
+
+import pytest
+
+from idpmodem.aterror import AtException, AtTimeout
+from idpmodem.constants import (EventNotification, MessagePriority,
+                                MessageState, TransmitterStatus)
+from idpmodem.events import ModemEventLoop
+from idpmodem.moqueue import MoQueue
+
+
+class FakeModem:
+    """Records the calls a `MoQueue` makes on a threaded modem."""
+    def __init__(self) -> None:
+        self.calls = []
+        self.events = []
+        self.states = {}
+        self.status = TransmitterStatus.OK
+        self.reject = None
+        self.detail = None
+
+    @property
+    def event_notifications(self):
+        self.calls.append('S89')
+        events, self.events = self.events, []
+        return events
+
+    @property
+    def transmitter_status(self):
+        self.calls.append('S54')
+        return self.status
+
+    def message_mo_state(self, name=None):
+        self.calls.append('MGRS' if name is None else f'MGRS {name}')
+        return [{'name': n, 'state': state}
+                for n, state in self.states.items() if name in (None, n)]
+
+    def message_mo_send(self, data, name=None, priority=4):
+        self.calls.append(f'MGRT {name}')
+        if isinstance(self.reject, Exception):
+            self.states[name] = MessageState.TX_READY
+            raise self.reject
+        if self.reject:
+            raise AtException(self.reject)
+        self.states[name] = MessageState.TX_READY
+        return name
+
+    def at_error_detail(self, response):
+        self.calls.append('S80')
+        return self.detail
+
+
+class FakeAsyncModem:
+    """Adapts a `FakeModem` to the asyncio modem method names."""
+    def __init__(self, modem: FakeModem) -> None:
+        self.modem = modem
+
+    async def event_notifications_get(self):
+        return self.modem.event_notifications
+
+    async def transmitter_status_get(self):
+        return self.modem.transmitter_status
+
+    async def message_mo_state(self, name=None):
+        return self.modem.message_mo_state(name)
+
+    async def message_mo_send(self, data, name=None, priority=4):
+        return self.modem.message_mo_send(data, name, priority)
+
+    async def at_error_detail(self, response):
+        return self.modem.at_error_detail(response)
+
+
+def test_flow_control():
+    modem = FakeModem()
+    queue = MoQueue(modem_capacity=2)
+    low = [queue.enqueue(bytes([255, i])) for i in range(3)]
+    high = queue.enqueue(b'\xff\x09', MessagePriority.HIGH)
+    assert queue.service(modem) == 2
+    assert modem.calls == ['S54', f'MGRT {high.name}', f'MGRT {low[0].name}']
+    assert queue.backlog == 2 and len(queue) == 4
+    modem.calls = []
+    assert queue.service(modem) == 0
+    assert modem.calls == ['S89']
+    modem.calls = []
+    modem.states[high.name] = MessageState.TX_COMPLETE
+    modem.events = [EventNotification.MESSAGE_MO_COMPLETE]
+    assert queue.service(modem) == 1
+    assert modem.calls == ['S89', 'MGRS', 'S54', f'MGRT {low[1].name}']
+    assert high.state == MessageState.TX_COMPLETE
+    assert low[0].state == MessageState.TX_READY
+    assert queue.statistics['completed'] == 1
+    assert queue.statistics['delivery_max'] >= 0
+
+
+def test_transmitter_blocked():
+    modem = FakeModem()
+    modem.status = TransmitterStatus.BLOCKED
+    queue = MoQueue()
+    queue.enqueue(b'\xff\x00')
+    assert queue.service(modem) == 0
+    assert modem.calls == ['S54'] and queue.backlog == 1
+
+
+def test_rejected():
+    modem = FakeModem()
+    changes = []
+    queue = MoQueue(on_state=lambda m: changes.append((m.name, m.state)))
+    message = queue.enqueue(b'\xff\x00')
+    modem.reject = 'QUEUE_INSUFFICIENT_RESOURCES (106)'
+    assert queue.service(modem) == 0
+    assert queue.backlog == 1 and message.state is None
+    modem.reject = 'INVALID_COMMAND_PARAMETERS (102)'
+    assert queue.service(modem) == 0
+    assert queue.backlog == 0
+    assert changes == [(message.name, MessageState.TX_FAILED)]
+    assert queue.statistics['failed'] == 1
+
+
+def test_rejected_without_detail():
+    modem = FakeModem()
+    queue = MoQueue()
+    message = queue.enqueue(b'\xff\x00')
+    modem.reject = 'ERROR'
+    modem.detail = 'QUEUE_INSUFFICIENT_RESOURCES (106)'
+    assert queue.service(modem) == 0
+    assert modem.calls == ['S54', f'MGRT {message.name}', 'S80']
+    assert queue.backlog == 1 and message.state is None
+    modem.detail = 'INVALID_COMMAND_PARAMETERS (102)'
+    assert asyncio.run(queue.service_async(FakeAsyncModem(modem))) == 0
+    assert message.state == MessageState.TX_FAILED
+
+
+def test_timeout_accepted():
+    modem = FakeModem()
+    queue = MoQueue()
+    message = queue.enqueue(b'\xff\x00')
+    modem.reject = AtTimeout('timeout')
+    assert queue.service(modem) == 0
+    assert queue.backlog == 1 and message.state is None
+    modem.reject = None
+    modem.calls = []
+    assert queue.service(modem) == 1
+    assert modem.calls == ['S54', f'MGRS {message.name}']
+    assert message.state == MessageState.TX_READY
+    assert queue.statistics['submitted'] == 1
+
+
+def test_timeout_not_accepted():
+    modem = FakeModem()
+    queue = MoQueue()
+    message = queue.enqueue(b'\xff\x00')
+    modem.reject = AtTimeout('timeout')
+    assert queue.service(modem) == 0
+    del modem.states[message.name]
+    modem.reject = None
+    modem.calls = []
+    assert asyncio.run(queue.service_async(FakeAsyncModem(modem))) == 1
+    assert modem.calls == ['S54', f'MGRS {message.name}',
+                           f'MGRT {message.name}']
+
+
+def test_names():
+    first = MoQueue().enqueue(b'\xff\x00')
+    assert len(first.name) == 8 and first.name.startswith('Q')
+    assert first.name != 'Q0000001'
+    assert MoQueue(name_prefix='R').enqueue(b'\xff\x00').name[0] == 'R'
+    with pytest.raises(ValueError):
+        MoQueue(name_prefix='AB')
+
+
+def test_attached_event_loop():
+    modem = FakeModem()
+    loop = ModemEventLoop(modem)
+    queue = MoQueue()
+    queue.attach(loop)
+    message = queue.enqueue(b'\xff\x00')
+    queue.enqueue(b'\xff\x01')
+    assert queue.service(modem) == 2
+    modem.calls = []
+    modem.states[message.name] = MessageState.TX_COMPLETE
+    modem.events = [EventNotification.MESSAGE_MO_COMPLETE]
+    loop.check()
+    assert modem.calls == ['S89', 'MGRS']
+    assert message.state == MessageState.TX_COMPLETE
+    assert len(queue.inflight) == 1
+    modem.calls = []
+    assert queue.service(modem) == 0
+    assert asyncio.run(queue.service_async(FakeAsyncModem(modem))) == 0
+    assert modem.calls == []
+    assert queue.statistics['completed'] == 1
+
+
+def test_attached_completed_once():
+    modem = FakeModem()
+    loop = ModemEventLoop(modem)
+    def on_state(message):
+        if message is first and message.state == MessageState.TX_COMPLETE:
+            modem.events = [EventNotification.MESSAGE_MO_COMPLETE]
+            loop.check()
+    queue = MoQueue(poll_interval=0, on_state=on_state)
+    queue.attach(loop)
+    first = queue.enqueue(b'\xff\x00')
+    second = queue.enqueue(b'\xff\x01')
+    assert queue.service(modem) == 2
+    modem.states[first.name] = MessageState.TX_COMPLETE
+    modem.states[second.name] = MessageState.TX_COMPLETE
+    queue.service(modem)
+    assert second.state == MessageState.TX_COMPLETE
+    assert queue.inflight == []
+    assert queue.statistics['completed'] == 2
+
+
+def test_backlog_limit():
+    queue = MoQueue(max_backlog=2)
+    first = queue.enqueue(b'\xff\x00')
+    queue.enqueue(b'\xff\x01', MessagePriority.HIGH)
+    queue.enqueue(b'\xff\x02')
+    assert queue.backlog == 2 and queue.statistics['dropped'] == 1
+    assert first.name not in [m.name for m in queue._backlog[4]]
+    with pytest.raises(ValueError):
+        queue.enqueue(b'\x0f\x00')
+
+
+def test_service_async():
+    modem = FakeModem()
+    queue = MoQueue()
+    message = queue.enqueue(b'\xff\x00')
+    assert asyncio.run(queue.service_async(FakeAsyncModem(modem))) == 1
+    modem.states[message.name] = MessageState.TX_FAILED
+    modem.events = [EventNotification.MESSAGE_MO_COMPLETE]
+    asyncio.run(queue.service_async(FakeAsyncModem(modem)))
+    assert message.state == MessageState.TX_FAILED
+    assert queue.inflight == []
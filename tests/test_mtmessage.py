@@ -0,0 +1,70 @@
+from base64 import b64encode
+
+import pytest
+
+from idpmodem.mtmessage import (B64_CHUNK, mgfg_command, mgfg_parse,
+                               mgfg_response_frame, mt_drain_order)
+
+
+def mgfg_frame(data: bytes, data_format: int = 3) -> bytes:
+    return (b'\r\n%MGFG: "FM01.01",1.0,0,255,2,' +
+            str(len(data) + 1).encode() + b',' + str(data_format).encode() +
+            b',' + b64encode(data) + b'\r\n')
+
+
+@pytest.mark.parametrize('size', [0, 1, 2, 3, 10, B64_CHUNK, 9997])
+def test_mgfg_parse(size):
+    data = bytes(i % 256 for i in range(size))
+    meta, payload = mgfg_parse(mgfg_frame(data))
+    assert isinstance(payload, memoryview)
+    assert payload.tobytes() == bytes([255]) + data
+    assert meta == {
+        'name': 'FM01.01',
+        'system_message_number': 1,
+        'system_message_sequence': 0,
+        'priority': 0,
+        'sin': 255,
+        'state': 2,
+        'state_name': 'RX_COMPLETE',
+        'size': size + 1,
+    }
+
+
+def test_mgfg_response_frame():
+    frame = mgfg_frame(b'\x01\x02')
+    assert mgfg_response_frame([frame, b'\r\nOK\r\n']) is frame
+    assert mgfg_response_frame([b'\r\nERROR\r\n']) is None
+
+
+def test_mgfg_parse_invalid():
+    with pytest.raises(ValueError):
+        mgfg_parse(mgfg_frame(b'\x01\x02', data_format=2))
+    with pytest.raises(ValueError):
+        mgfg_parse(b'\r\n%MGFG: "FM01.01",1.0,0\r\n')
+    with pytest.raises(ValueError):
+        mgfg_parse(b'\r\nERROR\r\n')
+
+
+def test_mgfg_command():
+    assert mgfg_command('FM01.01') == 'AT%MGFG="FM01.01",3'
+    assert (mgfg_command('FM02.01', ['FM01.01']) ==
+            'AT%MGFM="FM01.01";%MGFG="FM02.01",3')
+
+
+def test_mt_drain_order():
+    waiting = [
+        {'name': 'FM01.01', 'priority': 0, 'state': 2, 'size': 100},
+        {'name': 'FM02.01', 'priority': 4, 'state': 2, 'size': 200},
+        {'name': 'FM03.01', 'priority': 1, 'state': 1, 'size': 300},
+        {'name': 'FM04.01', 'priority': 1, 'state': 3, 'size': 400},
+        {'name': 'FM05.01', 'priority': 4, 'state': 2, 'size': 500},
+    ]
+    names = lambda messages: [m['name'] for m in messages]
+    assert names(mt_drain_order(waiting)) == [
+        'FM04.01', 'FM02.01', 'FM05.01', 'FM01.01']
+    assert names(mt_drain_order(waiting, priority_order=False)) == [
+        'FM01.01', 'FM02.01', 'FM04.01', 'FM05.01']
+    assert names(mt_drain_order(waiting, max_bytes=650)) == [
+        'FM04.01', 'FM02.01']
+    assert names(mt_drain_order(waiting, max_bytes=10)) == ['FM04.01']
+    assert mt_drain_order([], max_bytes=10) == []
@@ -88,3 +88,41 @@ def test_gnss_immediate_timeout_crc(modem):
     assert res is not None
     err_code = protocol.command('ATS80?')
     assert err_code[0] == '108'
+
+
+class LoopbackTransport:
+    """Replies to each write with a canned response in fixed size chunks."""
+    def __init__(self, protocol: AtProtocol, chunk_size: int = 1) -> None:
+        self.protocol = protocol
+        self.chunk_size = chunk_size
+        self.replies = {}
+
+    def write(self, data: bytes):
+        reply = self.replies.get(data, b'')
+        for i in range(0, len(reply), self.chunk_size):
+            self.protocol.data_received(reply[i:i + self.chunk_size])
+
+
+def test_chunked_framing():
+    stream = b'ATS85?\r\r\n00220\r\n\r\nOK\r\n'
+    for chunk_size in [1, 2, 5, len(stream)]:
+        protocol = AtProtocol()
+        transport = LoopbackTransport(protocol, chunk_size)
+        transport.replies[b'ATS85?\r'] = stream
+        protocol.connection_made(transport)
+        assert protocol.command('ATS85?') == ['00220', 'OK']
+        assert protocol.pending_command is None
+        protocol.stop()
+
+
+def test_error_completes_without_timeout():
+    protocol = AtProtocol()
+    transport = LoopbackTransport(protocol, 4)
+    transport.replies[b'ATP\r'] = b'ATP\r\r\nERROR\r\n'
+    protocol.connection_made(transport)
+    start_time = time()
+    assert protocol.command('ATP', timeout=2) == ['ERROR']
+    assert time() - start_time < 1
+    protocol.data_received(b'*1234\r\n')
+    assert protocol.crc is True
+    protocol.stop()
@@ -4,7 +4,7 @@ import pytest
 import pytest_mock
 
 from idpmodem.threaded.modem import IdpModem
-from idpmodem.aterror import AtTimeout
+from idpmodem.aterror import AtException, AtTimeout
 from idpmodem.constants import *
 
 SERIAL_PORT = os.getenv('SERIAL_PORT', '/dev/ttyUSB0')
@@ -248,3 +248,108 @@ def test_unsolicited():
     while unsolicited_data is None:
         pass
     assert isinstance(unsolicited_data, str)
+
+
+class FakeAtcommand:
+    """Replaces `IdpModem.atcommand` with canned responses by command."""
+    def __init__(self, replies: dict) -> None:
+        self.replies = replies
+        self.sent = []
+
+    def __call__(self, command: str, filter=[], timeout=5, raw=False, **kw):
+        self.sent.append(command)
+        reply = self.replies[command]
+        if isinstance(reply, Exception):
+            raise reply
+        return list(reply)
+
+
+def drain_modem(replies: dict) -> 'tuple[IdpModem, FakeAtcommand]':
+    modem = IdpModem(SERIAL_PORT)
+    modem.atcommand = FakeAtcommand({
+        'AT%MGFN': ['"FM01.01",1.0,4,255,2,4,4',
+                    '"FM02.01",2.0,1,255,2,3,3', 'OK'],
+        'AT%MGFG="FM02.01",3': [
+            b'\r\n%MGFG: "FM02.01",2.0,1,255,2,3,3,BAU=\r\n', b'\r\nOK\r\n'],
+        'AT%MGFM="FM02.01"': ['OK'],
+        **replies,
+    })
+    return modem, modem.atcommand
+
+
+def test_message_mt_drain_combined_timeout():
+    combined = 'AT%MGFM="FM02.01";%MGFG="FM01.01",3'
+    modem, atcommand = drain_modem({combined: AtTimeout('timeout')})
+    drained = [meta['name'] for meta, _ in modem.message_mt_drain(timeout=5)]
+    assert drained == ['FM02.01']
+    assert atcommand.sent == ['AT%MGFN', 'AT%MGFG="FM02.01",3', combined,
+                              'AT%MGFM="FM02.01"']
+
+
+def test_message_mt_drain_closed():
+    modem, atcommand = drain_modem({})
+    drain = modem.message_mt_drain(timeout=5)
+    meta, payload = next(drain)
+    assert meta['name'] == 'FM02.01' and bytes(payload) == b'\xff\x04\x05'
+    drain.close()
+    assert atcommand.sent == ['AT%MGFN', 'AT%MGFG="FM02.01",3',
+                              'AT%MGFM="FM02.01"']
+
+
+def test_message_mt_drain_closed_no_delete():
+    modem, atcommand = drain_modem({})
+    drain = modem.message_mt_drain(timeout=5, delete_on_close=False)
+    with pytest.raises(RuntimeError):
+        for meta, _ in drain:
+            raise RuntimeError('consumer failed')
+    drain.close()
+    assert atcommand.sent == ['AT%MGFN', 'AT%MGFG="FM02.01",3']
+    for meta, _ in modem.message_mt_drain(timeout=5):
+        break
+    assert atcommand.sent[-1] == 'AT%MGFM="FM02.01"'
+
+
+
+def test_message_mt_get_unparseable():
+    modem = IdpModem(SERIAL_PORT)
+    modem.atcommand = FakeAtcommand({'AT%MGFG="FM01.01",3': [
+        b'\r\n%MGFG: "FM01.01",1.0,4\r\n', b'\r\nOK\r\n']})
+    assert modem.message_mt_get('FM01.01', timeout=5) is None
+    assert modem.message_mt_get('FM01.01', meta=True, timeout=5) is None
+
+SAT_STATUS_COMMAND = ('ATS90=3 S91=1 S92=1 S116? S122? S123?'
+                      ' S90=3 S91=5 S92=1 S102?')
+
+
+def test_satellite_status_no_geo_beam():
+    modem = IdpModem(SERIAL_PORT)
+    modem.atcommand = FakeAtcommand({
+        SAT_STATUS_COMMAND: ['ERROR'],
+        'ATS90=3 S91=1 S92=1 S116? S122? S123?': ['4510', '7', '0', 'OK'],
+    })
+    assert modem.satellite_status_get()['snr'] == 45.1
+    assert modem.satellite_metrics.get('geo_beam_id') == 0
+    assert len(modem.atcommand.sent) == 2
+
+
+def test_satellite_status_no_geo_beam_not_cached(monkeypatch):
+    monkeypatch.setattr('idpmodem.threaded.modem.SAT_STATUS_TTL', 0)
+    modem = IdpModem(SERIAL_PORT)
+    modem.atcommand = FakeAtcommand({
+        SAT_STATUS_COMMAND: ['ERROR'],
+        'ATS90=3 S91=1 S92=1 S116? S122? S123?': ['4510', '7', '0', 'OK'],
+        'ATS90=3 S91=5 S92=1 S102?': ['10', 'OK'],
+    })
+    assert modem.satellite_status_get()['snr'] == 45.1
+    assert modem.satellite_metrics.get('geo_beam_id') == 10
+    assert modem.atcommand.sent[-1] == 'ATS90=3 S91=5 S92=1 S102?'
+
+
+def test_satellite_status_unexpected_response():
+    modem = IdpModem(SERIAL_PORT)
+    modem.atcommand = FakeAtcommand({
+        SAT_STATUS_COMMAND: ['4510', 'OK'],
+        'ATS90=3 S91=1 S92=1 S116? S122? S123?': ['4510', 'OK'],
+    })
+    with pytest.raises(AtException):
+        modem.satellite_status_get()